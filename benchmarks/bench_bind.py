@@ -0,0 +1,52 @@
+import atomics
+from atomics import MemoryOrder, OpType
+
+import argparse
+import timeit
+
+
+RLX = MemoryOrder.RELAXED
+
+
+def _time_ns(stmt, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def _cases(a, b):
+    # (name, method call, bound op call, op table call)
+    table, address = a._core._table, a._core._address
+    btable, baddress = b._core._table, b._core._address
+    value = bytes(b.width)
+    fetch_add, load, store = a.bind(OpType.FETCH_ADD, RLX), a.bind(OpType.LOAD, RLX), a.bind(OpType.STORE, RLX)
+    cmpxchg = a.bind(OpType.CMPXCHG_STRONG, RLX)
+    bstore = b.bind(OpType.STORE, RLX)
+    return (
+        ("fetch_add", lambda: a.fetch_add(1, RLX), lambda: fetch_add(1), lambda: table.fetch_add(address, 1, RLX)),
+        ("load", lambda: a.load(RLX), load, lambda: table.load(address, RLX)),
+        ("store", lambda: a.store(1, RLX), lambda: store(1), lambda: table.store(address, 1, RLX)),
+        ("cmpxchg_strong", lambda: a.cmpxchg_strong(1, 1, RLX, RLX), lambda: cmpxchg(1, 1),
+         lambda: table.cmpxchg_strong(address, 1, 1, RLX, RLX)),
+        (f"store (BYTES {b.width})", lambda: b.store(value, RLX), lambda: bstore(value),
+         lambda: btable.store(baddress, value, RLX)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-op latency of methods vs bind() handles")
+    parser.add_argument("-n", "--number", type=int, default=100_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-w", "--width", type=int, default=8)
+    args = parser.parse_args()
+
+    a = atomics.atomic(width=args.width, atype=atomics.UINT)
+    b = atomics.atomic(width=16, atype=atomics.BYTES)
+    print(f"width={args.width} {'method':>22} {'bind':>10} {'table':>10}  (ns/op)")
+    for name, method, bound, table in _cases(a, b):
+        results = [_time_ns(stmt, args.number, args.repeat) for stmt in (method, bound, table)]
+        print(f"{name:>20} " + " ".join(f"{r:>10.1f}" for r in results)
+              + f"  {results[0] / results[1]:.2f}x vs method")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import atomics
+from atomics._impl import backend
+
+import argparse
+import random
+import timeit
+
+
+# cost of claiming and releasing a clear bit in a mostly full bitset, with
+# AtomicBitset (word scan in the op table) vs a Python loop of bit_test_set calls
+# over an atomic array of the same words
+
+
+def _naive_acquire(arr, nbits: int):
+    for i in range(nbits):
+        if not arr.bit_test_set(i // 64, i % 64):
+            return i
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bit claim latency, AtomicBitset vs per bit Python calls")
+    parser.add_argument("-n", "--nbits", type=int, nargs="+", default=[64, 1024, 16384])
+    parser.add_argument("-f", "--fill", type=float, default=0.99, help="fraction of bits set beforehand")
+    parser.add_argument("-r", "--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"backend={backend.backend_name()} fill={args.fill}  (us per acquire+release)")
+    print(f"{'nbits':>7} {'bitset':>10} {'naive':>10}")
+    for nbits in args.nbits:
+        buf = bytearray(atomics.AtomicBitset.buffer_size(nbits))
+        with atomics.AtomicBitset(buf, nbits) as bits:
+            for i in random.sample(range(nbits), int(nbits * args.fill)):
+                bits.set(i)
+
+            def fast():
+                bits.release(bits.acquire_free())
+
+            with atomics.atomicarray(buf, atomics.UINT, 8) as arr:
+                def naive():
+                    i = _naive_acquire(arr, nbits)
+                    arr.bit_test_reset(i // 64, i % 64)
+
+                results = [min(timeit.repeat(f, number=args.repeat, repeat=3)) / args.repeat * 1e6
+                           for f in (fast, naive)]
+        print(f"{nbits:>7} {results[0]:>10.2f} {results[1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import atomics
+
+import argparse
+import multiprocessing as mp
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+
+# every process increments the same counter in shared memory, either a single
+# atomic object (one contended cache line) or a ShardedCounter
+# processes are used rather than threads so the increments really run in parallel
+
+
+def _single(name: str, count: int, start) -> None:
+    shm = SharedMemory(name)
+    with atomics.atomicview(shm.buf[:8], atomics.INT) as a:
+        start.wait()
+        for _ in range(count):
+            a.inc(atomics.MemoryOrder.RELAXED)
+    shm.close()
+
+
+def _sharded(name: str, count: int, start) -> None:
+    shm = SharedMemory(name)
+    with atomics.ShardedCounter(buffer=shm.buf) as c:
+        start.wait()
+        for _ in range(count):
+            c.inc()
+    shm.close()
+
+
+def _run(target, procs: int, count: int, size: int) -> float:
+    ctx = mp.get_context("spawn")
+    shm = SharedMemory(create=True, size=size)
+    try:
+        start = ctx.Barrier(procs + 1)
+        ps = [ctx.Process(target=target, args=(shm.name, count, start)) for _ in range(procs)]
+        for p in ps:
+            p.start()
+        start.wait()
+        begin = time.perf_counter()
+        for p in ps:
+            p.join()
+            assert p.exitcode == 0
+        elapsed = time.perf_counter() - begin
+        if target is _sharded:
+            with atomics.ShardedCounter(buffer=shm.buf) as c:
+                assert c.value() == procs * count
+        return (procs * count) / elapsed
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Increment throughput of a single atomic vs ShardedCounter")
+    parser.add_argument("-p", "--procs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-n", "--count", type=int, default=200_000, help="increments per process")
+    parser.add_argument("-s", "--shards", type=int, default=None, help="defaults to the CPU count")
+    args = parser.parse_args()
+
+    shards = args.shards or max(args.procs)
+    print(f"shards={shards} cache_line_size={atomics.cache_line_size()}  (million incs/s)")
+    print(f"{'procs':>7} {'single':>10} {'sharded':>10}")
+    for n in args.procs:
+        single = _run(_single, n, args.count, 8) / 1e6
+        sharded = _run(_sharded, n, args.count, atomics.ShardedCounter.buffer_size(shards)) / 1e6
+        print(f"{n:>7} {single:>10.2f} {sharded:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
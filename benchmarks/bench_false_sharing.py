@@ -0,0 +1,66 @@
+import atomics
+from atomics._impl import backend
+
+import argparse
+import array
+import ctypes
+import threading
+import time
+
+
+# each thread adds to its own counter; the only difference between the two
+# layouts is whether neighbouring counters share a cache line
+# add_many loops without the GIL (native backend), so the threads really do
+# run in parallel and contend on the cache line(s)
+
+
+def _aligned_buffer(size: int, alignment: int) -> memoryview:
+    raw = bytearray(size + alignment)
+    address = ctypes.addressof((ctypes.c_char * len(raw)).from_buffer(raw))
+    offset = -address % alignment
+    return memoryview(raw)[offset:(offset + size)]
+
+
+def _run(arr, threads: int, batch: int, rounds: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+    ones = array.array("Q", [1]) * batch
+
+    def work(i: int) -> None:
+        idx = array.array("q", [i]) * batch
+        barrier.wait()
+        for _ in range(rounds):
+            arr.add_many(idx, ones)
+
+    ts = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for t in ts:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in ts:
+        t.join()
+    elapsed = time.perf_counter() - start
+    assert arr.load_many(range(threads)) == [batch * rounds] * threads
+    return (threads * batch * rounds) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of per-thread counters, packed vs isolated")
+    parser.add_argument("-t", "--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-b", "--batch", type=int, default=100_000)
+    parser.add_argument("-r", "--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    line = atomics.cache_line_size()
+    print(f"backend={backend.backend_name()} cache_line_size={line}  (million adds/s)")
+    if backend.backend_name() != "native":
+        print("note: the ctypes backend holds the GIL, so threads do not contend")
+    print(f"{'threads':>7} {'packed':>10} {'isolated':>10}")
+    for n in args.threads:
+        packed = atomics.atomicarray(_aligned_buffer(8 * n, line), atomics.UINT, 8)
+        isolated = atomics.atomicarray(_aligned_buffer(line * n, line), atomics.UINT, 8, isolate=True)
+        results = [_run(arr, n, args.batch, args.rounds) / 1e6 for arr in (packed, isolated)]
+        print(f"{n:>7} {results[0]:>10.1f} {results[1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
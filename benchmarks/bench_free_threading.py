@@ -0,0 +1,70 @@
+import atomics
+from atomics import MemoryOrder, OpType
+from atomics._impl import backend
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+
+# fetch_add throughput as the number of threads grows, on one shared counter
+# and on one isolated counter per thread
+# with the GIL only one thread runs Python at a time, so throughput stays flat;
+# on a free-threaded build (e.g. python3.13t) it should rise with the thread
+# count, up to the number of cores (the shared counter less so, since every
+# thread contends on the same cache line)
+
+
+def _gil_enabled() -> bool:
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+def _run(counters, number: int) -> float:
+    threads = len(counters)
+    barrier = threading.Barrier(threads + 1)
+
+    def work(a) -> None:
+        # bound ops skip per call validation, so the op itself dominates
+        fetch_add = a.bind(OpType.FETCH_ADD, MemoryOrder.RELAXED)
+        barrier.wait()
+        for _ in range(number):
+            fetch_add(1)
+
+    ts = [threading.Thread(target=work, args=(a,)) for a in counters]
+    for t in ts:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in ts:
+        t.join()
+    elapsed = time.perf_counter() - start
+    assert sum(a.load() for a in set(counters)) == threads * number
+    return (threads * number) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="fetch_add throughput scaling with thread count")
+    default_threads = [n for n in (1, 2, 4, 8, 16) if n <= 2 * (os.cpu_count() or 1)]
+    parser.add_argument("-t", "--threads", type=int, nargs="+", default=default_threads)
+    parser.add_argument("-n", "--number", type=int, default=200_000, help="ops per thread")
+    parser.add_argument("-w", "--width", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"python={sys.version.split()[0]} gil_enabled={_gil_enabled()} "
+          f"backend={backend.backend_name()} cpus={os.cpu_count()}")
+    print(f"{'threads':>7} {'shared':>10} {'speedup':>8} {'isolated':>10} {'speedup':>8}  (million ops/s)")
+    base = None
+    for n in args.threads:
+        shared = atomics.atomic(width=args.width, atype=atomics.UINT, isolate=True)
+        isolated = [atomics.atomic(width=args.width, atype=atomics.UINT, isolate=True) for _ in range(n)]
+        rates = [_run([shared] * n, args.number) / 1e6, _run(isolated, args.number) / 1e6]
+        if base is None:
+            base = rates
+        print(f"{n:>7} {rates[0]:>10.2f} {rates[0] / base[0]:>7.2f}x {rates[1]:>10.2f} {rates[1] / base[1]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
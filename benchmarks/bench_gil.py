@@ -0,0 +1,70 @@
+import atomics
+from atomics._impl import backend
+from atomics._impl.patomic import Patomic
+
+import argparse
+import threading
+import time
+
+
+# every thread exchanges a single shared BYTES object in a loop, once with an
+# op table that holds the GIL around each op, and once with one that releases it
+# the default policy (backend.default_release_gil) should pick the faster column
+
+
+def _table(width: int, release_gil: bool):
+    ops = Patomic.ops(width)
+    if backend._native is not None:
+        return backend._native.OpTable(backend.addressof(ops), width, False, False, release_gil)
+    funcs = Patomic.op_funcs(ops, is_signed=False)
+    return backend._CtypesBytesOpTable(funcs, width, release_gil=release_gil)
+
+
+def _run(a, threads: int, number: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+    value = bytes(a.width)
+
+    def work() -> None:
+        exchange = a.exchange
+        barrier.wait()
+        for _ in range(number):
+            exchange(value)
+
+    ts = [threading.Thread(target=work) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in ts:
+        t.join()
+    return (threads * number) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-threaded throughput with the GIL held vs released per op")
+    parser.add_argument("-w", "--widths", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("-t", "--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-n", "--number", type=int, default=50_000, help="ops per thread")
+    args = parser.parse_args()
+
+    print(f"backend={backend.backend_name()}  (million ops/s, * marks the default policy)")
+    print(f"{'width':>5} {'threads':>7} {'hold':>9} {'release':>9}")
+    for width in args.widths:
+        if Patomic().nonnull_ops_count(width, readonly=False) == 0:
+            continue
+        a = atomics.atomic(width=width, atype=atomics.BYTES)
+        if atomics.OpType.EXCHANGE not in a.ops_supported:
+            continue
+        default = backend.default_release_gil(width)
+        for n in args.threads:
+            results = []
+            for release_gil in (False, True):
+                a._core._table = _table(width, release_gil)
+                rate = _run(a, n, args.number) / 1e6
+                mark = "*" if release_gil == default else " "
+                results.append(f"{rate:>8.2f}{mark}")
+            print(f"{width:>5} {n:>7} " + " ".join(results))
+
+
+if __name__ == "__main__":
+    main()
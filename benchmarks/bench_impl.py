@@ -0,0 +1,55 @@
+import atomics
+from atomics import MemoryOrder
+from atomics._impl import backend
+from atomics._impl.implementation import available_impls
+
+import argparse
+import timeit
+
+
+# latency of load, store, and exchange on a BYTES object per patomic
+# implementation kind, next to the default (every kind combined)
+# fastest_impl() should pick the kind with the lowest latency
+
+
+def _time_ns(stmt, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def _row(a, number: int, repeat: int) -> str:
+    order = MemoryOrder.SEQ_CST
+    value = bytes(a.width)
+    stmts = (lambda: a.load(order), lambda: a.store(value, order), lambda: a.exchange(value, order))
+    ops = (atomics.OpType.LOAD, atomics.OpType.STORE, atomics.OpType.EXCHANGE)
+    cells = []
+    for op, stmt in zip(ops, stmts):
+        if op in a.ops_supported:
+            cells.append(f"{_time_ns(stmt, number, repeat):>10.1f}")
+        else:
+            cells.append(f"{'-':>10}")
+    return " ".join(cells)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-op latency of each patomic implementation kind")
+    parser.add_argument("-w", "--widths", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("-n", "--number", type=int, default=100_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"backend={backend.backend_name()}  (ns/op, * marks fastest_impl)")
+    print(f"{'width':>5} {'impl':>7} {'load':>10} {'store':>10} {'exchange':>10}")
+    for width in args.widths:
+        impls = available_impls(width)
+        if not impls:
+            continue
+        fastest = atomics.fastest_impl(width)
+        for impl in (None,) + impls:
+            a = atomics.atomic(width=width, atype=atomics.BYTES, impl=impl)
+            mark = "*" if impl == fastest else " "
+            print(f"{width:>5} {str(impl):>6}{mark} {_row(a, args.number, args.repeat)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+# each measurement runs in a fresh interpreter, since imports are only paid once
+# per process; the first run is discarded so compiled bytecode is cached
+# (run from a directory where atomics is importable, or with src on PYTHONPATH)
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+_STAGES = {
+    "import": "import atomics",
+    "import + first op": "import atomics; atomics.atomic(8, atomics.INT).inc()",
+    "import + preload()": "import atomics; atomics.preload()",
+}
+
+_TIMER = "import time; _t = time.perf_counter(); {code}; print(time.perf_counter() - _t)"
+
+
+def _run(args, env) -> str:
+    res = subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+    return res.stdout + res.stderr
+
+
+def _importtime(env, runs: int):
+    # median self and cumulative time (us) of every module
+    samples = {}
+    for _ in range(runs):
+        for line in _run(["-X", "importtime", "-c", "import atomics"], env).splitlines():
+            m = _IMPORTTIME.match(line)
+            if m:
+                samples.setdefault(m.group(4), []).append((int(m.group(1)), int(m.group(2))))
+    return {name: (statistics.median(s for s, _ in ts), statistics.median(c for _, c in ts))
+            for name, ts in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import time of atomics, measured with -X importtime")
+    parser.add_argument("-r", "--runs", type=int, default=10)
+    parser.add_argument("-t", "--top", type=int, default=15, help="number of slowest modules to show")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # bytecode must be cached, or compiling dominates every run
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    _run(["-c", "import atomics; atomics.preload()"], env)
+
+    print(f"python={sys.version.split()[0]} runs={args.runs}  (median ms, fresh interpreter each run)")
+    for stage, code in _STAGES.items():
+        times = [float(_run(["-c", _TIMER.format(code=code)], env)) for _ in range(args.runs)]
+        print(f"{stage:>20} {statistics.median(times) * 1e3:>8.2f}")
+
+    modules = _importtime(env, args.runs)
+    print(f"\nslowest modules imported by 'import atomics'  (median ms)")
+    print(f"{'self':>8} {'cumulative':>10}  module")
+    for name, (self_us, cum_us) in sorted(modules.items(), key=lambda kv: -kv[1][0])[:args.top]:
+        print(f"{self_us / 1e3:>8.2f} {cum_us / 1e3:>10.2f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import atomics
+from atomics._impl import backend
+from atomics._impl.patomic import Patomic
+
+import argparse
+import timeit
+
+
+def _tables(width: int):
+    # every op table implementation that can serve a signed integral atomic
+    ops = Patomic.ops(width)
+    funcs = Patomic.op_funcs(ops, is_signed=True)
+    tables = {
+        "bytes": backend._CtypesIntOpTable(funcs, width, is_signed=True),
+        "scratch": backend._CtypesNativeIntOpTable(funcs, width, is_signed=True),
+    }
+    if backend._native is not None:
+        tables["native"] = backend._native.OpTable(backend.addressof(ops), width, True, True)
+    return tables
+
+
+def _time_ns(stmt, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-op latency of each op table implementation")
+    parser.add_argument("-n", "--number", type=int, default=100_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ops = (("load", lambda a: a.load),
+           ("store", lambda a: lambda: a.store(1)),
+           ("fetch_add", lambda a: lambda: a.fetch_add(1)))
+
+    for width in (1, 2, 4, 8):
+        a = atomics.atomic(width=width, atype=atomics.INT)
+        tables = _tables(width)
+        print(f"width={width} " + " ".join(f"{name:>10}" for name in tables) + "  (ns/op)")
+        for op_name, fn in ops:
+            results = []
+            for table in tables.values():
+                a._core._table = table
+                results.append(_time_ns(fn(a), args.number, args.repeat))
+            speedup = results[0] / results[-1]
+            print(f"{op_name:>9} " + " ".join(f"{r:>10.1f}" for r in results)
+                  + f"  {speedup:.2f}x vs bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import atomics
+from atomics._impl import backend
+
+import argparse
+import array
+import random
+import timeit
+
+
+def _time_ns(stmt, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-element cost of batched vs scalar array ops")
+    parser.add_argument("-n", "--number", type=int, default=20)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-k", "--count", type=int, default=100_000, help="elements per batch")
+    parser.add_argument("-b", "--bins", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"backend={backend.backend_name()} count={args.count} bins={args.bins}  (ns/element)")
+    arr = atomics.atomicarray(bytearray(8 * args.bins), atomics.UINT, 8)
+    idx = array.array("q", (random.randrange(args.bins) for _ in range(args.count)))
+    vals = array.array("Q", [1]) * args.count
+
+    def scalar_add():
+        for i in idx:
+            arr.add(i, 1)
+
+    cases = (("add (loop)", scalar_add),
+             ("add_many", lambda: arr.add_many(idx, vals)),
+             ("fetch_add_many", lambda: arr.fetch_add_many(idx, vals)),
+             ("load_many", lambda: arr.load_many(idx)))
+    for name, fn in cases:
+        number = max(1, args.number // 10) if name.endswith("(loop)") else args.number
+        print(f"{name:>15} {_time_ns(fn, number, args.repeat) / args.count:>10.1f}")
+
+
+
+if __name__ == "__main__":
+    main()
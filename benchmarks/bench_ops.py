@@ -0,0 +1,239 @@
+import atomics
+import atomics.exc
+from atomics._impl import backend
+from atomics._impl.patomic import Patomic
+
+import argparse
+import functools
+import json
+import platform
+import sys
+import threading
+import time
+import timeit
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# per-op latency and multi-threaded throughput for every OpType, supported width,
+# and valid MemoryOrder, on Atomic and AtomicView objects, plus the cost of an
+# atomicview construct/enter/exit cycle
+# results are written as JSON (--json) so runs can be compared (--compare)
+
+MO = atomics.MemoryOrder
+OT = atomics.OpType
+
+_METHOD_NAMES: Dict[OT, str] = {
+    OT.OR: "bin_or", OT.XOR: "bin_xor", OT.AND: "bin_and", OT.NOT: "bin_not",
+    OT.FETCH_OR: "bin_fetch_or", OT.FETCH_XOR: "bin_fetch_xor",
+    OT.FETCH_AND: "bin_fetch_and", OT.FETCH_NOT: "bin_fetch_not",
+}
+
+_NO_ARG_OPS = {OT.LOAD, OT.NOT, OT.FETCH_NOT, OT.INC, OT.DEC, OT.NEG,
+               OT.FETCH_INC, OT.FETCH_DEC, OT.FETCH_NEG}
+_BIT_OPS = {OT.BIT_TEST, OT.BIT_TEST_COMPL, OT.BIT_TEST_SET, OT.BIT_TEST_RESET}
+_CMPXCHG_OPS = {OT.CMPXCHG_WEAK, OT.CMPXCHG_STRONG}
+
+_ATYPES = {"INT": atomics.INT, "UINT": atomics.UINT, "BYTES": atomics.BYTES}
+
+
+def _method_name(optype: OT) -> str:
+    return _METHOD_NAMES.get(optype, optype.name.lower())
+
+
+def _value(a, n: int):
+    return n.to_bytes(a.width, sys.byteorder) if isinstance(a, atomics.BYTES) else n
+
+
+def _op_args(a, optype: OT) -> tuple:
+    if optype in _NO_ARG_OPS:
+        return ()
+    elif optype in _BIT_OPS:
+        return (0,)
+    elif optype in _CMPXCHG_OPS:
+        return (_value(a, 0), _value(a, 0))
+    else:
+        return (_value(a, 1),)
+
+
+def _calls(a, optype: OT) -> Iterator[Tuple[Callable[[], object], MO, Optional[MO]]]:
+    # yields a zero argument callable for every valid (order, fail order)
+    # validity is determined by trying the call, so this tracks the library's checks
+    method = getattr(a, _method_name(optype))
+    args = _op_args(a, optype)
+    pairs = [(o, None) for o in MO]
+    if optype in _CMPXCHG_OPS:
+        pairs = [(s, f) for s in MO for f in MO]
+    for order, fail in pairs:
+        call_args = args + ((order,) if fail is None else (order, fail))
+        fn = functools.partial(method, *call_args)
+        try:
+            fn()
+        except atomics.exc.MemoryOrderError:
+            continue
+        yield fn, order, fail
+
+
+def _ns_per_op(fn: Callable[[], object], number: int, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e9
+
+
+def _ops_per_sec(fn: Callable[[], object], threads: int, number: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def work() -> None:
+        barrier.wait()
+        for _ in range(number):
+            fn()
+
+    ts = [threading.Thread(target=work) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in ts:
+        t.join()
+    return (threads * number) / (time.perf_counter() - start)
+
+
+def supported_widths(max_width: int) -> List[int]:
+    p = Patomic()
+    return [w for w in range(1, max_width + 1) if p.nonnull_ops_count(w, readonly=False)]
+
+
+def _bench_object(kind: str, a, atype: str, args, results: List[dict]) -> None:
+    for optype in a.ops_supported:
+        if args.ops and optype.name not in args.ops:
+            continue
+        for fn, order, fail in _calls(a, optype):
+            key = {"kind": kind, "atype": atype, "width": a.width, "op": optype.name,
+                   "order": order.name, "fail_order": None if fail is None else fail.name}
+            results.append(dict(key, group="latency",
+                                ns_per_op=_ns_per_op(fn, args.number, args.repeat)))
+            if order is MO.SEQ_CST and fail in (None, MO.SEQ_CST):
+                for n in args.threads:
+                    results.append(dict(key, group="throughput", threads=n,
+                                        ops_per_sec=_ops_per_sec(fn, n, args.number)))
+            if args.verbose:
+                print(f"{kind} {atype} width={a.width} {optype.name} {key['order']} "
+                      f"{key['fail_order'] or ''}", file=sys.stderr)
+
+
+def run(args) -> dict:
+    results: List[dict] = []
+    for width in args.widths or supported_widths(args.max_width):
+        for atype_name in args.atypes:
+            atype = _ATYPES[atype_name]
+            if "Atomic" in args.kinds:
+                _bench_object("Atomic", atomics.atomic(width, atype), atype_name, args, results)
+            if "AtomicView" in args.kinds:
+                buf = bytearray(width)
+                with atomics.atomicview(buf, atype) as v:
+                    _bench_object("AtomicView", v, atype_name, args, results)
+            if "atomicview" in args.kinds:
+                buf = bytearray(width)
+
+                def cycle() -> None:
+                    with atomics.atomicview(buf, atype):
+                        pass
+
+                results.append({"group": "view_cycle", "kind": "atomicview", "atype": atype_name,
+                                "width": width, "ns_per_op": _ns_per_op(cycle, args.number, args.repeat)})
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "backend": backend.backend_name(),
+            "cache_line_size": atomics.cache_line_size(),
+            "number": args.number,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def _key(r: dict) -> tuple:
+    return tuple(r.get(k) for k in ("group", "kind", "atype", "width", "op", "order",
+                                    "fail_order", "threads"))
+
+
+def _metric(r: dict) -> Tuple[str, float]:
+    # normalised so that larger is always slower
+    if "ns_per_op" in r:
+        return "ns/op", r["ns_per_op"]
+    return "ns/op (1/throughput)", 1e9 / r["ops_per_sec"]
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    # prints results which changed by more than threshold, returns number of regressions
+    old_results = {_key(r): r for r in old["results"]}
+    regressions = 0
+    for r in new["results"]:
+        o = old_results.get(_key(r))
+        if o is None:
+            continue
+        unit, new_v = _metric(r)
+        _, old_v = _metric(o)
+        ratio = new_v / old_v
+        if abs(ratio - 1) >= threshold:
+            label = " ".join(str(k) for k in _key(r) if k is not None)
+            status = "SLOWER" if ratio > 1 else "faster"
+            regressions += ratio > 1
+            print(f"{status:>6} {ratio:6.2f}x  {old_v:10.1f} -> {new_v:10.1f} {unit}  {label}")
+    return regressions
+
+
+def summarise(data: dict) -> None:
+    print(f"backend={data['meta']['backend']} python={data['meta']['python']}  (ns/op)")
+    for r in data["results"]:
+        if r["group"] == "throughput":
+            continue
+        order = r.get("order") or ""
+        if r.get("fail_order"):
+            order += "/" + r["fail_order"]
+        print(f"{r['kind']:>10} {r['atype']:>5} w={r['width']:<3} {r.get('op', ''):<15} "
+              f"{order:<17} {r['ns_per_op']:>10.1f}")
+    for r in data["results"]:
+        if r["group"] == "throughput":
+            print(f"{r['kind']:>10} {r['atype']:>5} w={r['width']:<3} {r['op']:<15} "
+                  f"threads={r['threads']:<3} {r['ops_per_sec'] / 1e6:>8.2f} Mops/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency and throughput of every atomic operation")
+    parser.add_argument("-n", "--number", type=int, default=5_000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-w", "--widths", type=int, nargs="+", help="default: all supported")
+    parser.add_argument("--max-width", type=int, default=64)
+    parser.add_argument("-a", "--atypes", nargs="+", choices=sorted(_ATYPES), default=["INT"])
+    parser.add_argument("-k", "--kinds", nargs="+", choices=["Atomic", "AtomicView", "atomicview"],
+                        default=["Atomic", "AtomicView", "atomicview"])
+    parser.add_argument("-o", "--ops", nargs="+", choices=[o.name for o in OT], help="default: all")
+    parser.add_argument("-t", "--threads", type=int, nargs="*", default=[2, 4])
+    parser.add_argument("--json", help="write results to this file ('-' for stdout)")
+    parser.add_argument("--compare", help="JSON file from a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change to report")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    data = run(args)
+    if args.json == "-":
+        json.dump(data, sys.stdout, indent=1)
+        print()
+    else:
+        summarise(data)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(data, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        regressions = compare(old, data, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import atomics
+from atomics._impl import backend, pybuffer
+from atomics._impl.enums import OpType
+from atomics._impl.patomic import Patomic
+from atomics._impl.pybuffer import PyBuffer
+
+import argparse
+import contextlib
+import timeit
+
+
+@contextlib.contextmanager
+def _cffi_path():
+    # forces the fallback used when the C API is unavailable (i.e. on PyPy)
+    capi, pybuffer._capi = pybuffer._capi, None
+    try:
+        pybuffer.get_ffi()
+        yield
+    finally:
+        pybuffer._capi = capi
+
+
+def _time_ns(stmt, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def _pin(obj, writeable: bool):
+    def stmt():
+        with PyBuffer(obj, writeable=writeable):
+            pass
+    return stmt
+
+
+def _per_call_load(table, address: int, width: int):
+    # how BYTES loads used to marshal their result: a PyBuffer per call
+    fp = table._funcs[OpType.LOAD]
+
+    def stmt():
+        result = bytes(width)
+        with PyBuffer(result, writeable=True, force=True) as res_buf:
+            fp(address, 5, res_buf.address)
+        return result
+    return stmt
+
+
+def _per_call_store(table, address: int, value: bytes):
+    fp = table._funcs[OpType.STORE]
+
+    def stmt():
+        with PyBuffer(value, writeable=False) as val_buf:
+            fp(address, val_buf.address, 5)
+    return stmt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PyBuffer construct/release cost and BYTES op latency")
+    parser.add_argument("-n", "--number", type=int, default=100_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    exporters = (("bytes", bytes(16), False),
+                 ("bytearray", bytearray(16), True),
+                 ("memoryview", memoryview(bytearray(16)), True))
+    try:
+        with _cffi_path():
+            pass
+        has_cffi = True
+    except ImportError:
+        has_cffi = False
+
+    print(f"PyBuffer construct/release  {'C API':>10} {'cffi':>10}  (ns/op)")
+    for name, obj, writeable in exporters:
+        capi = _time_ns(_pin(obj, writeable), args.number, args.repeat)
+        if has_cffi:
+            with _cffi_path():
+                cffi = _time_ns(_pin(obj, writeable), args.number, args.repeat)
+            print(f"{name:>26}  {capi:>10.1f} {cffi:>10.1f}  {cffi / capi:.2f}x")
+        else:
+            print(f"{name:>26}  {capi:>10.1f} {'-':>10}")
+
+    # BYTES ops through the ctypes backend, vs pinning every argument per call
+    print(f"\nBYTES ops (ctypes)   {'per-call':>10} {'scratch':>10}  (ns/op)")
+    for width in (8, 16):
+        a = atomics.atomic(width=width, atype=atomics.BYTES)
+        if OpType.LOAD not in a.ops_supported:
+            continue
+        table = backend._CtypesBytesOpTable(Patomic.op_funcs(Patomic.ops(width), is_signed=False), width)
+        address = a._core._address
+        value = bytes(width)
+        rows = (("load", _per_call_load(table, address, width), lambda: table.load(address, 5)),
+                ("store", _per_call_store(table, address, value), lambda: table.store(address, value, 5)))
+        for op_name, old, new in rows:
+            t_old = _time_ns(old, args.number, args.repeat)
+            t_new = _time_ns(new, args.number, args.repeat)
+            print(f"{op_name:>11} width={width:<2} {t_old:>10.1f} {t_new:>10.1f}  {t_old / t_new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from atomics.queue import MPMCQueue, SPSCQueue
+
+import argparse
+import multiprocessing as mp
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+
+# one producer process pushes records to one consumer process, through either an
+# atomics ring buffer in shared memory or a multiprocessing.Queue
+# the ring buffers are non-blocking, so both sides yield when they make no progress
+# multiprocessing.Queue batches are sent as a single list of records
+
+
+_QUEUES = {"spsc": SPSCQueue, "mpmc": MPMCQueue}
+
+
+def _ring_producer(kind: str, name: str, count: int, size: int, batch: int, start) -> None:
+    shm = SharedMemory(name)
+    q = _QUEUES[kind](shm.buf)
+    records = bytes(range(256)) * ((size * batch) // 256 + 1)
+    records = records[:(size * batch)]
+    start.wait()
+    sent = 0
+    while sent < count:
+        n = min(batch, count - sent)
+        pushed = q.push_many(records[:(size * n)]) if batch > 1 else int(q.push(records))
+        sent += pushed
+        if not pushed:
+            time.sleep(0)
+    q.release()
+    shm.close()
+
+
+def _ring_consumer(kind: str, name: str, count: int, size: int, batch: int, start) -> None:
+    shm = SharedMemory(name)
+    q = _QUEUES[kind](shm.buf)
+    out = bytearray(size * batch)
+    start.wait()
+    got = 0
+    while got < count:
+        popped = q.pop_many_into(out) if batch > 1 else int(q.pop_into(out))
+        got += popped
+        if not popped:
+            time.sleep(0)
+    q.release()
+    shm.close()
+
+
+def _mp_producer(q, count: int, size: int, batch: int, start) -> None:
+    record = bytes(size)
+    start.wait()
+    sent = 0
+    while sent < count:
+        n = min(batch, count - sent)
+        q.put(record if batch == 1 else [record] * n)
+        sent += n
+
+
+def _mp_consumer(q, count: int, size: int, batch: int, start) -> None:
+    start.wait()
+    got = 0
+    while got < count:
+        item = q.get()
+        got += 1 if batch == 1 else len(item)
+
+
+def _time(ctx, producer, consumer, args: tuple) -> float:
+    start = ctx.Barrier(3)
+    procs = [ctx.Process(target=f, args=(*args, start)) for f in (producer, consumer)]
+    for p in procs:
+        p.start()
+    start.wait()
+    begin = time.perf_counter()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+    return time.perf_counter() - begin
+
+
+def _bench_ring(ctx, kind: str, count: int, size: int, batch: int, capacity: int) -> float:
+    shm = SharedMemory(create=True, size=_QUEUES[kind].buffer_size(capacity, size))
+    try:
+        q = _QUEUES[kind](shm.buf, capacity, size, create=True)
+        q.release()
+        args = (kind, shm.name, count, size, batch)
+        return count / _time(ctx, _ring_producer, _ring_consumer, args)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _bench_mp(ctx, count: int, size: int, batch: int, capacity: int) -> float:
+    q = ctx.Queue(max(1, capacity // batch))
+    return count / _time(ctx, _mp_producer, _mp_consumer, (q, count, size, batch))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput between two processes, ring buffers vs multiprocessing.Queue")
+    parser.add_argument("-n", "--count", type=int, default=200_000)
+    parser.add_argument("-s", "--size", type=int, default=64, help="record size in bytes")
+    parser.add_argument("-b", "--batch", type=int, nargs="+", default=[1, 64])
+    parser.add_argument("-c", "--capacity", type=int, default=1024)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"count={args.count} size={args.size} capacity={args.capacity}  (thousand records/s)")
+    print(f"{'batch':>7} {'spsc':>10} {'mpmc':>10} {'mp.Queue':>10}")
+    for batch in args.batch:
+        results = [_bench_ring(ctx, kind, args.count, args.size, batch, args.capacity) / 1e3
+                   for kind in _QUEUES]
+        results.append(_bench_mp(ctx, args.count, args.size, batch, args.capacity) / 1e3)
+        print(f"{batch:>7} " + " ".join(f"{r:>10.1f}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from setuptools import setup, find_packages, Command, Extension
-from setuptools.command import build_py
+from setuptools.command import build_ext, build_py
 from wheel.bdist_wheel import bdist_wheel
 
 import configparser
@@ -18,6 +18,14 @@ from typing import List, Optional
 here = pathlib.Path(__file__).parent.resolve()
 
 
+_NATIVE_EXT_NAME = "atomics._impl._native"
+
+
+def _native_enabled() -> bool:
+    """Native backend can be disabled with ATOMICS_NO_NATIVE=1"""
+    return not os.environ.get("ATOMICS_NO_NATIVE")
+
+
 class BdistWheelCommand(bdist_wheel):
 
     @staticmethod
@@ -39,8 +47,15 @@ class BdistWheelCommand(bdist_wheel):
     def _in_ci() -> bool:
         return bool(os.environ.get("CI"))
 
+    def _native_built(self) -> bool:
+        """Whether build_ext put the (optional) native extension in build_lib"""
+        return getattr(self.get_finalized_command("build_ext"), "native_built", False)
+
     def get_tag(self):
         python, abi, plat = super().get_tag()
+        if _native_enabled() and self._native_built():
+            # wheel contains a CPython extension, so keep the interpreter tags
+            return python, abi, plat
         abi = "none"
         if self._in_ci():
             python = "py" + ".py".join(self._supported_versions())
@@ -280,6 +295,17 @@ class BuildPatomicCommand(Command):
             self.logger.info(f"Could not close temporary directory")
 
 
+class BuildExtCommand(build_ext.build_ext):
+
+    native_built: bool = False
+
+    def run(self):
+        build_ext.build_ext.run(self)
+        # the extension is optional, so a failed compile only logs a warning
+        path = pathlib.Path(self.get_ext_fullpath(_NATIVE_EXT_NAME))
+        self.native_built = _native_enabled() and path.is_file()
+
+
 class BuildPyCommand(build_py.build_py):
 
     def run(self):
@@ -287,12 +313,21 @@ class BuildPyCommand(build_py.build_py):
         build_py.build_py.run(self)
 
 
-# setup dummy extension to force non-pure python build
-# CIBW won't build pure python projects
-with open("dummy.c", "w") as f:
-    f.truncate()
-    f.write("/* temporary file - safe to delete */\n")
-    f.write("extern int PyInit_dummy(void) { return 0; }\n")
+if _native_enabled():
+    # optional: if compilation fails, atomics falls back to its ctypes backend
+    ext_modules = [
+        Extension(name=_NATIVE_EXT_NAME,
+                  sources=["src/atomics/_impl/_native.c"],
+                  optional=True)
+    ]
+else:
+    # setup dummy extension to force non-pure python build
+    # CIBW won't build pure python projects
+    with open("dummy.c", "w") as f:
+        f.truncate()
+        f.write("/* temporary file - safe to delete */\n")
+        f.write("extern int PyInit_dummy(void) { return 0; }\n")
+    ext_modules = [Extension(name="dummy", sources=["dummy.c"])]
 
 
 try:
@@ -302,11 +337,13 @@ try:
         package_data={"atomics": ["_clib/*"]},
         cmdclass={
             "bdist_wheel": BdistWheelCommand,
+            "build_ext": BuildExtCommand,
             "build_patomic": BuildPatomicCommand,
             "build_py": BuildPyCommand
         },
-        ext_modules=[Extension(name="dummy", sources=["dummy.c"])]
+        ext_modules=ext_modules
     )
 finally:
     # cleanup extension
-    os.remove("dummy.c")
+    if os.path.exists("dummy.c"):
+        os.remove("dummy.c")
@@ -1,14 +1,50 @@
 from ._impl.alignment import Alignment
-from ._impl.enums import MemoryOrder, OpType
+from ._impl.cacheline import cache_line_size
+from ._impl.implementation import fastest_impl
+from ._impl.enums import Backoff, MemoryOrder, OpType
 
-from ._impl.atomic.funcs import atomic, atomicview
+from ._impl.atomic.funcs import atomic, atomicarray, atomicview
 
 from ._impl.atomic.mixins.cmpxchg import CmpxchgResult
 from ._impl.atomic.mixins.types import ANY, INTEGRAL, BYTES, INT, UINT
+from ._impl.atomic.mixins.update import UpdateResult, UpdateStats
+
+import importlib
 
 __all__ = [
-    "atomic", "atomicview",
+    "atomic", "atomicarray", "atomicview", "shared", "cache_line_size", "capabilities", "fastest_impl", "preload",
     "ANY", "INTEGRAL", "BYTES", "INT", "UINT",
-    "Alignment", "CmpxchgResult",
-    "MemoryOrder", "OpType",
+    "Alignment", "AtomicBitset", "CmpxchgResult", "SeqLock", "ShardedCounter", "SharedAtomic",
+    "SharedRegion", "WidthCapabilities",
+    "UpdateResult", "UpdateStats",
+    "Backoff", "MemoryOrder", "OpType",
 ]
+
+# optional features are only imported on first access (by __getattr__), so
+# "import atomics" doesn't pay for the ones a program never uses
+_LAZY = {
+    "WidthCapabilities": "capabilities",
+    "capabilities": "capabilities",
+    "AtomicBitset": "bitset",
+    "ShardedCounter": "counter",
+    "preload": "preload",
+    "SeqLock": "seqlock",
+    "SharedAtomic": "shared",
+    "SharedRegion": "shared",
+    "shared": "shared",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f"._impl.{module}", __name__), name)
+    # later accesses don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
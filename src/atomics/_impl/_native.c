@@ -0,0 +1,1461 @@
+/*
+ * Optional native backend for atomics.
+ *
+ * Exposes OpTable, a copy of a patomic explicit ops struct, with one
+ * METH_FASTCALL method per atomic operation. Every method takes the address
+ * of the atomic object as its first argument and takes/returns Python ints
+ * (integral tables) or bytes (non-integral tables) directly, so no ctypes
+ * marshalling or temporary buffer objects are needed. The batched (*_many)
+ * methods instead take the base address of an array of atomic objects and
+ * operate on contiguous buffers of indices and values. The *_into methods
+ * read and write caller supplied buffers of raw bytes, so allocate nothing.
+ * The bits_* methods treat an array of integral words as one large bitset.
+ *
+ * The method names and signatures match CtypesOpTable in backend.py, which is
+ * used as a fallback when this module is not available.
+ *
+ * Validation of memory orders, supported ops, and readonly buffers is done in
+ * Python before calling into this module.
+ *
+ * Single operations hold the GIL for widths of up to GIL_HOLD_MAX_WIDTH bytes,
+ * where patomic uses a single lock-free instruction that is cheaper than
+ * releasing and reacquiring the GIL, and release it for wider objects, where
+ * patomic may use multi-instruction or lock-based implementations. This can be
+ * overridden per table with the release_gil argument. Batched and bitset
+ * operations always release the GIL around their loops.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#if PY_VERSION_HEX < 0x03070000
+#error "atomics._impl._native requires METH_FASTCALL (Python 3.7+)"
+#endif
+
+
+/* signatures mirror the CFUNCTYPE definitions in patomic.py */
+
+typedef void (*opsig_store_t)(volatile void *, const void *, int);
+typedef void (*opsig_load_t)(const volatile void *, int, void *);
+typedef void (*opsig_exchange_t)(volatile void *, const void *, int, void *);
+typedef int (*opsig_cmpxchg_t)(volatile void *, void *, const void *, int, int);
+typedef int (*opsig_test_t)(const volatile void *, int, int);
+typedef int (*opsig_test_modify_t)(volatile void *, int, int);
+typedef void (*opsig_fetch_t)(volatile void *, const void *, int, void *);
+typedef void (*opsig_fetch_noarg_t)(volatile void *, int, void *);
+typedef void (*opsig_void_t)(volatile void *, const void *, int);
+typedef void (*opsig_void_noarg_t)(volatile void *, int);
+typedef void (*opsig_any_t)(void);
+
+
+/* struct layouts mirror the Structure definitions in patomic.py */
+
+typedef struct {
+    opsig_void_t fp_add;
+    opsig_void_t fp_sub;
+    opsig_void_noarg_t fp_inc;
+    opsig_void_noarg_t fp_dec;
+    opsig_void_noarg_t fp_neg;
+    opsig_fetch_t fp_fetch_add;
+    opsig_fetch_t fp_fetch_sub;
+    opsig_fetch_noarg_t fp_fetch_inc;
+    opsig_fetch_noarg_t fp_fetch_dec;
+    opsig_fetch_noarg_t fp_fetch_neg;
+} ops_arithmetic_t;
+
+typedef struct {
+    opsig_void_t fp_or;
+    opsig_void_t fp_xor;
+    opsig_void_t fp_and;
+    opsig_void_noarg_t fp_not;
+    opsig_fetch_t fp_fetch_or;
+    opsig_fetch_t fp_fetch_xor;
+    opsig_fetch_t fp_fetch_and;
+    opsig_fetch_noarg_t fp_fetch_not;
+} ops_binary_t;
+
+typedef struct {
+    opsig_test_t fp_test;
+    opsig_test_modify_t fp_test_compl;
+    opsig_test_modify_t fp_test_set;
+    opsig_test_modify_t fp_test_reset;
+} ops_bitwise_t;
+
+typedef struct {
+    opsig_exchange_t fp_exchange;
+    opsig_cmpxchg_t fp_cmpxchg_weak;
+    opsig_cmpxchg_t fp_cmpxchg_strong;
+} ops_xchg_t;
+
+typedef struct {
+    opsig_store_t fp_store;
+    opsig_load_t fp_load;
+    ops_xchg_t xchg_ops;
+    ops_bitwise_t bitwise_ops;
+    ops_binary_t binary_ops;
+    ops_arithmetic_t signed_ops;
+    ops_arithmetic_t unsigned_ops;
+} ops_t;
+
+
+/* OpTable object */
+
+typedef struct {
+    PyObject_HEAD
+    ops_t ops;
+    ops_arithmetic_t arithmetic;  /* signed_ops or unsigned_ops */
+    Py_ssize_t width;
+    int is_integral;
+    int is_signed;
+    int is_native_int;  /* integral with a width of 1, 2, 4, or 8 */
+    int release_gil;    /* around single operations */
+} OpTableObject;
+
+#define GIL_HOLD_MAX_WIDTH 8
+
+/* runs a patomic call (statement), releasing the GIL if the table's policy says to */
+#define CALL_OP(self, call)                 \
+    do {                                    \
+        if ((self)->release_gil) {          \
+            Py_BEGIN_ALLOW_THREADS          \
+            call;                           \
+            Py_END_ALLOW_THREADS            \
+        }                                   \
+        else {                              \
+            call;                           \
+        }                                   \
+    } while (0)
+
+
+/* module level constants (set in module init) */
+
+static PyObject *g_byteorder = NULL;  /* equivalent of sys.byteorder */
+
+
+/* scratch buffers */
+
+#define SCRATCH_INLINE_SIZE 64
+
+typedef struct {
+    union {
+        /* forces suitable alignment for any width patomic supports inline */
+        long double ld;
+        void *vp;
+        uint64_t u64;
+        unsigned char bytes[SCRATCH_INLINE_SIZE];
+    } inline_storage;
+    unsigned char *ptr;
+} scratch_t;
+
+static int
+scratch_init(scratch_t *s, Py_ssize_t width)
+{
+    if (width <= SCRATCH_INLINE_SIZE) {
+        s->ptr = s->inline_storage.bytes;
+    }
+    else {
+        s->ptr = (unsigned char *) PyMem_Malloc((size_t) width);
+        if (s->ptr == NULL) {
+            PyErr_NoMemory();
+            return -1;
+        }
+    }
+    return 0;
+}
+
+static void
+scratch_free(scratch_t *s)
+{
+    if (s->ptr != s->inline_storage.bytes) {
+        PyMem_Free(s->ptr);
+    }
+    s->ptr = NULL;
+}
+
+
+/* argument parsing */
+
+static int
+check_nargs(const char *name, Py_ssize_t nargs, Py_ssize_t expected)
+{
+    if (nargs != expected) {
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly %zd arguments (%zd given)",
+                     name, expected, nargs);
+        return -1;
+    }
+    return 0;
+}
+
+static int
+parse_address(PyObject *obj, void **address)
+{
+    *address = PyLong_AsVoidPtr(obj);
+    if (*address == NULL) {
+        if (!PyErr_Occurred()) {
+            PyErr_SetString(PyExc_ValueError, "address must not be NULL");
+        }
+        return -1;
+    }
+    return 0;
+}
+
+static int
+parse_int(PyObject *obj, int *value)
+{
+    long v = PyLong_AsLong(obj);
+    if (v == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    if (v < INT_MIN || v > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "int too big to convert");
+        return -1;
+    }
+    *value = (int) v;
+    return 0;
+}
+
+static PyObject *
+unsupported(const char *name)
+{
+    PyErr_Format(PyExc_RuntimeError, "Operation %s is not supported by this OpTable.", name);
+    return NULL;
+}
+
+
+/* value conversion: Python -> buffer */
+
+static int
+int_in_native(OpTableObject *self, PyObject *value, unsigned char *out)
+{
+    PyObject *index = PyNumber_Index(value);
+    if (index == NULL) {
+        return -1;
+    }
+    if (self->is_signed) {
+        long long v = PyLong_AsLongLong(index);
+        Py_DECREF(index);
+        if (v == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        switch (self->width) {
+            case 1: {
+                int8_t t = (int8_t) v;
+                if (v < INT8_MIN || v > INT8_MAX) { goto overflow; }
+                memcpy(out, &t, 1);
+                break;
+            }
+            case 2: {
+                int16_t t = (int16_t) v;
+                if (v < INT16_MIN || v > INT16_MAX) { goto overflow; }
+                memcpy(out, &t, 2);
+                break;
+            }
+            case 4: {
+                int32_t t = (int32_t) v;
+                if (v < INT32_MIN || v > INT32_MAX) { goto overflow; }
+                memcpy(out, &t, 4);
+                break;
+            }
+            default: {
+                int64_t t = (int64_t) v;
+                memcpy(out, &t, 8);
+                break;
+            }
+        }
+    }
+    else {
+        unsigned long long v = PyLong_AsUnsignedLongLong(index);
+        Py_DECREF(index);
+        if (v == (unsigned long long) -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        switch (self->width) {
+            case 1: {
+                uint8_t t = (uint8_t) v;
+                if (v > UINT8_MAX) { goto overflow; }
+                memcpy(out, &t, 1);
+                break;
+            }
+            case 2: {
+                uint16_t t = (uint16_t) v;
+                if (v > UINT16_MAX) { goto overflow; }
+                memcpy(out, &t, 2);
+                break;
+            }
+            case 4: {
+                uint32_t t = (uint32_t) v;
+                if (v > UINT32_MAX) { goto overflow; }
+                memcpy(out, &t, 4);
+                break;
+            }
+            default: {
+                uint64_t t = (uint64_t) v;
+                memcpy(out, &t, 8);
+                break;
+            }
+        }
+    }
+    return 0;
+
+overflow:
+    PyErr_SetString(PyExc_OverflowError, "int too big to convert");
+    return -1;
+}
+
+static int
+int_in_generic(OpTableObject *self, PyObject *value, unsigned char *out)
+{
+    /* equivalent of value.to_bytes(width, sys.byteorder, signed=is_signed) */
+    PyObject *meth = NULL, *args = NULL, *kwargs = NULL, *res = NULL;
+    int ret = -1;
+    meth = PyObject_GetAttrString(value, "to_bytes");
+    if (meth == NULL) { goto done; }
+    args = Py_BuildValue("(nO)", self->width, g_byteorder);
+    if (args == NULL) { goto done; }
+    kwargs = Py_BuildValue("{s:O}", "signed", self->is_signed ? Py_True : Py_False);
+    if (kwargs == NULL) { goto done; }
+    res = PyObject_Call(meth, args, kwargs);
+    if (res == NULL) { goto done; }
+    if (!PyBytes_Check(res) || PyBytes_GET_SIZE(res) != self->width) {
+        PyErr_SetString(PyExc_SystemError, "int.to_bytes returned unexpected result");
+        goto done;
+    }
+    memcpy(out, PyBytes_AS_STRING(res), (size_t) self->width);
+    ret = 0;
+done:
+    Py_XDECREF(meth);
+    Py_XDECREF(args);
+    Py_XDECREF(kwargs);
+    Py_XDECREF(res);
+    return ret;
+}
+
+static int
+bytes_in(OpTableObject *self, PyObject *value, unsigned char *out, const char *name)
+{
+    Py_buffer view;
+    if (PyObject_GetBuffer(value, &view, PyBUF_SIMPLE) < 0) {
+        return -1;
+    }
+    if (view.len != self->width) {
+        PyBuffer_Release(&view);
+        PyErr_Format(PyExc_ValueError, "'%s' object length does not match width.", name);
+        return -1;
+    }
+    memcpy(out, view.buf, (size_t) self->width);
+    PyBuffer_Release(&view);
+    return 0;
+}
+
+static int
+value_in(OpTableObject *self, PyObject *value, unsigned char *out, const char *name)
+{
+    if (self->is_native_int) {
+        return int_in_native(self, value, out);
+    }
+    else if (self->is_integral) {
+        return int_in_generic(self, value, out);
+    }
+    else {
+        return bytes_in(self, value, out, name);
+    }
+}
+
+
+/* value conversion: buffer -> Python */
+
+static PyObject *
+int_out_native(OpTableObject *self, const unsigned char *in)
+{
+    if (self->is_signed) {
+        switch (self->width) {
+            case 1: { int8_t t; memcpy(&t, in, 1); return PyLong_FromLong(t); }
+            case 2: { int16_t t; memcpy(&t, in, 2); return PyLong_FromLong(t); }
+            case 4: { int32_t t; memcpy(&t, in, 4); return PyLong_FromLong(t); }
+            default: { int64_t t; memcpy(&t, in, 8); return PyLong_FromLongLong(t); }
+        }
+    }
+    else {
+        switch (self->width) {
+            case 1: { uint8_t t; memcpy(&t, in, 1); return PyLong_FromUnsignedLong(t); }
+            case 2: { uint16_t t; memcpy(&t, in, 2); return PyLong_FromUnsignedLong(t); }
+            case 4: { uint32_t t; memcpy(&t, in, 4); return PyLong_FromUnsignedLong(t); }
+            default: { uint64_t t; memcpy(&t, in, 8); return PyLong_FromUnsignedLongLong(t); }
+        }
+    }
+}
+
+static PyObject *
+int_out_generic(OpTableObject *self, const unsigned char *in)
+{
+    /* equivalent of int.from_bytes(in, sys.byteorder, signed=is_signed) */
+    PyObject *meth = NULL, *args = NULL, *kwargs = NULL, *res = NULL;
+    meth = PyObject_GetAttrString((PyObject *) &PyLong_Type, "from_bytes");
+    if (meth == NULL) { goto done; }
+    args = Py_BuildValue("(y#O)", (const char *) in, self->width, g_byteorder);
+    if (args == NULL) { goto done; }
+    kwargs = Py_BuildValue("{s:O}", "signed", self->is_signed ? Py_True : Py_False);
+    if (kwargs == NULL) { goto done; }
+    res = PyObject_Call(meth, args, kwargs);
+done:
+    Py_XDECREF(meth);
+    Py_XDECREF(args);
+    Py_XDECREF(kwargs);
+    return res;
+}
+
+static PyObject *
+value_out(OpTableObject *self, const unsigned char *in)
+{
+    if (self->is_native_int) {
+        return int_out_native(self, in);
+    }
+    else if (self->is_integral) {
+        return int_out_generic(self, in);
+    }
+    else {
+        return PyBytes_FromStringAndSize((const char *) in, self->width);
+    }
+}
+
+
+/* operation implementations shared by multiple methods */
+
+static PyObject *
+impl_void(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+          const char *name, opsig_void_t fp)
+{
+    /* (address, value, order) -> None */
+    void *obj;
+    int order;
+    scratch_t arg;
+    if (check_nargs(name, nargs, 3) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (scratch_init(&arg, self->width) < 0) {
+        return NULL;
+    }
+    if (value_in(self, args[1], arg.ptr, "value") < 0 || parse_int(args[2], &order) < 0) {
+        scratch_free(&arg);
+        return NULL;
+    }
+    CALL_OP(self, fp(obj, arg.ptr, order));
+    scratch_free(&arg);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+impl_void_noarg(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+                const char *name, opsig_void_noarg_t fp)
+{
+    /* (address, order) -> None */
+    void *obj;
+    int order;
+    if (check_nargs(name, nargs, 2) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (parse_int(args[1], &order) < 0) {
+        return NULL;
+    }
+    CALL_OP(self, fp(obj, order));
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+impl_fetch(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+           const char *name, opsig_fetch_t fp)
+{
+    /* (address, value, order) -> value */
+    void *obj;
+    int order;
+    scratch_t arg, res;
+    PyObject *result;
+    if (check_nargs(name, nargs, 3) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (scratch_init(&arg, self->width) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&res, self->width) < 0) {
+        scratch_free(&arg);
+        return NULL;
+    }
+    if (value_in(self, args[1], arg.ptr, "value") < 0 || parse_int(args[2], &order) < 0) {
+        result = NULL;
+    }
+    else {
+        CALL_OP(self, fp(obj, arg.ptr, order, res.ptr));
+        result = value_out(self, res.ptr);
+    }
+    scratch_free(&arg);
+    scratch_free(&res);
+    return result;
+}
+
+static PyObject *
+impl_fetch_noarg(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+                 const char *name, opsig_fetch_noarg_t fp)
+{
+    /* (address, order) -> value */
+    void *obj;
+    int order;
+    scratch_t res;
+    PyObject *result;
+    if (check_nargs(name, nargs, 2) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (parse_int(args[1], &order) < 0 || scratch_init(&res, self->width) < 0) {
+        return NULL;
+    }
+    CALL_OP(self, fp(obj, order, res.ptr));
+    result = value_out(self, res.ptr);
+    scratch_free(&res);
+    return result;
+}
+
+static PyObject *
+impl_test(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+          const char *name, opsig_test_modify_t fp)
+{
+    /* (address, index, order) -> bool */
+    void *obj;
+    int index, order, res;
+    if (check_nargs(name, nargs, 3) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (parse_int(args[1], &index) < 0 || parse_int(args[2], &order) < 0) {
+        return NULL;
+    }
+    CALL_OP(self, res = fp(obj, index, order));
+    return PyBool_FromLong(res);
+}
+
+static PyObject *
+impl_cmpxchg(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+             const char *name, opsig_cmpxchg_t fp)
+{
+    /* (address, expected, desired, succ, fail) -> (bool, value) */
+    void *obj;
+    int succ, fail, ok;
+    scratch_t exp, des;
+    PyObject *result = NULL, *value;
+    if (check_nargs(name, nargs, 5) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (scratch_init(&exp, self->width) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&des, self->width) < 0) {
+        scratch_free(&exp);
+        return NULL;
+    }
+    if (value_in(self, args[1], exp.ptr, "expected") < 0 ||
+        value_in(self, args[2], des.ptr, "desired") < 0 ||
+        parse_int(args[3], &succ) < 0 ||
+        parse_int(args[4], &fail) < 0) {
+        goto done;
+    }
+    CALL_OP(self, ok = fp(obj, exp.ptr, des.ptr, succ, fail));
+    value = value_out(self, exp.ptr);
+    if (value != NULL) {
+        result = Py_BuildValue("(NN)", PyBool_FromLong(ok), value);
+    }
+done:
+    scratch_free(&exp);
+    scratch_free(&des);
+    return result;
+}
+
+
+/* operations on caller supplied buffers
+ *
+ * Values are the raw bytes of the atomic object regardless of whether the
+ * table is integral. Buffers are copied through aligned scratch, since they
+ * may not be suitably aligned.
+ */
+
+static int
+into_buffer(OpTableObject *self, PyObject *obj, Py_buffer *view, const char *name)
+{
+    /* writable buffer of exactly width bytes; released by the caller on success */
+    if (PyObject_GetBuffer(obj, view, PyBUF_SIMPLE) < 0) {
+        return -1;
+    }
+    if (view->readonly) {
+        PyErr_Format(PyExc_BufferError, "'%s' object is not writable.", name);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    if (view->len != self->width) {
+        PyErr_Format(PyExc_ValueError, "'%s' object length does not match width.", name);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+OpTable_load_into(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* (address, out, order) -> None */
+    void *obj;
+    int order;
+    scratch_t res;
+    Py_buffer out;
+    if (check_nargs("load_into", nargs, 3) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (self->ops.fp_load == NULL) {
+        return unsupported("load_into");
+    }
+    if (parse_int(args[2], &order) < 0 || scratch_init(&res, self->width) < 0) {
+        return NULL;
+    }
+    if (into_buffer(self, args[1], &out, "out") < 0) {
+        scratch_free(&res);
+        return NULL;
+    }
+    CALL_OP(self, self->ops.fp_load(obj, order, res.ptr));
+    memcpy(out.buf, res.ptr, (size_t) self->width);
+    PyBuffer_Release(&out);
+    scratch_free(&res);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+OpTable_exchange_into(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* (address, desired, out, order) -> None */
+    void *obj;
+    int order;
+    scratch_t des, res;
+    Py_buffer out;
+    PyObject *result = NULL;
+    if (check_nargs("exchange_into", nargs, 4) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (self->ops.xchg_ops.fp_exchange == NULL) {
+        return unsupported("exchange_into");
+    }
+    if (parse_int(args[3], &order) < 0 || scratch_init(&des, self->width) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&res, self->width) < 0) {
+        scratch_free(&des);
+        return NULL;
+    }
+    /* desired may be the same object as out, so is read first */
+    if (bytes_in(self, args[1], des.ptr, "desired") < 0 ||
+        into_buffer(self, args[2], &out, "out") < 0) {
+        goto done;
+    }
+    CALL_OP(self, self->ops.xchg_ops.fp_exchange(obj, des.ptr, order, res.ptr));
+    memcpy(out.buf, res.ptr, (size_t) self->width);
+    PyBuffer_Release(&out);
+    result = Py_None;
+    Py_INCREF(result);
+done:
+    scratch_free(&des);
+    scratch_free(&res);
+    return result;
+}
+
+static PyObject *
+impl_cmpxchg_into(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+                  const char *name, opsig_cmpxchg_t fp)
+{
+    /* (address, expected, desired, succ, fail) -> bool
+     * expected is updated in place with the current value on failure */
+    void *obj;
+    int succ, fail, ok;
+    scratch_t exp, des;
+    Py_buffer exp_view;
+    PyObject *result = NULL;
+    if (check_nargs(name, nargs, 5) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    if (parse_int(args[3], &succ) < 0 || parse_int(args[4], &fail) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&exp, self->width) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&des, self->width) < 0) {
+        scratch_free(&exp);
+        return NULL;
+    }
+    if (bytes_in(self, args[2], des.ptr, "desired") < 0 ||
+        into_buffer(self, args[1], &exp_view, "expected") < 0) {
+        goto done;
+    }
+    memcpy(exp.ptr, exp_view.buf, (size_t) self->width);
+    CALL_OP(self, ok = fp(obj, exp.ptr, des.ptr, succ, fail));
+    if (!ok) {
+        memcpy(exp_view.buf, exp.ptr, (size_t) self->width);
+    }
+    PyBuffer_Release(&exp_view);
+    result = PyBool_FromLong(ok);
+done:
+    scratch_free(&exp);
+    scratch_free(&des);
+    return result;
+}
+
+
+/* batched operations
+ *
+ * (base, stride, length, indices, [values], [out], order) -> None
+ * indices is a contiguous buffer of native int64, values and out are contiguous
+ * buffers of (len(indices) * width) bytes. Every index is checked before any
+ * operation is performed, and the loop itself runs without the GIL.
+ */
+
+typedef enum {
+    MANY_LOAD,   /* opsig_load_t, writes out */
+    MANY_VOID,   /* opsig_void_t (or opsig_store_t), reads values */
+    MANY_FETCH   /* opsig_fetch_t, reads values and writes out */
+} many_kind_t;
+
+static int
+many_index(const unsigned char *indices, Py_ssize_t k, Py_ssize_t length, Py_ssize_t *index)
+{
+    int64_t i;
+    memcpy(&i, indices + (k * (Py_ssize_t) sizeof(int64_t)), sizeof(int64_t));
+    if (i < 0) {
+        i += length;
+    }
+    if (i < 0 || i >= length) {
+        return -1;
+    }
+    *index = (Py_ssize_t) i;
+    return 0;
+}
+
+static int
+many_buffer(PyObject *obj, Py_buffer *view, int flags, Py_ssize_t nbytes, const char *name)
+{
+    if (PyObject_GetBuffer(obj, view, flags) < 0) {
+        return -1;
+    }
+    if (view->len != nbytes) {
+        PyErr_Format(PyExc_ValueError, "'%s' object length does not match 'indices' length.", name);
+        PyBuffer_Release(view);
+        view->obj = NULL;
+        view->buf = NULL;
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+impl_many(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs,
+          const char *name, many_kind_t kind, opsig_any_t fp)
+{
+    unsigned char *base, *idx, *val = NULL, *res = NULL;
+    unsigned char **objs = NULL;
+    Py_ssize_t stride, length, count, width = self->width, k, i;
+    Py_ssize_t val_arg = 4, res_arg = (kind == MANY_FETCH) ? 5 : 4;
+    int order;
+    Py_buffer idx_view = {NULL}, val_view = {NULL}, res_view = {NULL};
+    scratch_t arg, out;
+    PyObject *result = NULL;
+
+    if (check_nargs(name, nargs, (kind == MANY_FETCH) ? 7 : 6) < 0 ||
+        parse_address(args[0], (void **) &base) < 0) {
+        return NULL;
+    }
+    if (fp == NULL) {
+        return unsupported(name);
+    }
+    stride = PyLong_AsSsize_t(args[1]);
+    if (stride == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    length = PyLong_AsSsize_t(args[2]);
+    if (length == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (parse_int(args[nargs - 1], &order) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&arg, width) < 0) {
+        return NULL;
+    }
+    if (scratch_init(&out, width) < 0) {
+        scratch_free(&arg);
+        return NULL;
+    }
+
+    /* pin and check buffers */
+    if (PyObject_GetBuffer(args[3], &idx_view, PyBUF_SIMPLE) < 0) {
+        idx_view.obj = NULL;
+        goto done;
+    }
+    if (idx_view.len % (Py_ssize_t) sizeof(int64_t) != 0) {
+        PyErr_SetString(PyExc_ValueError, "'indices' object length must be a multiple of 8.");
+        goto done;
+    }
+    count = idx_view.len / (Py_ssize_t) sizeof(int64_t);
+    idx = (unsigned char *) idx_view.buf;
+    if (kind != MANY_LOAD) {
+        if (many_buffer(args[val_arg], &val_view, PyBUF_SIMPLE, count * width, "values") < 0) {
+            goto done;
+        }
+        val = (unsigned char *) val_view.buf;
+    }
+    if (kind != MANY_VOID) {
+        if (many_buffer(args[res_arg], &res_view, PyBUF_WRITABLE, count * width, "out") < 0) {
+            goto done;
+        }
+        res = (unsigned char *) res_view.buf;
+    }
+    /* every index is checked before any operation is performed, and the
+     * addresses are copied while checking, since other threads may modify the
+     * indices buffer once the GIL is released */
+    objs = PyMem_Malloc((size_t) (count ? count : 1) * sizeof(unsigned char *));
+    if (objs == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    for (k = 0; k < count; ++k) {
+        if (many_index(idx, k, length, &i) < 0) {
+            PyErr_SetString(PyExc_IndexError, "Atomic array index out of range.");
+            goto done;
+        }
+        objs[k] = base + (i * stride);
+    }
+
+    /* values go through aligned scratch, since buffers may not be aligned */
+    Py_BEGIN_ALLOW_THREADS
+    for (k = 0; k < count; ++k) {
+        unsigned char *obj = objs[k];
+        switch (kind) {
+            case MANY_LOAD:
+                ((opsig_load_t) fp)(obj, order, out.ptr);
+                memcpy(res + (k * width), out.ptr, (size_t) width);
+                break;
+            case MANY_VOID:
+                memcpy(arg.ptr, val + (k * width), (size_t) width);
+                ((opsig_void_t) fp)(obj, arg.ptr, order);
+                break;
+            case MANY_FETCH:
+                memcpy(arg.ptr, val + (k * width), (size_t) width);
+                ((opsig_fetch_t) fp)(obj, arg.ptr, order, out.ptr);
+                memcpy(res + (k * width), out.ptr, (size_t) width);
+                break;
+        }
+    }
+    Py_END_ALLOW_THREADS
+    result = Py_None;
+    Py_INCREF(result);
+
+done:
+    PyMem_Free(objs);
+    if (idx_view.obj != NULL) {
+        PyBuffer_Release(&idx_view);
+    }
+    if (val_view.obj != NULL) {
+        PyBuffer_Release(&val_view);
+    }
+    if (res_view.obj != NULL) {
+        PyBuffer_Release(&res_view);
+    }
+    scratch_free(&arg);
+    scratch_free(&out);
+    return result;
+}
+
+
+/* bitset operations
+ *
+ * treat an array of ceil(nbits / (8 * width)) consecutive words (integral
+ * tables with a width of 1, 2, 4, or 8 only) as a single bitset, where bit i is
+ * bit (i % (8 * width)) of word (i / (8 * width)); bits at or past nbits in the
+ * last word are ignored. Both loops run without the GIL.
+ */
+
+static uint64_t
+word_load(OpTableObject *self, void *obj, int order)
+{
+    /* patomic reads into storage of the word's own type, so it is aligned */
+    switch (self->width) {
+        case 1: { uint8_t v; self->ops.fp_load(obj, order, &v); return v; }
+        case 2: { uint16_t v; self->ops.fp_load(obj, order, &v); return v; }
+        case 4: { uint32_t v; self->ops.fp_load(obj, order, &v); return v; }
+        default: { uint64_t v; self->ops.fp_load(obj, order, &v); return v; }
+    }
+}
+
+static int
+word_cmpxchg_weak(OpTableObject *self, void *obj, uint64_t *expected, uint64_t desired,
+                  int succ, int fail)
+{
+    /* updates expected on failure, like cmpxchg */
+    opsig_cmpxchg_t fp = self->ops.xchg_ops.fp_cmpxchg_weak;
+    int ok;
+    switch (self->width) {
+        case 1: {
+            uint8_t e = (uint8_t) *expected, d = (uint8_t) desired;
+            ok = fp(obj, &e, &d, succ, fail);
+            *expected = e;
+            return ok;
+        }
+        case 2: {
+            uint16_t e = (uint16_t) *expected, d = (uint16_t) desired;
+            ok = fp(obj, &e, &d, succ, fail);
+            *expected = e;
+            return ok;
+        }
+        case 4: {
+            uint32_t e = (uint32_t) *expected, d = (uint32_t) desired;
+            ok = fp(obj, &e, &d, succ, fail);
+            *expected = e;
+            return ok;
+        }
+        default:
+            return fp(obj, expected, &desired, succ, fail);
+    }
+}
+
+static int
+popcount64(uint64_t v)
+{
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_popcountll(v);
+#else
+    int count = 0;
+    for (; v != 0; v &= v - 1) {
+        ++count;
+    }
+    return count;
+#endif
+}
+
+static int
+lowest_bit64(uint64_t v)
+{
+    /* v must not be 0 */
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_ctzll(v);
+#else
+    int index = 0;
+    for (; (v & 1) == 0; v >>= 1) {
+        ++index;
+    }
+    return index;
+#endif
+}
+
+static int
+bits_args(OpTableObject *self, const char *name, PyObject *const *args,
+          unsigned char **base, Py_ssize_t *nbits, Py_ssize_t *nwords)
+{
+    Py_ssize_t word_bits = self->width * 8;
+    if (!self->is_native_int) {
+        PyErr_Format(PyExc_TypeError, "%s() requires an integral OpTable with a width of 1, 2, 4, or 8.", name);
+        return -1;
+    }
+    if (parse_address(args[0], (void **) base) < 0) {
+        return -1;
+    }
+    *nbits = PyLong_AsSsize_t(args[1]);
+    if (*nbits == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    if (*nbits < 0) {
+        PyErr_SetString(PyExc_ValueError, "'nbits' must not be negative.");
+        return -1;
+    }
+    *nwords = (*nbits + word_bits - 1) / word_bits;
+    return 0;
+}
+
+static uint64_t
+bits_valid_mask(Py_ssize_t word_bits, Py_ssize_t nbits, Py_ssize_t w, Py_ssize_t nwords)
+{
+    /* bits of word w which are part of the bitset */
+    Py_ssize_t tail = nbits - ((nwords - 1) * word_bits);
+    uint64_t full = (word_bits == 64) ? UINT64_MAX : ((UINT64_C(1) << word_bits) - 1);
+    if (w != nwords - 1 || tail == word_bits) {
+        return full;
+    }
+    return (UINT64_C(1) << tail) - 1;
+}
+
+static PyObject *
+OpTable_bits_claim(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* (base, nbits, start_word, succ, fail) -> index of the claimed bit, or -1
+     * finds a clear bit (scanning words from start_word, wrapping around) and
+     * sets it with a word-level cmpxchg; a full bitset is scanned only once */
+    unsigned char *base;
+    Py_ssize_t nbits, nwords, start, k, w, found = -1, word_bits = self->width * 8;
+    int succ, fail;
+    if (check_nargs("bits_claim", nargs, 5) < 0 ||
+        bits_args(self, "bits_claim", args, &base, &nbits, &nwords) < 0) {
+        return NULL;
+    }
+    if (self->ops.fp_load == NULL || self->ops.xchg_ops.fp_cmpxchg_weak == NULL) {
+        return unsupported("bits_claim");
+    }
+    start = PyLong_AsSsize_t(args[2]);
+    if (start == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (parse_int(args[3], &succ) < 0 || parse_int(args[4], &fail) < 0) {
+        return NULL;
+    }
+    if (nwords == 0) {
+        return PyLong_FromSsize_t(-1);
+    }
+    start = ((start % nwords) + nwords) % nwords;
+
+    Py_BEGIN_ALLOW_THREADS
+    for (k = 0; k < nwords && found < 0; ++k) {
+        void *obj;
+        uint64_t valid, word;
+        w = (start + k) % nwords;
+        obj = base + (w * self->width);
+        valid = bits_valid_mask(word_bits, nbits, w, nwords);
+        word = word_load(self, obj, fail);
+        /* retry this word until it is full or a bit in it is claimed */
+        while ((~word & valid) != 0) {
+            uint64_t bit = UINT64_C(1) << lowest_bit64(~word & valid);
+            if (word_cmpxchg_weak(self, obj, &word, word | bit, succ, fail)) {
+                found = (w * word_bits) + lowest_bit64(bit);
+                break;
+            }
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    return PyLong_FromSsize_t(found);
+}
+
+static PyObject *
+OpTable_bits_count(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* (base, nbits, order) -> number of set bits
+     * each word is loaded atomically, but the total is not a snapshot */
+    unsigned char *base;
+    Py_ssize_t nbits, nwords, w, count = 0, word_bits = self->width * 8;
+    int order;
+    if (check_nargs("bits_count", nargs, 3) < 0 ||
+        bits_args(self, "bits_count", args, &base, &nbits, &nwords) < 0) {
+        return NULL;
+    }
+    if (self->ops.fp_load == NULL) {
+        return unsupported("bits_count");
+    }
+    if (parse_int(args[2], &order) < 0) {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    for (w = 0; w < nwords; ++w) {
+        uint64_t word = word_load(self, base + (w * self->width), order);
+        count += popcount64(word & bits_valid_mask(word_bits, nbits, w, nwords));
+    }
+    Py_END_ALLOW_THREADS
+
+    return PyLong_FromSsize_t(count);
+}
+
+
+/* OpTable methods */
+
+static PyObject *
+OpTable_store(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* (address, desired, order) -> None */
+    void *obj;
+    int order;
+    scratch_t des;
+    if (check_nargs("store", nargs, 3) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (self->ops.fp_store == NULL) {
+        return unsupported("store");
+    }
+    if (scratch_init(&des, self->width) < 0) {
+        return NULL;
+    }
+    if (value_in(self, args[1], des.ptr, "desired") < 0 || parse_int(args[2], &order) < 0) {
+        scratch_free(&des);
+        return NULL;
+    }
+    CALL_OP(self, self->ops.fp_store(obj, des.ptr, order));
+    scratch_free(&des);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+OpTable_load(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* (address, order) -> value */
+    void *obj;
+    int order;
+    scratch_t res;
+    PyObject *result;
+    if (check_nargs("load", nargs, 2) < 0 || parse_address(args[0], &obj) < 0) {
+        return NULL;
+    }
+    if (self->ops.fp_load == NULL) {
+        return unsupported("load");
+    }
+    if (parse_int(args[1], &order) < 0 || scratch_init(&res, self->width) < 0) {
+        return NULL;
+    }
+    CALL_OP(self, self->ops.fp_load(obj, order, res.ptr));
+    result = value_out(self, res.ptr);
+    scratch_free(&res);
+    return result;
+}
+
+static PyObject *
+OpTable_exchange(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    /* exchange has the same signature as a fetch op */
+    return impl_fetch(self, args, nargs, "exchange",
+                      (opsig_fetch_t) self->ops.xchg_ops.fp_exchange);
+}
+
+#define DEFINE_OP_METHOD(name, impl, fptype, field)                                 \
+    static PyObject *                                                               \
+    OpTable_##name(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)    \
+    {                                                                               \
+        return impl(self, args, nargs, #name, (fptype) self->field);                \
+    }
+
+DEFINE_OP_METHOD(cmpxchg_weak, impl_cmpxchg, opsig_cmpxchg_t, ops.xchg_ops.fp_cmpxchg_weak)
+DEFINE_OP_METHOD(cmpxchg_strong, impl_cmpxchg, opsig_cmpxchg_t, ops.xchg_ops.fp_cmpxchg_strong)
+DEFINE_OP_METHOD(cmpxchg_weak_into, impl_cmpxchg_into, opsig_cmpxchg_t, ops.xchg_ops.fp_cmpxchg_weak)
+DEFINE_OP_METHOD(cmpxchg_strong_into, impl_cmpxchg_into, opsig_cmpxchg_t, ops.xchg_ops.fp_cmpxchg_strong)
+
+/* fp_test only differs from the others in the constness of the object */
+DEFINE_OP_METHOD(bit_test, impl_test, opsig_test_modify_t, ops.bitwise_ops.fp_test)
+DEFINE_OP_METHOD(bit_test_compl, impl_test, opsig_test_modify_t, ops.bitwise_ops.fp_test_compl)
+DEFINE_OP_METHOD(bit_test_set, impl_test, opsig_test_modify_t, ops.bitwise_ops.fp_test_set)
+DEFINE_OP_METHOD(bit_test_reset, impl_test, opsig_test_modify_t, ops.bitwise_ops.fp_test_reset)
+
+DEFINE_OP_METHOD(bin_or, impl_void, opsig_void_t, ops.binary_ops.fp_or)
+DEFINE_OP_METHOD(bin_xor, impl_void, opsig_void_t, ops.binary_ops.fp_xor)
+DEFINE_OP_METHOD(bin_and, impl_void, opsig_void_t, ops.binary_ops.fp_and)
+DEFINE_OP_METHOD(bin_not, impl_void_noarg, opsig_void_noarg_t, ops.binary_ops.fp_not)
+DEFINE_OP_METHOD(bin_fetch_or, impl_fetch, opsig_fetch_t, ops.binary_ops.fp_fetch_or)
+DEFINE_OP_METHOD(bin_fetch_xor, impl_fetch, opsig_fetch_t, ops.binary_ops.fp_fetch_xor)
+DEFINE_OP_METHOD(bin_fetch_and, impl_fetch, opsig_fetch_t, ops.binary_ops.fp_fetch_and)
+DEFINE_OP_METHOD(bin_fetch_not, impl_fetch_noarg, opsig_fetch_noarg_t, ops.binary_ops.fp_fetch_not)
+
+DEFINE_OP_METHOD(add, impl_void, opsig_void_t, arithmetic.fp_add)
+DEFINE_OP_METHOD(sub, impl_void, opsig_void_t, arithmetic.fp_sub)
+DEFINE_OP_METHOD(inc, impl_void_noarg, opsig_void_noarg_t, arithmetic.fp_inc)
+DEFINE_OP_METHOD(dec, impl_void_noarg, opsig_void_noarg_t, arithmetic.fp_dec)
+DEFINE_OP_METHOD(neg, impl_void_noarg, opsig_void_noarg_t, arithmetic.fp_neg)
+DEFINE_OP_METHOD(fetch_add, impl_fetch, opsig_fetch_t, arithmetic.fp_fetch_add)
+DEFINE_OP_METHOD(fetch_sub, impl_fetch, opsig_fetch_t, arithmetic.fp_fetch_sub)
+DEFINE_OP_METHOD(fetch_inc, impl_fetch_noarg, opsig_fetch_noarg_t, arithmetic.fp_fetch_inc)
+DEFINE_OP_METHOD(fetch_dec, impl_fetch_noarg, opsig_fetch_noarg_t, arithmetic.fp_fetch_dec)
+DEFINE_OP_METHOD(fetch_neg, impl_fetch_noarg, opsig_fetch_noarg_t, arithmetic.fp_fetch_neg)
+
+#define DEFINE_MANY_METHOD(name, kind, field)                                        \
+    static PyObject *                                                               \
+    OpTable_##name(OpTableObject *self, PyObject *const *args, Py_ssize_t nargs)    \
+    {                                                                               \
+        return impl_many(self, args, nargs, #name, kind, (opsig_any_t) self->field); \
+    }
+
+DEFINE_MANY_METHOD(load_many, MANY_LOAD, ops.fp_load)
+DEFINE_MANY_METHOD(store_many, MANY_VOID, ops.fp_store)
+DEFINE_MANY_METHOD(add_many, MANY_VOID, arithmetic.fp_add)
+DEFINE_MANY_METHOD(sub_many, MANY_VOID, arithmetic.fp_sub)
+DEFINE_MANY_METHOD(fetch_add_many, MANY_FETCH, arithmetic.fp_fetch_add)
+DEFINE_MANY_METHOD(fetch_sub_many, MANY_FETCH, arithmetic.fp_fetch_sub)
+
+#undef DEFINE_OP_METHOD
+#undef DEFINE_MANY_METHOD
+
+#define OP_METHOD_DEF(name) \
+    {#name, (PyCFunction)(void(*)(void)) OpTable_##name, METH_FASTCALL, NULL}
+
+static PyMethodDef OpTable_methods[] = {
+    OP_METHOD_DEF(store),
+    OP_METHOD_DEF(load),
+    OP_METHOD_DEF(exchange),
+    OP_METHOD_DEF(cmpxchg_weak),
+    OP_METHOD_DEF(cmpxchg_strong),
+    OP_METHOD_DEF(load_into),
+    OP_METHOD_DEF(exchange_into),
+    OP_METHOD_DEF(cmpxchg_weak_into),
+    OP_METHOD_DEF(cmpxchg_strong_into),
+    OP_METHOD_DEF(bit_test),
+    OP_METHOD_DEF(bit_test_compl),
+    OP_METHOD_DEF(bit_test_set),
+    OP_METHOD_DEF(bit_test_reset),
+    OP_METHOD_DEF(bin_or),
+    OP_METHOD_DEF(bin_xor),
+    OP_METHOD_DEF(bin_and),
+    OP_METHOD_DEF(bin_not),
+    OP_METHOD_DEF(bin_fetch_or),
+    OP_METHOD_DEF(bin_fetch_xor),
+    OP_METHOD_DEF(bin_fetch_and),
+    OP_METHOD_DEF(bin_fetch_not),
+    OP_METHOD_DEF(add),
+    OP_METHOD_DEF(sub),
+    OP_METHOD_DEF(inc),
+    OP_METHOD_DEF(dec),
+    OP_METHOD_DEF(neg),
+    OP_METHOD_DEF(fetch_add),
+    OP_METHOD_DEF(fetch_sub),
+    OP_METHOD_DEF(fetch_inc),
+    OP_METHOD_DEF(fetch_dec),
+    OP_METHOD_DEF(fetch_neg),
+    OP_METHOD_DEF(load_many),
+    OP_METHOD_DEF(store_many),
+    OP_METHOD_DEF(add_many),
+    OP_METHOD_DEF(sub_many),
+    OP_METHOD_DEF(fetch_add_many),
+    OP_METHOD_DEF(fetch_sub_many),
+    OP_METHOD_DEF(bits_claim),
+    OP_METHOD_DEF(bits_count),
+    {NULL, NULL, 0, NULL}
+};
+
+#undef OP_METHOD_DEF
+
+
+/* OpTable type */
+
+static PyObject *
+OpTable_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+    static char *kwlist[] = {"ops_address", "width", "is_integral", "is_signed", "release_gil", NULL};
+    PyObject *ops_address_obj, *release_gil_obj = Py_None;
+    Py_ssize_t width;
+    int is_integral, is_signed, release_gil;
+    void *ops_address;
+    OpTableObject *self;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Onpp|O:OpTable", kwlist,
+                                     &ops_address_obj, &width, &is_integral, &is_signed,
+                                     &release_gil_obj)) {
+        return NULL;
+    }
+    if (parse_address(ops_address_obj, &ops_address) < 0) {
+        return NULL;
+    }
+    if (width <= 0) {
+        PyErr_SetString(PyExc_ValueError, "width must be positive");
+        return NULL;
+    }
+    /* None picks the default policy for the width */
+    if (release_gil_obj == Py_None) {
+        release_gil = width > GIL_HOLD_MAX_WIDTH;
+    }
+    else if ((release_gil = PyObject_IsTrue(release_gil_obj)) < 0) {
+        return NULL;
+    }
+
+    self = (OpTableObject *) type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    memcpy(&self->ops, ops_address, sizeof(ops_t));
+    self->arithmetic = is_signed ? self->ops.signed_ops : self->ops.unsigned_ops;
+    self->width = width;
+    self->is_integral = is_integral;
+    self->is_signed = is_signed;
+    self->is_native_int = is_integral && (width == 1 || width == 2 || width == 4 || width == 8);
+    self->release_gil = release_gil;
+    return (PyObject *) self;
+}
+
+static PyObject *
+OpTable_get_release_gil(OpTableObject *self, void *closure)
+{
+    return PyBool_FromLong(self->release_gil);
+}
+
+static PyGetSetDef OpTable_getset[] = {
+    {"release_gil", (getter) OpTable_get_release_gil, NULL, NULL, NULL},
+    {NULL, NULL, NULL, NULL, NULL}
+};
+
+static PyObject *
+OpTable_repr(OpTableObject *self)
+{
+    return PyUnicode_FromFormat("OpTable(width=%zd, is_integral=%s, is_signed=%s, release_gil=%s)",
+                                self->width,
+                                self->is_integral ? "True" : "False",
+                                self->is_signed ? "True" : "False",
+                                self->release_gil ? "True" : "False");
+}
+
+static PyTypeObject OpTable_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "atomics._impl._native.OpTable",    /* tp_name */
+    sizeof(OpTableObject),              /* tp_basicsize */
+    0,                                  /* tp_itemsize */
+    0,                                  /* tp_dealloc */
+    0,                                  /* tp_vectorcall_offset */
+    0,                                  /* tp_getattr */
+    0,                                  /* tp_setattr */
+    0,                                  /* tp_as_async */
+    (reprfunc) OpTable_repr,            /* tp_repr */
+    0,                                  /* tp_as_number */
+    0,                                  /* tp_as_sequence */
+    0,                                  /* tp_as_mapping */
+    0,                                  /* tp_hash */
+    0,                                  /* tp_call */
+    0,                                  /* tp_str */
+    0,                                  /* tp_getattro */
+    0,                                  /* tp_setattro */
+    0,                                  /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT,                 /* tp_flags */
+    "Native dispatch table for patomic explicit ops of a single width.",
+    0,                                  /* tp_traverse */
+    0,                                  /* tp_clear */
+    0,                                  /* tp_richcompare */
+    0,                                  /* tp_weaklistoffset */
+    0,                                  /* tp_iter */
+    0,                                  /* tp_iternext */
+    OpTable_methods,                    /* tp_methods */
+    0,                                  /* tp_members */
+    OpTable_getset,                     /* tp_getset */
+    0,                                  /* tp_base */
+    0,                                  /* tp_dict */
+    0,                                  /* tp_descr_get */
+    0,                                  /* tp_descr_set */
+    0,                                  /* tp_dictoffset */
+    0,                                  /* tp_init */
+    0,                                  /* tp_alloc */
+    OpTable_new,                        /* tp_new */
+};
+
+
+/* module */
+
+static PyObject *
+native_always_lock_free(PyObject *module, PyObject *arg)
+{
+    /* (width) -> bool, or None if the compiler can't tell us
+     * this is the compiler's view of the platform, which patomic's builtin
+     * implementation (compiled for the same platform) is expected to share */
+    Py_ssize_t width = PyNumber_AsSsize_t(arg, PyExc_OverflowError);
+    if (width == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+#if defined(__GNUC__) || defined(__clang__)
+    switch (width) {
+        case 1: return PyBool_FromLong(__atomic_always_lock_free(1, 0));
+        case 2: return PyBool_FromLong(__atomic_always_lock_free(2, 0));
+        case 4: return PyBool_FromLong(__atomic_always_lock_free(4, 0));
+        case 8: return PyBool_FromLong(__atomic_always_lock_free(8, 0));
+        case 16: return PyBool_FromLong(__atomic_always_lock_free(16, 0));
+        /* no platform has lock-free instructions for other widths */
+        default: Py_RETURN_FALSE;
+    }
+#else
+    Py_RETURN_NONE;
+#endif
+}
+
+#if defined(__GNUC__) || defined(__clang__)
+static PyObject *
+native_thread_fence(PyObject *module, PyObject *arg)
+{
+    /* (order) -> None, like C11 atomic_thread_fence
+     * patomic has no fence, so this is only available when the compiler has one
+     * (the memory order values match the __ATOMIC_* constants) */
+    long order = PyLong_AsLong(arg);
+    if (order == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    switch (order) {
+        case __ATOMIC_RELAXED: break;
+        case __ATOMIC_ACQUIRE: __atomic_thread_fence(__ATOMIC_ACQUIRE); break;
+        case __ATOMIC_RELEASE: __atomic_thread_fence(__ATOMIC_RELEASE); break;
+        case __ATOMIC_ACQ_REL: __atomic_thread_fence(__ATOMIC_ACQ_REL); break;
+        case __ATOMIC_SEQ_CST: __atomic_thread_fence(__ATOMIC_SEQ_CST); break;
+        default:
+            PyErr_Format(PyExc_ValueError, "invalid memory order %ld", order);
+            return NULL;
+    }
+    Py_RETURN_NONE;
+}
+#endif
+
+static PyMethodDef native_methods[] = {
+    {"always_lock_free", (PyCFunction) native_always_lock_free, METH_O, NULL},
+#if defined(__GNUC__) || defined(__clang__)
+    {"thread_fence", (PyCFunction) native_thread_fence, METH_O, NULL},
+#endif
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef native_module = {
+    PyModuleDef_HEAD_INIT,
+    "atomics._impl._native",
+    "Optional native backend for atomics (see backend.py).",
+    -1,
+    native_methods
+};
+
+PyMODINIT_FUNC
+PyInit__native(void)
+{
+    PyObject *m;
+    const uint16_t one = 1;
+
+    if (PyType_Ready(&OpTable_Type) < 0) {
+        return NULL;
+    }
+    g_byteorder = PyUnicode_InternFromString(*(const unsigned char *) &one ? "little" : "big");
+    if (g_byteorder == NULL) {
+        return NULL;
+    }
+    m = PyModule_Create(&native_module);
+    if (m == NULL) {
+        return NULL;
+    }
+#ifdef Py_GIL_DISABLED
+    /* OpTable is immutable after construction and every call keeps its state on
+     * the stack, so nothing here relies on the GIL */
+    if (PyUnstable_Module_SetGIL(m, Py_MOD_GIL_NOT_USED) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+#endif
+    Py_INCREF(&OpTable_Type);
+    if (PyModule_AddObject(m, "OpTable", (PyObject *) &OpTable_Type) < 0) {
+        Py_DECREF(&OpTable_Type);
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
@@ -0,0 +1,222 @@
+import asyncio
+import ctypes
+import threading
+
+from . import waiting
+from .atomic.core import AtomicCore
+from .atomic.mixins.wait import WaitOperationsMixin
+from .enums import MemoryOrder, OpType
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# coroutines never block the event loop; instead one bridge thread per process
+# watches every address being awaited (by coroutines on any loop), and wakes the
+# coroutines with call_soon_threadsafe, which writes to the loop's self-pipe that
+# the loop watches with add_reader
+#
+# the thread sleeps on all the watched objects at once: with futex_waitv on every
+# word of every object, plus a control word bumped and woken whenever an object is
+# added, so it sees notifies (and changes) from other threads and processes;
+# otherwise (without futex_waitv, or with more words than it takes) on a condition
+# notified by every notify in the process, re-checking every _POLL_INTERVAL while
+# any watched object may be in shared memory
+# sleeps are bounded by _IDLE_TIMEOUT, so a release (which doesn't notify) is seen,
+# and the thread exits once it has had nothing to watch for that long
+
+# how long the bridge thread sleeps at most, and lives with no watches (seconds)
+_IDLE_TIMEOUT = 1.0
+
+# guards everything below, and is notified by every waiting.notify_address()
+_cond = threading.Condition()
+_watches: Dict[Tuple[int, int], "_Watch"] = {}
+_bridge: Optional[threading.Thread] = None
+_control = ctypes.c_uint32(0)
+
+waiting.add_listener(_cond)
+
+
+def _wake(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+def _wake_all(waiters: Dict[asyncio.Future, asyncio.AbstractEventLoop]) -> None:
+    for fut, loop in waiters.items():
+        try:
+            loop.call_soon_threadsafe(_wake, fut)
+        except RuntimeError:
+            # loop is closed
+            pass
+
+
+class _Watch:
+
+    def __init__(self, core: AtomicCore, address: int, width: int):
+        self._key: Tuple[int, int] = (address, width)
+        self._core = core
+        self._table = core._table
+        self._words: Optional[List[int]] = waiting.waitv_words(address, width)
+        self._waiters: Dict[asyncio.Future, asyncio.AbstractEventLoop] = {}
+        # coroutines re-check the value after registering, so a change after this
+        # is always seen by one of them or the bridge
+        self._snapshot = bytearray(width)
+        self._load_into(self._snapshot)
+
+    def _load_into(self, out: bytearray) -> None:
+        # out is left as is once the core is released, so it looks unchanged
+        if self._core:
+            self._table.load_into(self._key[0], out, MemoryOrder.SEQ_CST)
+
+    def discard(self, fut: asyncio.Future) -> None:
+        # fut is only still registered if it was not woken (cancelled, or the value
+        # had already changed); watches are dropped once they have no waiters
+        with _cond:
+            if self._waiters.pop(fut, None) is None or self._waiters:
+                return
+            if _watches.get(self._key) is self:
+                del _watches[self._key]
+
+
+def _take_waiters(watch: _Watch) -> Dict[asyncio.Future, asyncio.AbstractEventLoop]:
+    # the waiters are woken without the lock held, so discard() must not see them
+    waiters, watch._waiters = watch._waiters, {}
+    return waiters
+
+
+def _poll_locked() -> Tuple[List[Dict[asyncio.Future, asyncio.AbstractEventLoop]],
+                            Optional[List[Tuple[int, int]]], bool]:
+    # drops changed and released watches, returning their waiters, the words to
+    # sleep on (or None to sleep on _cond), and if any object may be shared
+    woken = []
+    words: Optional[List[Tuple[int, int]]] = None
+    if waiting.waitv_words(ctypes.addressof(_control), 4) is not None:
+        words = [(ctypes.addressof(_control), _control.value)]
+    shared = False
+    for key, watch in list(_watches.items()):
+        # the memory may be gone once the core is released
+        if not watch._core:
+            del _watches[key]
+            woken.append(_take_waiters(watch))
+            continue
+        # the words are read before the object, so a later change ends the sleep
+        if watch._words is None:
+            words = None
+        elif words is not None:
+            words.extend((word, ctypes.c_uint32.from_address(word).value) for word in watch._words)
+        shared = shared or not watch._core._process_private
+        current = bytearray(key[1])
+        watch._load_into(current)
+        if current != watch._snapshot:
+            del _watches[key]
+            woken.append(_take_waiters(watch))
+    if words is not None and len(words) > waiting._FUTEX_WAITV_MAX:
+        words = None
+    return woken, words, shared
+
+
+def _run_bridge() -> None:
+    global _bridge
+    try:
+        _bridge_loop()
+    finally:
+        # another thread is started by the next registration
+        with _cond:
+            if _bridge is threading.current_thread():
+                _bridge = None
+
+
+def _bridge_loop() -> None:
+    global _bridge
+    idle = False
+    while True:
+        with _cond:
+            if not _watches:
+                if idle:
+                    # under the lock, so the next registration starts a new thread
+                    _bridge = None
+                    return
+                idle = True
+            else:
+                idle = False
+            woken, words, shared = _poll_locked()
+            if not woken and words is None:
+                _cond.wait(waiting._POLL_INTERVAL if shared else _IDLE_TIMEOUT)
+                continue
+        if woken:
+            # woken coroutines which still need to wait register again
+            for waiters in woken:
+                _wake_all(waiters)
+            continue
+        waiting.wait_words(words, _IDLE_TIMEOUT)
+
+
+def _register(core: AtomicCore, address: int, width: int, fut: asyncio.Future,
+              loop: asyncio.AbstractEventLoop) -> _Watch:
+    global _bridge
+    key = (address, width)
+    with _cond:
+        # checked under the lock, so no watch is made for a released core
+        core._assert_not_released()
+        watch = _watches.get(key)
+        added = watch is None
+        if added:
+            watch = _watches[key] = _Watch(core, address, width)
+            _control.value += 1
+        watch._waiters[fut] = loop
+        if _bridge is None:
+            _bridge = threading.Thread(target=_run_bridge, daemon=True, name="atomics-aio")
+            _bridge.start()
+    if added:
+        # the bridge may be asleep without this object's words
+        waiting.notify_address(ctypes.addressof(_control), 4, wake_all=True)
+    return watch
+
+
+def _check(a) -> None:
+    if not isinstance(a, WaitOperationsMixin):
+        raise TypeError("Positional argument 'a' must be an integral or BYTES atomic object.")
+    a._check_supported(OpType.LOAD)
+
+
+async def _wait_change(a: WaitOperationsMixin, old):
+    old = a._old_bytes(old)
+    core = a._core
+    table, address, width = core._table, core._address, core._width
+    current = bytearray(width)
+    loop = asyncio.get_running_loop()
+    while True:
+        # register before checking, so a change after the check always wakes fut
+        # (raises ValueError once the core is released)
+        fut = loop.create_future()
+        watch = _register(core, address, width, fut, loop)
+        try:
+            table.load_into(address, current, MemoryOrder.SEQ_CST)
+            if current != old:
+                return a._from_bytes(current)
+            await fut
+        finally:
+            watch.discard(fut)
+
+
+async def _wait_for(a: WaitOperationsMixin, predicate: Callable):
+    value = a.load()
+    while not predicate(value):
+        value = await _wait_change(a, value)
+    return value
+
+
+async def wait_change(a, old, *, timeout: Optional[float] = None):
+    # returns the new value once a no longer holds old
+    _check(a)
+    if timeout is None:
+        return await _wait_change(a, old)
+    return await asyncio.wait_for(_wait_change(a, old), timeout)
+
+
+async def wait_for(a, predicate: Callable, *, timeout: Optional[float] = None):
+    # returns the first value seen for which predicate(value) is true
+    _check(a)
+    if timeout is None:
+        return await _wait_for(a, predicate)
+    return await asyncio.wait_for(_wait_for(a, predicate), timeout)
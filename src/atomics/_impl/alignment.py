@@ -5,18 +5,47 @@ from .pybuffer import PyBuffer
 
 class Alignment:
 
-    def __init__(self, width: int):
-        # check that the width is supported
+    # immutable, since instances are shared (see _shared)
+    __slots__ = ("_width", "_recommended", "_minimum", "_size_within")
+
+    def __init__(self, width: int, *, kinds: int = 0):
+        # check that the width is supported (by the given patomic kinds, if any)
         p = Patomic()
-        ops = p.ops(width)
-        if p.count_nonnull_ops(ops, readonly=False) == 0:
+        if p.nonnull_ops_count(width, readonly=False, kinds=kinds) == 0:
             raise UnsupportedWidthException(width, readonly=False)
         # get alignment info
-        align = p.alignment(width)
-        self.width: int = width
-        self.recommended: int = align.recommended
-        self.minimum: int = align.minimum
-        self.size_within: int = align.size_within
+        align = p.alignment(width, kinds)
+        object.__setattr__(self, "_width", width)
+        object.__setattr__(self, "_recommended", align.recommended)
+        object.__setattr__(self, "_minimum", align.minimum)
+        object.__setattr__(self, "_size_within", align.size_within)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{self.__class__.__name__}' object is read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{self.__class__.__name__}' object is read-only.")
+
+    @staticmethod
+    def _shared(width: int, kinds: int = 0) -> "Alignment":
+        # shared instance for internal checks and capabilities()
+        return Patomic._cached(("alignment", width, kinds), lambda: Alignment(width, kinds=kinds))
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def recommended(self) -> int:
+        return self._recommended
+
+    @property
+    def minimum(self) -> int:
+        return self._minimum
+
+    @property
+    def size_within(self) -> int:
+        return self._size_within
 
     def __str__(self):
         msg = f"{self.__class__.__name__}(width={self.width}, " \
@@ -44,19 +73,22 @@ class Alignment:
 
     def is_valid(self, buffer, *, using_recommended: bool = True) -> bool:
         with self._checked_buffer(buffer) as pybuf:
-            # recommended
-            if using_recommended:
-                return (pybuf.address % self.recommended) == 0
-            # minimum
-            elif (pybuf.address % self.minimum) == 0:
-                if self.size_within == 0:
-                    return True
-                else:
-                    address = pybuf.address % self.size_within
-                    return (address + self.width) <= self.size_within
-            # no support
+            return self._is_valid_address(pybuf.address, using_recommended=using_recommended)
+
+    def _is_valid_address(self, address: int, *, using_recommended: bool) -> bool:
+        # recommended
+        if using_recommended:
+            return (address % self.recommended) == 0
+        # minimum
+        elif (address % self.minimum) == 0:
+            if self.size_within == 0:
+                return True
             else:
-                return False
+                address %= self.size_within
+                return (address + self.width) <= self.size_within
+        # no support
+        else:
+            return False
 
     def is_valid_recommended(self, buffer) -> bool:
         return self.is_valid(buffer, using_recommended=True)
@@ -0,0 +1,109 @@
+from ..alignment import Alignment
+from ..cacheline import cache_line_size
+from ..exceptions import AlignmentError, UnsupportedWidthException
+from ..patomic import Patomic
+from ..pybuffer import PyBuffer
+
+from .core import AtomicArrayCore
+
+from .mixins.arrayops import ByteArrayOperationsMixin, IntegralArrayOperationsMixin
+from .mixins.properties import BaseArrayPropertiesMixin, IntegralArrayPropertiesMixin
+
+
+class AtomicArray(BaseArrayPropertiesMixin):
+
+    def __init__(self, *, buffer, width: int, is_integral: bool, is_signed: bool,
+                 isolate: bool = False):
+        # check if object has been initialised
+        if hasattr(self, "_core"):
+            raise ValueError("AtomicArray object cannot be re-initialised.")
+        # check type
+        if not isinstance(width, int):
+            raise TypeError("Keyword argument 'width' must have type 'int'.")
+        # check and deal with buffer
+        pybuf = None
+        try:
+            with memoryview(buffer) as view:
+                pybuf = PyBuffer(buffer, writeable=(not view.readonly))
+        except TypeError:
+            pass
+        # check for TypeError; raise outside exception handler for nicer error message
+        if pybuf is None:
+            em = "Keyword argument 'buffer' must support the buffer protocol."
+            raise TypeError(em)
+        # isolated objects each start on their own cache line(s)
+        stride = width
+        if isolate and width > 0:
+            line = cache_line_size()
+            stride = -(-width // line) * line
+        # check buffer holds a whole number of objects
+        if width <= 0 or (pybuf.width % stride) != 0:
+            # pybuf MUST be released before function exit
+            pybuf.release()
+            name = "the cache line size" if isolate else "'width'"
+            em = f"Keyword argument 'buffer' length must be a multiple of {name}."
+            raise ValueError(em)
+        # check ops are available
+        p = Patomic()
+        if p.nonnull_ops_count(width, readonly=pybuf.readonly) == 0:
+            # pybuf MUST be released before function exit
+            ro = pybuf.readonly
+            pybuf.release()
+            raise UnsupportedWidthException(width, readonly=ro)
+        ops = p.ops(width)
+        # check alignment of every object, once
+        # element i is at (address + i * stride), so checking the first two is enough
+        align = Alignment._shared(width)
+        addr = pybuf.address
+        bad_addr = None
+        if not align._is_valid_address(addr, using_recommended=True):
+            bad_addr = addr
+        elif pybuf.width > stride and (stride % align.recommended) != 0:
+            bad_addr = addr + stride
+        if bad_addr is not None:
+            # pybuf MUST be released before function exit
+            pybuf.release()
+            raise AlignmentError(width, bad_addr, using_recommended=True)
+        # create core
+        self._core = AtomicArrayCore(pybuf, ops, width=width, stride=stride,
+                                     is_integral=is_integral, is_signed=is_signed)
+
+    def __enter__(self):
+        self._core._assert_not_released()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+    def release(self) -> None:
+        if hasattr(self, "_core"):
+            self._core.release()
+
+
+class AtomicIntegralArray(AtomicArray, IntegralArrayOperationsMixin, IntegralArrayPropertiesMixin):
+
+    def __init__(self, *, buffer, width: int, is_signed: bool, isolate: bool = False):
+        super().__init__(buffer=buffer, width=width, is_integral=True, is_signed=is_signed,
+                         isolate=isolate)
+
+
+class AtomicBytesArray(AtomicArray, ByteArrayOperationsMixin):
+
+    def __init__(self, *, buffer, width: int, isolate: bool = False):
+        super().__init__(buffer=buffer, width=width, is_integral=False, is_signed=False,
+                         isolate=isolate)
+
+
+class AtomicIntArray(AtomicIntegralArray):
+
+    def __init__(self, *, buffer, width: int, isolate: bool = False):
+        super().__init__(buffer=buffer, width=width, is_signed=True, isolate=isolate)
+
+
+class AtomicUintArray(AtomicIntegralArray):
+
+    def __init__(self, *, buffer, width: int, isolate: bool = False):
+        super().__init__(buffer=buffer, width=width, is_signed=False, isolate=isolate)
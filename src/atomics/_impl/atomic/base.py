@@ -1,34 +1,52 @@
 from ..alignment import Alignment
 from ..exceptions import AlignmentError, UnsupportedWidthException
+from ..implementation import impl_kinds
 from ..patomic import Patomic
 from ..pybuffer import PyBuffer
+from ..slab import allocate_slot
 
 from .core import AtomicCore
 
 from .mixins.types import ANY
 
+import threading
+from typing import Optional
+
+
+# guards the _entered and _exited flags of every AtomicViewContext, so two
+# threads can't both enter the same context, or release it while it's entered
+# (one lock for all contexts, since they're short lived and rarely contended)
+# reentrant since release() can be called from __del__ during a garbage collection
+_context_lock = threading.RLock()
+
 
 class Atomic(ANY):
 
-    def __init__(self, *, width: int, is_integral: bool, is_signed: bool):
+    def __init__(self, *, width: int, is_integral: bool, is_signed: bool, isolate: bool = False,
+                 impl: Optional[str] = None):
         # check if object has been initialised
         if hasattr(self, "_core"):
             raise ValueError("Atomic object cannot be re-initialised.")
         # check type
         if not isinstance(width, int):
             raise TypeError("Keyword argument 'width' must have type 'int'.")
-        # check ops are available
+        # check ops are available (from the selected patomic implementation)
+        kinds = impl_kinds(impl, width)
         p = Patomic()
-        ops = p.ops(width)
-        if p.count_nonnull_ops(ops, readonly=False) == 0:
+        if p.nonnull_ops_count(width, readonly=False, kinds=kinds) == 0:
             raise UnsupportedWidthException(width, readonly=False)
-        # check alignment of buffer
-        pybuf = PyBuffer(bytearray(width), writeable=True)
-        align = Alignment(width)
-        if not align.is_valid_recommended(pybuf.obj):
-            raise AlignmentError(width, pybuf.address, using_recommended=True)
+        ops = p.ops(width, kinds)
+        # slab slots always meet the recommended alignment
+        # isolated slots don't share a cache line with any other object
+        slot = allocate_slot(width, isolate=isolate)
+        # slabs are aligned for the default implementation, which a selected one
+        # could (in theory) exceed
+        if kinds and not Alignment._shared(width, kinds)._is_valid_address(slot.address, using_recommended=True):
+            address = slot.address
+            slot.release()
+            raise AlignmentError(width, address, using_recommended=True)
         # create core
-        self._core = AtomicCore(pybuf, ops, is_integral=is_integral, is_signed=is_signed)
+        self._core = AtomicCore(slot, ops, is_integral=is_integral, is_signed=is_signed)
 
     def __del__(self):
         if hasattr(self, "_core"):
@@ -54,7 +72,7 @@ class AtomicView(ANY):
 
 class AtomicViewContext:
 
-    def __init__(self, *, buffer, is_integral: bool, is_signed: bool):
+    def __init__(self, *, buffer, is_integral: bool, is_signed: bool, impl: Optional[str] = None):
         # check if object has been initialised
         if hasattr(self, "_core"):
             raise ValueError("AtomicViewContext object cannot be re-initialised.")
@@ -69,17 +87,22 @@ class AtomicViewContext:
         if pybuf is None:
             em = "Keyword argument 'buffer' must support the buffer protocol."
             raise TypeError(em)
-        # check ops are available
+        # check ops are available (from the selected patomic implementation)
+        try:
+            kinds = impl_kinds(impl, pybuf.width)
+        except BaseException:
+            pybuf.release()
+            raise
         p = Patomic()
-        ops = p.ops(pybuf.width)
-        if p.count_nonnull_ops(ops, readonly=pybuf.readonly) == 0:
+        if p.nonnull_ops_count(pybuf.width, readonly=pybuf.readonly, kinds=kinds) == 0:
             # pybuf MUST be released before function exit
             width, ro = pybuf.width, pybuf.readonly
             pybuf.release()
             raise UnsupportedWidthException(width, readonly=ro)
+        ops = p.ops(pybuf.width, kinds)
         # check alignment of buffer
-        align = Alignment(pybuf.width)
-        if not align.is_valid_recommended(pybuf.obj):
+        align = Alignment._shared(pybuf.width, kinds)
+        if not align._is_valid_address(pybuf.address, using_recommended=True):
             # pybuf MUST be released before function exit
             width, addr = pybuf.width, pybuf.address
             pybuf.release()
@@ -90,12 +113,12 @@ class AtomicViewContext:
         self._exited = False
 
     def __enter__(self) -> AtomicView:
-        self._assert_enter_preconditions()
-        self._entered = True
+        self._mark_entered()
         return AtomicView(self._core)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._exited = True
+        with _context_lock:
+            self._exited = True
         self.release()
 
     def __del__(self):
@@ -103,11 +126,16 @@ class AtomicViewContext:
 
     def release(self) -> None:
         if hasattr(self, "_core"):
-            if self._entered and not self._exited:
-                raise ValueError("Cannot call 'release' while context is open.")
-            else:
+            with _context_lock:
+                if self._entered and not self._exited:
+                    raise ValueError("Cannot call 'release' while context is open.")
                 self._core.release()
 
+    def _mark_entered(self) -> None:
+        with _context_lock:
+            self._assert_enter_preconditions()
+            self._entered = True
+
     def _assert_enter_preconditions(self) -> None:
         if self._entered:
             raise ValueError("Cannot open context multiple times.")
@@ -3,11 +3,13 @@ from .core import AtomicCore
 
 from .mixins.types import INTEGRAL
 
+from typing import Optional
+
 
 class AtomicIntegral(Atomic, INTEGRAL):
 
-    def __init__(self, *, width: int, is_signed: bool):
-        super().__init__(width=width, is_integral=True, is_signed=is_signed)
+    def __init__(self, *, width: int, is_signed: bool, isolate: bool = False, impl: Optional[str] = None):
+        super().__init__(width=width, is_integral=True, is_signed=is_signed, isolate=isolate, impl=impl)
 
 
 class AtomicIntegralView(AtomicView, INTEGRAL):
@@ -18,10 +20,9 @@ class AtomicIntegralView(AtomicView, INTEGRAL):
 
 class AtomicIntegralViewContext(AtomicViewContext):
 
-    def __init__(self, *, buffer, is_signed: bool):
-        super().__init__(buffer=buffer, is_integral=True, is_signed=is_signed)
+    def __init__(self, *, buffer, is_signed: bool, impl: Optional[str] = None):
+        super().__init__(buffer=buffer, is_integral=True, is_signed=is_signed, impl=impl)
 
     def __enter__(self) -> AtomicIntegralView:
-        self._assert_enter_preconditions()
-        self._entered = True
+        self._mark_entered()
         return AtomicIntegralView(self._core)
@@ -3,11 +3,13 @@ from .core import AtomicCore
 
 from .mixins.types import BYTES
 
+from typing import Optional
+
 
 class AtomicBytes(Atomic, BYTES):
 
-    def __init__(self, *, width: int):
-        super().__init__(width=width, is_integral=False, is_signed=False)
+    def __init__(self, *, width: int, isolate: bool = False, impl: Optional[str] = None):
+        super().__init__(width=width, is_integral=False, is_signed=False, isolate=isolate, impl=impl)
 
 
 class AtomicBytesView(AtomicView, BYTES):
@@ -18,10 +20,9 @@ class AtomicBytesView(AtomicView, BYTES):
 
 class AtomicBytesViewContext(AtomicViewContext):
 
-    def __init__(self, *, buffer):
-        super().__init__(buffer=buffer, is_integral=False, is_signed=False)
+    def __init__(self, *, buffer, impl: Optional[str] = None):
+        super().__init__(buffer=buffer, is_integral=False, is_signed=False, impl=impl)
 
     def __enter__(self) -> AtomicBytesView:
-        self._assert_enter_preconditions()
-        self._entered = True
+        self._mark_entered()
         return AtomicBytesView(self._core)
@@ -1,22 +1,81 @@
+from ..backend import get_op_table
 from ..enums import OpType
-from ..patomic import Ops
+from ..patomic import Patomic
 from ..pybuffer import PyBuffer
+from ..slab import SlabSlot
 
-from typing import Callable, Dict, Optional
+import operator
+from ctypes import addressof
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    # the ctypes structs are only defined once patomic is loaded
+    from ..patomic import Ops
+
+
+class _Dispatch:
+
+    # everything a core needs that only depends on its ops, width, integral-ness,
+    # signedness, and readonly-ness, so it is built once and shared between cores
+    # nothing here may be modified
+
+    __slots__ = ("supported", "ops_supported", "table")
+
+    def __init__(self, ops: "Ops", width: int, *, is_integral: bool, is_signed: bool,
+                 readonly: bool):
+        ots: Dict[OpType, Callable] = {}
+        # loop through all supported ops (resolved once per width and signedness)
+        for ot, fp in Patomic.op_funcs(ops, is_signed=is_signed).items():
+            # ignore arithmetic ops if not integral
+            if not is_integral and ot >= OpType.ADD:
+                continue
+            # ignore mutating ops if readonly
+            if readonly and ot not in (OpType.LOAD, OpType.BIT_TEST):
+                continue
+            ots[ot] = fp
+        self.supported: Dict[OpType, Callable] = ots
+        self.ops_supported: Tuple[OpType, ...] = tuple(sorted(ots.keys()))
+        self.table = get_op_table(ops, width, is_integral=is_integral, is_signed=is_signed)
+
+
+def _get_dispatch(ops: "Ops", width: int, *, is_integral: bool, is_signed: bool,
+                  readonly: bool) -> _Dispatch:
+    if not Patomic.is_cached_ops(ops):
+        return _Dispatch(ops, width, is_integral=is_integral, is_signed=is_signed, readonly=readonly)
+    key = ("dispatch", addressof(ops), width, is_integral, is_signed, readonly)
+    return Patomic._cached(key, lambda: _Dispatch(ops, width, is_integral=is_integral,
+                                                  is_signed=is_signed, readonly=readonly))
 
 
 class AtomicCore:
 
-    def __init__(self, buffer: PyBuffer, ops: Ops, *, is_integral: bool, is_signed: bool):
+    # retry statistics for update(), created on first use (see mixins/update.py)
+    _update_stats = None
+
+    def __init__(self, buffer: Union[PyBuffer, SlabSlot], ops: "Ops", *,
+                 is_integral: bool, is_signed: bool, width: Optional[int] = None):
         # check if object has been initialised
         if hasattr(self, "_buffer"):
             raise ValueError("Core object cannot be re-initialised.")
         # setup members
-        self._buffer: PyBuffer = buffer
-        self._ops: Ops = ops
+        # width is the width of the atomic object(s), which defaults to the whole buffer
+        # buffer is a PyBuffer, or a SlabSlot for objects owning their own memory
+        self._buffer: Union[PyBuffer, SlabSlot] = buffer
+        self._width: int = buffer.width if width is None else width
+        self._ops: "Ops" = ops
         self._is_integral: bool = is_integral
         self._is_signed: bool = is_signed
-        self._supported: Dict[OpType, Callable] = self._get_supported_ops_map()
+        dispatch = _get_dispatch(ops, self._width, is_integral=is_integral, is_signed=is_signed,
+                                 readonly=buffer.readonly)
+        self._supported: Dict[OpType, Callable] = dispatch.supported
+        self._ops_supported: Tuple[OpType, ...] = dispatch.ops_supported
+        # plain attributes for hot paths; only valid while not released
+        # _table performs the ops (see backend.py); support is checked here first
+        self._address: int = buffer.address
+        self._table = dispatch.table
+        # slab memory is never shared with another process, so waits on it only
+        # need to see notifies from this one (see waiting.py)
+        self._process_private: bool = isinstance(buffer, SlabSlot)
 
     def __enter__(self):
         self._assert_not_released()
@@ -36,6 +95,8 @@ class AtomicCore:
         # we cannot rely on any attributes existing
         if hasattr(self, "_buffer"):
             self._buffer.release()
+            # bound ops check this instead of the buffer (see mixins/bind.py)
+            self._address = 0
 
     @property
     def _released(self) -> bool:
@@ -50,31 +111,6 @@ class AtomicCore:
         self._assert_not_released()
         return self._supported.get(optype)
 
-    def _get_supported_ops_map(self) -> Dict[OpType, Callable]:
-        self._assert_not_released()
-        ots: Dict[OpType, Callable] = {}
-        # loop through all possible ops
-        for ot in OpType:
-            # ignore arithmetic ops if not integral
-            if not self._is_integral and ot >= OpType.ADD:
-                continue
-            # ignore mutating ops if readonly
-            if self._buffer.readonly and ot not in (OpType.LOAD, OpType.BIT_TEST):
-                continue
-            # get op category (e.g. _ops for load, _ops.xchg_ops for exchange, etc...)
-            cat = self._ops
-            if ot.cname is not None:
-                s_type = "signed" if self._is_signed else "unsigned"
-                cname = ot.cname.replace("arithmetic", s_type)
-                cat = getattr(cat, cname)
-            # get op function pointer
-            fp = getattr(cat, ot.fname)
-            # add to ots if supported (i.e. fp is not NULL)
-            if fp:
-                ots[ot] = fp
-        # return supported ops
-        return ots
-
     @property
     def address(self) -> int:
         self._assert_not_released()
@@ -83,7 +119,7 @@ class AtomicCore:
     @property
     def width(self) -> int:
         self._assert_not_released()
-        return self._buffer.width
+        return self._width
 
     @property
     def readonly(self) -> bool:
@@ -98,4 +134,40 @@ class AtomicCore:
     @property
     def ops_supported(self) -> [OpType]:
         self._assert_not_released()
-        return sorted(list(self._supported.keys()))
+        return list(self._ops_supported)
+
+
+class AtomicArrayCore(AtomicCore):
+
+    def __init__(self, buffer: PyBuffer, ops: "Ops", *, width: int, stride: int,
+                 is_integral: bool, is_signed: bool):
+        super().__init__(buffer, ops, is_integral=is_integral, is_signed=is_signed, width=width)
+        # element i starts at (address + i * stride)
+        self._stride: int = stride
+        self._length: int = 0
+        if buffer.width >= width:
+            self._length = (buffer.width - width) // stride + 1
+
+    def address_of(self, index: int) -> int:
+        self._assert_not_released()
+        index = operator.index(index)
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("Atomic array index out of range.")
+        return self._address + (index * self._stride)
+
+    def layout(self) -> Tuple[int, int, int]:
+        # (base address, stride, length) as taken by batched op table methods
+        self._assert_not_released()
+        return self._address, self._stride, self._length
+
+    @property
+    def stride(self) -> int:
+        self._assert_not_released()
+        return self._stride
+
+    @property
+    def length(self) -> int:
+        self._assert_not_released()
+        return self._length
@@ -1,3 +1,5 @@
+from .array import AtomicArray, AtomicIntegralArray, AtomicBytesArray
+from .array import AtomicIntArray, AtomicUintArray
 from .base import Atomic, AtomicViewContext
 from .baseint import AtomicIntegral, AtomicIntegralViewContext
 from .bytes import AtomicBytes, AtomicBytesViewContext
@@ -6,7 +8,7 @@ from .int import AtomicUint, AtomicUintViewContext
 
 from .mixins.types import ANY, INTEGRAL, BYTES, INT, UINT
 
-from typing import overload, Type, Union
+from typing import overload, Optional, Type, Union
 
 
 ATUnion = Union[
@@ -33,84 +35,134 @@ AVCUnion = Union[
     AtomicUintViewContext
 ]
 
+AAUnion = Union[
+    AtomicArray,
+    AtomicIntegralArray,
+    AtomicBytesArray,
+    AtomicIntArray,
+    AtomicUintArray
+]
+
+
+@overload
+def atomic(width: int, atype: Type[INT], *, isolate: bool = False, impl: Optional[str] = None, **kwargs) -> AtomicInt:
+    ...
+
+
+@overload
+def atomic(width: int, atype: Type[UINT], *, isolate: bool = False, impl: Optional[str] = None, **kwargs) -> AtomicUint:
+    ...
+
+
+@overload
+def atomic(width: int, atype: Type[BYTES], *, isolate: bool = False, impl: Optional[str] = None, **kwargs) -> AtomicBytes:
+    ...
+
+
+@overload
+def atomic(width: int, atype: Type[INTEGRAL], *, isolate: bool = False, impl: Optional[str] = None, **kwargs) -> AtomicIntegral:
+    ...
+
+
+@overload
+def atomic(width: int, atype: Type[ANY], *, isolate: bool = False, impl: Optional[str] = None, **kwargs) -> Atomic:
+    ...
+
+
+def atomic(width: int, atype: Type[ATUnion], *, isolate: bool = False, impl: Optional[str] = None,
+           **kwargs) -> AUnion:
+    if atype is INT:
+        return AtomicInt(width=width, isolate=isolate, impl=impl)
+    elif atype is UINT:
+        return AtomicUint(width=width, isolate=isolate, impl=impl)
+    elif atype is BYTES:
+        return AtomicBytes(width=width, isolate=isolate, impl=impl)
+    elif atype is INTEGRAL:
+        return AtomicIntegral(width=width, isolate=isolate, impl=impl, **kwargs)
+    elif atype is ANY:
+        return Atomic(width=width, isolate=isolate, impl=impl, **kwargs)
+    else:
+        msg = "Type parameter 'atype' must be one of [ANY, INTEGRAL, BYTES, INT, UINT]."
+        raise TypeError(msg)
+
 
 @overload
-def atomic(width: int, atype: Type[INT], **kwargs) -> AtomicInt:
+def atomicview(buffer, atype: Type[INT], *, impl: Optional[str] = None, **kwargs) -> AtomicIntViewContext:
     ...
 
 
 @overload
-def atomic(width: int, atype: Type[UINT], **kwargs) -> AtomicUint:
+def atomicview(buffer, atype: Type[UINT], *, impl: Optional[str] = None, **kwargs) -> AtomicUintViewContext:
     ...
 
 
 @overload
-def atomic(width: int, atype: Type[BYTES], **kwargs) -> AtomicBytes:
+def atomicview(buffer, atype: Type[BYTES], *, impl: Optional[str] = None, **kwargs) -> AtomicBytesViewContext:
     ...
 
 
 @overload
-def atomic(width: int, atype: Type[INTEGRAL], **kwargs) -> AtomicIntegral:
+def atomicview(buffer, atype: Type[INTEGRAL], *, impl: Optional[str] = None, **kwargs) -> AtomicIntegralViewContext:
     ...
 
 
 @overload
-def atomic(width: int, atype: Type[ANY], **kwargs) -> Atomic:
+def atomicview(buffer, atype: Type[ANY], *, impl: Optional[str] = None, **kwargs) -> AtomicViewContext:
     ...
 
 
-def atomic(width: int, atype: Type[ATUnion], **kwargs) -> AUnion:
+def atomicview(buffer, atype: Type[ATUnion], *, impl: Optional[str] = None, **kwargs) -> AVCUnion:
     if atype is INT:
-        return AtomicInt(width=width)
+        return AtomicIntViewContext(buffer=buffer, impl=impl)
     elif atype is UINT:
-        return AtomicUint(width=width)
+        return AtomicUintViewContext(buffer=buffer, impl=impl)
     elif atype is BYTES:
-        return AtomicBytes(width=width)
+        return AtomicBytesViewContext(buffer=buffer, impl=impl)
     elif atype is INTEGRAL:
-        return AtomicIntegral(width=width, **kwargs)
+        return AtomicIntegralViewContext(buffer=buffer, impl=impl, **kwargs)
     elif atype is ANY:
-        return Atomic(width=width, **kwargs)
+        return AtomicViewContext(buffer=buffer, impl=impl, **kwargs)
     else:
         msg = "Type parameter 'atype' must be one of [ANY, INTEGRAL, BYTES, INT, UINT]."
         raise TypeError(msg)
 
 
 @overload
-def atomicview(buffer, atype: Type[INT], **kwargs) -> AtomicIntViewContext:
+def atomicarray(buffer, atype: Type[INT], width: int, *, isolate: bool = False, **kwargs) -> AtomicIntArray:
     ...
 
 
 @overload
-def atomicview(buffer, atype: Type[UINT], **kwargs) -> AtomicUintViewContext:
+def atomicarray(buffer, atype: Type[UINT], width: int, *, isolate: bool = False, **kwargs) -> AtomicUintArray:
     ...
 
 
 @overload
-def atomicview(buffer, atype: Type[BYTES], **kwargs) -> AtomicBytesViewContext:
+def atomicarray(buffer, atype: Type[BYTES], width: int, *, isolate: bool = False, **kwargs) -> AtomicBytesArray:
     ...
 
 
 @overload
-def atomicview(buffer, atype: Type[INTEGRAL], **kwargs) -> AtomicIntegralViewContext:
+def atomicarray(buffer, atype: Type[INTEGRAL], width: int, *, isolate: bool = False, **kwargs) -> AtomicIntegralArray:
     ...
 
 
 @overload
-def atomicview(buffer, atype: Type[ANY], **kwargs) -> AtomicViewContext:
+def atomicarray(buffer, atype: Type[ANY], width: int, *, isolate: bool = False, **kwargs) -> AtomicArray:
     ...
 
 
-def atomicview(buffer, atype: Type[ATUnion], **kwargs) -> AVCUnion:
+def atomicarray(buffer, atype: Type[ATUnion], width: int, *, isolate: bool = False, **kwargs) -> AAUnion:
     if atype is INT:
-        return AtomicIntViewContext(buffer=buffer)
+        return AtomicIntArray(buffer=buffer, width=width, isolate=isolate)
     elif atype is UINT:
-        return AtomicUintViewContext(buffer=buffer)
+        return AtomicUintArray(buffer=buffer, width=width, isolate=isolate)
     elif atype is BYTES:
-        return AtomicBytesViewContext(buffer=buffer)
+        return AtomicBytesArray(buffer=buffer, width=width, isolate=isolate)
     elif atype is INTEGRAL:
-        return AtomicIntegralViewContext(buffer=buffer, **kwargs)
+        return AtomicIntegralArray(buffer=buffer, width=width, isolate=isolate, **kwargs)
     elif atype is ANY:
-        return AtomicViewContext(buffer=buffer, **kwargs)
+        return AtomicArray(buffer=buffer, width=width, isolate=isolate, **kwargs)
     else:
         msg = "Type parameter 'atype' must be one of [ANY, INTEGRAL, BYTES, INT, UINT]."
         raise TypeError(msg)
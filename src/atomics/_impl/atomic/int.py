@@ -3,11 +3,13 @@ from .core import AtomicCore
 
 from .mixins.types import INT, UINT
 
+from typing import Optional
+
 
 class AtomicInt(AtomicIntegral, INT):
 
-    def __init__(self, *, width: int):
-        super().__init__(width=width, is_signed=True)
+    def __init__(self, *, width: int, isolate: bool = False, impl: Optional[str] = None):
+        super().__init__(width=width, is_signed=True, isolate=isolate, impl=impl)
 
 
 class AtomicIntView(AtomicIntegralView, INT):
@@ -18,19 +20,18 @@ class AtomicIntView(AtomicIntegralView, INT):
 
 class AtomicIntViewContext(AtomicIntegralViewContext):
 
-    def __init__(self, *, buffer):
-        super().__init__(buffer=buffer, is_signed=True)
+    def __init__(self, *, buffer, impl: Optional[str] = None):
+        super().__init__(buffer=buffer, is_signed=True, impl=impl)
 
     def __enter__(self) -> AtomicIntView:
-        self._assert_enter_preconditions()
-        self._entered = True
+        self._mark_entered()
         return AtomicIntView(self._core)
 
 
 class AtomicUint(AtomicIntegral, UINT):
 
-    def __init__(self, *, width: int):
-        super().__init__(width=width, is_signed=False)
+    def __init__(self, *, width: int, isolate: bool = False, impl: Optional[str] = None):
+        super().__init__(width=width, is_signed=False, isolate=isolate, impl=impl)
 
 
 class AtomicUintView(AtomicIntegralView, UINT):
@@ -41,10 +42,9 @@ class AtomicUintView(AtomicIntegralView, UINT):
 
 class AtomicUintViewContext(AtomicIntegralViewContext):
 
-    def __init__(self, *, buffer):
-        super().__init__(buffer=buffer, is_signed=False)
+    def __init__(self, *, buffer, impl: Optional[str] = None):
+        super().__init__(buffer=buffer, is_signed=False, impl=impl)
 
     def __enter__(self) -> AtomicUintView:
-        self._assert_enter_preconditions()
-        self._entered = True
+        self._mark_entered()
         return AtomicUintView(self._core)
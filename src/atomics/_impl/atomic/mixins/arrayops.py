@@ -0,0 +1,356 @@
+from ... import batch
+from ...enums import MemoryOrder, OpType
+from ...exceptions import MemoryOrderError
+
+from ..core import AtomicArrayCore
+
+from .byteops import _ImplOperationChecksMixin
+from .cmpxchg import CmpxchgResult
+
+from typing import List, Optional
+
+
+# the default order, which is always valid, is checked for first on hot paths
+_SEQ_CST = MemoryOrder.SEQ_CST
+
+
+class _ImplByteArrayOperationsMixin(_ImplOperationChecksMixin):
+
+    _core: AtomicArrayCore
+
+    # same validation as the single object mixins, with an element index first
+
+    def _impl_cmpxchg(self, optype: OpType, index: int, expected, desired,
+                      succ: MemoryOrder, fail: MemoryOrder) -> CmpxchgResult:
+        assert ("CMPXCHG" in optype.name)
+        # check support
+        self._check_supported(optype)
+        # validate inputs (values are checked by callers, if needed)
+        address = self._core.address_of(index)
+        if not fail.is_valid_fail_order(succ):
+            raise MemoryOrderError(optype, fail, is_fail=True)
+        # perform operation
+        if optype is OpType.CMPXCHG_WEAK:
+            ok, exp = self._core._table.cmpxchg_weak(address, expected, desired, succ, fail)
+        else:
+            ok, exp = self._core._table.cmpxchg_strong(address, expected, desired, succ, fail)
+        return CmpxchgResult(ok, exp)
+
+    def _impl_cmpxchg_into(self, optype: OpType, index: int, expected, desired,
+                           succ: MemoryOrder, fail: MemoryOrder) -> bool:
+        assert ("CMPXCHG" in optype.name)
+        # check support
+        self._check_supported(optype)
+        # validate inputs (buffer widths and writability are checked by the op table)
+        address = self._core.address_of(index)
+        if not fail.is_valid_fail_order(succ):
+            raise MemoryOrderError(optype, fail, is_fail=True)
+        # perform operation
+        if optype is OpType.CMPXCHG_WEAK:
+            return self._core._table.cmpxchg_weak_into(address, expected, desired, succ, fail)
+        else:
+            return self._core._table.cmpxchg_strong_into(address, expected, desired, succ, fail)
+
+    def _values_buffer(self, values, count: int):
+        return batch.bytes_values_buffer(values, count, self._core.width)
+
+    def _unpack(self, buf: memoryview) -> list:
+        return batch.unpack_bytes(buf, self._core.width)
+
+    def _impl_many(self, optype: OpType, name: str, indices, values, order: MemoryOrder, out, *,
+                   has_result: bool):
+        # check support
+        self._check_supported(optype)
+        # convert inputs to contiguous buffers (without copying where possible)
+        idx = batch.index_buffer(indices)
+        count = batch.index_count(idx)
+        args = [idx]
+        if values is not None:
+            args.append(self._values_buffer(values, count))
+        if has_result:
+            res = batch.out_buffer(out, count, self._core.width)
+            args.append(res)
+        # perform operation
+        getattr(self._core._table, name)(*self._core.layout(), *args, order)
+        if not has_result:
+            return None
+        return self._unpack(res) if out is None else out
+
+
+class ByteArrayOperationsMixin(_ImplByteArrayOperationsMixin):
+
+    _core: AtomicArrayCore
+
+    def store(self, index: int, desired: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        # check support
+        self._check_supported(OpType.STORE)
+        # validate inputs
+        if not order.is_valid_store_order():
+            raise MemoryOrderError(OpType.STORE, order, is_fail=False)
+        self._check_value("desired", desired)
+        # perform operation
+        self._core._table.store(self._core.address_of(index), desired, order)
+
+    def load(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bytes:
+        # check support
+        self._check_supported(OpType.LOAD)
+        # validate input
+        if not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        # perform operation
+        return self._core._table.load(self._core.address_of(index), order)
+
+    def load_many(self, indices, order: MemoryOrder = MemoryOrder.SEQ_CST, *,
+                  out=None) -> Optional[List[bytes]]:
+        if not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        return self._impl_many(OpType.LOAD, "load_many", indices, None, order, out, has_result=True)
+
+    def store_many(self, indices, values, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        if not order.is_valid_store_order():
+            raise MemoryOrderError(OpType.STORE, order, is_fail=False)
+        self._impl_many(OpType.STORE, "store_many", indices, values, order, None, has_result=False)
+
+    def exchange(self, index: int, desired: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bytes:
+        # check support
+        self._check_supported(OpType.EXCHANGE)
+        # validate input
+        self._check_value("desired", desired)
+        # perform operation
+        return self._core._table.exchange(self._core.address_of(index), desired, order)
+
+    def cmpxchg_weak(self, index: int, expected: bytes, desired: bytes,
+                     succ: MemoryOrder = MemoryOrder.SEQ_CST,
+                     fail: MemoryOrder = MemoryOrder.SEQ_CST) -> CmpxchgResult[bytes]:
+        self._check_value("expected", expected)
+        self._check_value("desired", desired)
+        return self._impl_cmpxchg(OpType.CMPXCHG_WEAK, index, expected, desired, succ, fail)
+
+    def cmpxchg_strong(self, index: int, expected: bytes, desired: bytes,
+                       succ: MemoryOrder = MemoryOrder.SEQ_CST,
+                       fail: MemoryOrder = MemoryOrder.SEQ_CST) -> CmpxchgResult[bytes]:
+        self._check_value("expected", expected)
+        self._check_value("desired", desired)
+        return self._impl_cmpxchg(OpType.CMPXCHG_STRONG, index, expected, desired, succ, fail)
+
+    def load_into(self, index: int, out, order: MemoryOrder = MemoryOrder.SEQ_CST):
+        # check support
+        self._check_supported(OpType.LOAD)
+        # validate input
+        if not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        # perform operation
+        self._core._table.load_into(self._core.address_of(index), out, order)
+        return out
+
+    def exchange_into(self, index: int, desired, out, order: MemoryOrder = MemoryOrder.SEQ_CST):
+        # check support
+        self._check_supported(OpType.EXCHANGE)
+        # perform operation
+        self._core._table.exchange_into(self._core.address_of(index), desired, out, order)
+        return out
+
+    def cmpxchg_weak_into(self, index: int, expected, desired,
+                          succ: MemoryOrder = MemoryOrder.SEQ_CST,
+                          fail: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        return self._impl_cmpxchg_into(OpType.CMPXCHG_WEAK, index, expected, desired, succ, fail)
+
+    def cmpxchg_strong_into(self, index: int, expected, desired,
+                            succ: MemoryOrder = MemoryOrder.SEQ_CST,
+                            fail: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        return self._impl_cmpxchg_into(OpType.CMPXCHG_STRONG, index, expected, desired, succ, fail)
+
+    def bit_test(self, index: int, bit: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        if not order.is_valid_store_order():
+            raise MemoryOrderError(OpType.BIT_TEST, order, is_fail=False)
+        self._check_supported(OpType.BIT_TEST)
+        self._check_bit_index(bit, "bit")
+        return self._core._table.bit_test(self._core.address_of(index), bit, order)
+
+    def bit_test_compl(self, index: int, bit: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        self._check_supported(OpType.BIT_TEST_COMPL)
+        self._check_bit_index(bit, "bit")
+        return self._core._table.bit_test_compl(self._core.address_of(index), bit, order)
+
+    def bit_test_set(self, index: int, bit: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        self._check_supported(OpType.BIT_TEST_SET)
+        self._check_bit_index(bit, "bit")
+        return self._core._table.bit_test_set(self._core.address_of(index), bit, order)
+
+    def bit_test_reset(self, index: int, bit: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        self._check_supported(OpType.BIT_TEST_RESET)
+        self._check_bit_index(bit, "bit")
+        return self._core._table.bit_test_reset(self._core.address_of(index), bit, order)
+
+    def bin_or(self, index: int, value: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.OR)
+        self._check_value("value", value)
+        return self._core._table.bin_or(self._core.address_of(index), value, order)
+
+    def bin_xor(self, index: int, value: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.XOR)
+        self._check_value("value", value)
+        return self._core._table.bin_xor(self._core.address_of(index), value, order)
+
+    def bin_and(self, index: int, value: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.AND)
+        self._check_value("value", value)
+        return self._core._table.bin_and(self._core.address_of(index), value, order)
+
+    def bin_not(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.NOT)
+        return self._core._table.bin_not(self._core.address_of(index), order)
+
+    def bin_fetch_or(self, index: int, value: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bytes:
+        self._check_supported(OpType.FETCH_OR)
+        self._check_value("value", value)
+        return self._core._table.bin_fetch_or(self._core.address_of(index), value, order)
+
+    def bin_fetch_xor(self, index: int, value: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bytes:
+        self._check_supported(OpType.FETCH_XOR)
+        self._check_value("value", value)
+        return self._core._table.bin_fetch_xor(self._core.address_of(index), value, order)
+
+    def bin_fetch_and(self, index: int, value: bytes, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bytes:
+        self._check_supported(OpType.FETCH_AND)
+        self._check_value("value", value)
+        return self._core._table.bin_fetch_and(self._core.address_of(index), value, order)
+
+    def bin_fetch_not(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bytes:
+        self._check_supported(OpType.FETCH_NOT)
+        return self._core._table.bin_fetch_not(self._core.address_of(index), order)
+
+
+class _ImplIntegralArrayOperationsMixin(ByteArrayOperationsMixin):
+
+    _core: AtomicArrayCore
+
+    # ops taking values don't call _check_value: the op table raises OverflowError
+    # if an int does not fit in width, and these are the hot paths
+
+    def _values_buffer(self, values, count: int):
+        return batch.int_values_buffer(values, count, self._core.width, is_signed=self._core.signed)
+
+    def _unpack(self, buf: memoryview) -> list:
+        return batch.unpack_ints(buf, self._core.width, is_signed=self._core.signed)
+
+
+class IntegralArrayOperationsMixin(_ImplIntegralArrayOperationsMixin):
+
+    _core: AtomicArrayCore
+
+    def store(self, index: int, desired: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.STORE)
+        if order is not _SEQ_CST and not order.is_valid_store_order():
+            raise MemoryOrderError(OpType.STORE, order, is_fail=False)
+        self._core._table.store(self._core.address_of(index), desired, order)
+
+    def load(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.LOAD)
+        if order is not _SEQ_CST and not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        return self._core._table.load(self._core.address_of(index), order)
+
+    def load_many(self, indices, order: MemoryOrder = MemoryOrder.SEQ_CST, *,
+                  out=None) -> Optional[List[int]]:
+        return super().load_many(indices, order, out=out)
+
+    def exchange(self, index: int, desired: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.EXCHANGE)
+        return self._core._table.exchange(self._core.address_of(index), desired, order)
+
+    def cmpxchg_weak(self, index: int, expected: int, desired: int,
+                     success: MemoryOrder = MemoryOrder.SEQ_CST,
+                     failure: MemoryOrder = MemoryOrder.SEQ_CST) -> CmpxchgResult[int]:
+        return self._impl_cmpxchg(OpType.CMPXCHG_WEAK, index, expected, desired, success, failure)
+
+    def cmpxchg_strong(self, index: int, expected: int, desired: int,
+                       success: MemoryOrder = MemoryOrder.SEQ_CST,
+                       failure: MemoryOrder = MemoryOrder.SEQ_CST) -> CmpxchgResult[int]:
+        return self._impl_cmpxchg(OpType.CMPXCHG_STRONG, index, expected, desired, success, failure)
+
+    def bin_or(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.OR)
+        return self._core._table.bin_or(self._core.address_of(index), value, order)
+
+    def bin_xor(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.XOR)
+        return self._core._table.bin_xor(self._core.address_of(index), value, order)
+
+    def bin_and(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.AND)
+        return self._core._table.bin_and(self._core.address_of(index), value, order)
+
+    def bin_not(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        return super().bin_not(index, order)
+
+    def bin_fetch_or(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_OR)
+        return self._core._table.bin_fetch_or(self._core.address_of(index), value, order)
+
+    def bin_fetch_xor(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_XOR)
+        return self._core._table.bin_fetch_xor(self._core.address_of(index), value, order)
+
+    def bin_fetch_and(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_AND)
+        return self._core._table.bin_fetch_and(self._core.address_of(index), value, order)
+
+    def bin_fetch_not(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        return super().bin_fetch_not(index, order)
+
+    def add(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.ADD)
+        return self._core._table.add(self._core.address_of(index), value, order)
+
+    def sub(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.SUB)
+        return self._core._table.sub(self._core.address_of(index), value, order)
+
+    def inc(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.INC)
+        return self._core._table.inc(self._core.address_of(index), order)
+
+    def dec(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.DEC)
+        return self._core._table.dec(self._core.address_of(index), order)
+
+    def neg(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._check_supported(OpType.NEG)
+        return self._core._table.neg(self._core.address_of(index), order)
+
+    def fetch_add(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_ADD)
+        return self._core._table.fetch_add(self._core.address_of(index), value, order)
+
+    def fetch_sub(self, index: int, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_SUB)
+        return self._core._table.fetch_sub(self._core.address_of(index), value, order)
+
+    def fetch_inc(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_INC)
+        return self._core._table.fetch_inc(self._core.address_of(index), order)
+
+    def fetch_dec(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_DEC)
+        return self._core._table.fetch_dec(self._core.address_of(index), order)
+
+    def fetch_neg(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
+        self._check_supported(OpType.FETCH_NEG)
+        return self._core._table.fetch_neg(self._core.address_of(index), order)
+
+    def add_many(self, indices, values, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._impl_many(OpType.ADD, "add_many", indices, values, order, None, has_result=False)
+
+    def sub_many(self, indices, values, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
+        self._impl_many(OpType.SUB, "sub_many", indices, values, order, None, has_result=False)
+
+    def fetch_add_many(self, indices, values, order: MemoryOrder = MemoryOrder.SEQ_CST, *,
+                       out=None) -> Optional[List[int]]:
+        return self._impl_many(OpType.FETCH_ADD, "fetch_add_many", indices, values, order, out,
+                               has_result=True)
+
+    def fetch_sub_many(self, indices, values, order: MemoryOrder = MemoryOrder.SEQ_CST, *,
+                       out=None) -> Optional[List[int]]:
+        return self._impl_many(OpType.FETCH_SUB, "fetch_sub_many", indices, values, order, out,
+                               has_result=True)
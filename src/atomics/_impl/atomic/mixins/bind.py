@@ -0,0 +1,100 @@
+from ...enums import MemoryOrder, OpType
+from ...exceptions import MemoryOrderError
+
+from ..core import AtomicCore
+
+from .byteops import _ImplOperationChecksMixin
+from .cmpxchg import CmpxchgResult
+
+from typing import Callable, Optional
+
+
+# a bound op does every check that doesn't depend on the argument values once,
+# in bind(), and then only calls the op table; the table still checks the
+# values it marshals (width, range), and bit indices are still checked since
+# patomic doesn't
+# the only per call check is that the object hasn't been released, which is a
+# plain attribute read (release() zeroes the core's address)
+
+_NO_ARG = (OpType.LOAD, OpType.NOT, OpType.FETCH_NOT, OpType.INC, OpType.DEC, OpType.NEG,
+           OpType.FETCH_INC, OpType.FETCH_DEC, OpType.FETCH_NEG)
+_BIT = (OpType.BIT_TEST, OpType.BIT_TEST_COMPL, OpType.BIT_TEST_SET, OpType.BIT_TEST_RESET)
+_CMPXCHG = (OpType.CMPXCHG_WEAK, OpType.CMPXCHG_STRONG)
+
+
+def _table_method_name(optype: OpType) -> str:
+    # same names as the methods on atomic objects
+    name = optype.name.lower()
+    if optype.cname == "binary_ops":
+        name = "bin_" + name
+    return name
+
+
+def _default_fail_order(succ: MemoryOrder) -> MemoryOrder:
+    # strongest valid fail order for succ, as in C++
+    if succ is MemoryOrder.RELEASE:
+        return MemoryOrder.RELAXED
+    elif succ is MemoryOrder.ACQ_REL:
+        return MemoryOrder.ACQUIRE
+    return succ
+
+
+class BindOperationsMixin(_ImplOperationChecksMixin):
+
+    _core: AtomicCore
+
+    def bind(self, optype: OpType, order: MemoryOrder = MemoryOrder.SEQ_CST,
+             fail: Optional[MemoryOrder] = None) -> Callable:
+        # returns a callable taking the same arguments as the op's method, minus
+        # the memory order(s); fail is only used by cmpxchg ops, and defaults to
+        # the strongest valid fail order for order
+        optype = OpType(optype)
+        order = MemoryOrder(order)
+        # check support
+        self._check_supported(optype)
+        # validate memory orders
+        if optype is OpType.STORE or optype is OpType.BIT_TEST:
+            if not order.is_valid_store_order():
+                raise MemoryOrderError(optype, order, is_fail=False)
+        elif optype is OpType.LOAD:
+            if not order.is_valid_load_order():
+                raise MemoryOrderError(optype, order, is_fail=False)
+        elif optype in _CMPXCHG:
+            fail = _default_fail_order(order) if fail is None else MemoryOrder(fail)
+            if not fail.is_valid_fail_order(order):
+                raise MemoryOrderError(optype, fail, is_fail=True)
+        if fail is not None and optype not in _CMPXCHG:
+            raise ValueError(f"Argument 'fail' is only valid for compare exchange ops, not {optype.name}.")
+        # build the callable
+        core = self._core
+        fn = getattr(core._table, _table_method_name(optype))
+        if optype in _NO_ARG:
+            def bound_op():
+                address = core._address
+                if not address:
+                    core._assert_not_released()
+                return fn(address, order)
+        elif optype in _BIT:
+            nbits = core._width * 8  # CHAR_BIT == 8
+
+            def bound_op(index: int):
+                address = core._address
+                if not address:
+                    core._assert_not_released()
+                if index < 0 or index >= nbits:
+                    raise ValueError("'index' value out of range.")
+                return fn(address, index, order)
+        elif optype in _CMPXCHG:
+            def bound_op(expected, desired):
+                address = core._address
+                if not address:
+                    core._assert_not_released()
+                return CmpxchgResult(*fn(address, expected, desired, order, fail))
+        else:
+            def bound_op(value):
+                address = core._address
+                if not address:
+                    core._assert_not_released()
+                return fn(address, value, order)
+        bound_op.__name__ = bound_op.__qualname__ = _table_method_name(optype)
+        return bound_op
@@ -1,34 +1,22 @@
 from ...enums import MemoryOrder, OpType
+from ...exceptions import MemoryOrderError
 
 from ..core import AtomicCore
 
 from .byteops import ByteOperationsMixin
 from .cmpxchg import CmpxchgResult
 
-import sys
-from typing import Optional, Tuple
+
+# the default order, which is always valid, is checked for first on hot paths
+_SEQ_CST = MemoryOrder.SEQ_CST
 
 
 class _ImplIntegralOperationsMixin(ByteOperationsMixin):
 
     _core: AtomicCore
 
-    def _impl_cmpxchg(self, optype: OpType, expected: int, desired: int,
-                      succ: MemoryOrder, fail: MemoryOrder) -> CmpxchgResult[int]:
-        expected = expected.to_bytes(self._core.width, sys.byteorder, signed=self._core.signed)
-        desired = desired.to_bytes(self._core.width, sys.byteorder, signed=self._core.signed)
-        ok, exp = super()._impl_cmpxchg(optype, expected, desired, succ, fail)
-        exp = int.from_bytes(exp, sys.byteorder, signed=self._core.signed)
-        return CmpxchgResult(ok, exp)
-
-    def _impl_bin_ari(self, optype: OpType, value: Optional[int],
-                      order: MemoryOrder) -> Optional[int]:
-        if value is not None:
-            value = value.to_bytes(self._core.width, sys.byteorder, signed=self._core.signed)
-        res = super()._impl_bin_ari(optype, value, order)
-        if res is not None:
-            res = int.from_bytes(res, sys.byteorder, signed=self._core.signed)
-        return res
+    # ops taking values don't call _check_value: the op table raises OverflowError
+    # if an int does not fit in width, and these are the hot paths
 
 
 class IntegralOperationsMixin(_ImplIntegralOperationsMixin):
@@ -36,17 +24,20 @@ class IntegralOperationsMixin(_ImplIntegralOperationsMixin):
     _core: AtomicCore
 
     def store(self, desired: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        desired = desired.to_bytes(self._core.width, sys.byteorder, signed=self._core.signed)
-        super().store(desired, order)
+        self._check_supported(OpType.STORE)
+        if order is not _SEQ_CST and not order.is_valid_store_order():
+            raise MemoryOrderError(OpType.STORE, order, is_fail=False)
+        self._core._table.store(self._core._address, desired, order)
 
     def load(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        value = super().load(order)
-        return int.from_bytes(value, sys.byteorder, signed=self._core.signed)
+        self._check_supported(OpType.LOAD)
+        if order is not _SEQ_CST and not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        return self._core._table.load(self._core._address, order)
 
     def exchange(self, desired: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        desired = desired.to_bytes(self._core.width, sys.byteorder, signed=self._core.signed)
-        value = super().exchange(desired, order)
-        return int.from_bytes(value, sys.byteorder, signed=self._core.signed)
+        self._check_supported(OpType.EXCHANGE)
+        return self._core._table.exchange(self._core._address, desired, order)
 
     def cmpxchg_weak(self, expected: int, desired: int,
                      success: MemoryOrder = MemoryOrder.SEQ_CST,
@@ -59,55 +50,71 @@ class IntegralOperationsMixin(_ImplIntegralOperationsMixin):
         return self._impl_cmpxchg(OpType.CMPXCHG_STRONG, expected, desired, success, failure)
 
     def bin_or(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.OR, value, order)
+        self._check_supported(OpType.OR)
+        return self._core._table.bin_or(self._core._address, value, order)
 
     def bin_xor(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.XOR, value, order)
+        self._check_supported(OpType.XOR)
+        return self._core._table.bin_xor(self._core._address, value, order)
 
     def bin_and(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.AND, value, order)
+        self._check_supported(OpType.AND)
+        return self._core._table.bin_and(self._core._address, value, order)
 
     def bin_not(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.NOT, None, order)
+        return super().bin_not(order)
 
     def bin_fetch_or(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_OR, value, order)
+        self._check_supported(OpType.FETCH_OR)
+        return self._core._table.bin_fetch_or(self._core._address, value, order)
 
     def bin_fetch_xor(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_XOR, value, order)
+        self._check_supported(OpType.FETCH_XOR)
+        return self._core._table.bin_fetch_xor(self._core._address, value, order)
 
     def bin_fetch_and(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_AND, value, order)
+        self._check_supported(OpType.FETCH_AND)
+        return self._core._table.bin_fetch_and(self._core._address, value, order)
 
     def bin_fetch_not(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_NOT, None, order)
+        return super().bin_fetch_not(order)
 
     def add(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.ADD, value, order)
+        self._check_supported(OpType.ADD)
+        return self._core._table.add(self._core._address, value, order)
 
     def sub(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.SUB, value, order)
+        self._check_supported(OpType.SUB)
+        return self._core._table.sub(self._core._address, value, order)
 
     def inc(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.INC, None, order)
+        self._check_supported(OpType.INC)
+        return self._core._table.inc(self._core._address, order)
 
     def dec(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.DEC, None, order)
+        self._check_supported(OpType.DEC)
+        return self._core._table.dec(self._core._address, order)
 
     def neg(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> None:
-        return self._impl_bin_ari(OpType.NEG, None, order)
+        self._check_supported(OpType.NEG)
+        return self._core._table.neg(self._core._address, order)
 
     def fetch_add(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_ADD, value, order)
+        self._check_supported(OpType.FETCH_ADD)
+        return self._core._table.fetch_add(self._core._address, value, order)
 
     def fetch_sub(self, value: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_SUB, value, order)
+        self._check_supported(OpType.FETCH_SUB)
+        return self._core._table.fetch_sub(self._core._address, value, order)
 
     def fetch_inc(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_INC, None, order)
+        self._check_supported(OpType.FETCH_INC)
+        return self._core._table.fetch_inc(self._core._address, order)
 
     def fetch_dec(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_DEC, None, order)
+        self._check_supported(OpType.FETCH_DEC)
+        return self._core._table.fetch_dec(self._core._address, order)
 
     def fetch_neg(self, order: MemoryOrder = MemoryOrder.SEQ_CST) -> int:
-        return self._impl_bin_ari(OpType.FETCH_NEG, None, order)
+        self._check_supported(OpType.FETCH_NEG)
+        return self._core._table.fetch_neg(self._core._address, order)
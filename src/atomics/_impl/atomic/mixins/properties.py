@@ -1,7 +1,7 @@
 from ...enums import OpType
 from ...exceptions import UnsupportedOperationException
 
-from ..core import AtomicCore
+from ..core import AtomicArrayCore, AtomicCore
 
 from typing import Callable
 
@@ -69,3 +69,48 @@ class IntegralPropertiesMixin(BasePropertiesMixin):
     @property
     def signed(self) -> bool:
         return self._core.signed
+
+
+class BaseArrayPropertiesMixin:
+
+    _core: AtomicArrayCore
+
+    @property
+    def _address(self) -> int:
+        return self._core.address
+
+    @property
+    def width(self) -> int:
+        return self._core.width
+
+    @property
+    def stride(self) -> int:
+        return self._core.stride
+
+    @property
+    def readonly(self) -> bool:
+        return self._core.readonly
+
+    @property
+    def ops_supported(self) -> [OpType]:
+        return self._core.ops_supported
+
+    def __len__(self):
+        return self._core.length
+
+    def __str__(self):
+        msg = f"{self.__class__.__name__}(length={len(self)}, width={self.width}, " \
+              f"readonly={self.readonly})"
+        return msg
+
+
+class IntegralArrayPropertiesMixin(BaseArrayPropertiesMixin):
+
+    def __str__(self):
+        msg = f"{self.__class__.__name__}(length={len(self)}, width={self.width}, " \
+              f"readonly={self.readonly}, signed={self.signed})"
+        return msg
+
+    @property
+    def signed(self) -> bool:
+        return self._core.signed
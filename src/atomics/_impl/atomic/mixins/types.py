@@ -1,17 +1,22 @@
+from .bind import BindOperationsMixin
 from .byteops import ByteOperationsMixin
 from .intops import IntegralOperationsMixin
 from .properties import BasePropertiesMixin, BytePropertiesMixin, IntegralPropertiesMixin
+from .update import UpdateOperationsMixin
+from .wait import WaitOperationsMixin
 
 
 class ANY(BasePropertiesMixin):
     pass
 
 
-class INTEGRAL(ANY, IntegralOperationsMixin, IntegralPropertiesMixin):
+class INTEGRAL(ANY, IntegralOperationsMixin, UpdateOperationsMixin, WaitOperationsMixin,
+               BindOperationsMixin, IntegralPropertiesMixin):
     pass
 
 
-class BYTES(ANY, ByteOperationsMixin, BytePropertiesMixin):
+class BYTES(ANY, ByteOperationsMixin, UpdateOperationsMixin, WaitOperationsMixin,
+            BindOperationsMixin, BytePropertiesMixin):
     pass
 
 
@@ -0,0 +1,133 @@
+from ...enums import Backoff, MemoryOrder, OpType
+from ...exceptions import MemoryOrderError
+
+from ..core import AtomicCore
+
+from .byteops import _ImplOperationChecksMixin
+
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+
+T = TypeVar('T', bytes, int)
+
+# delays for Backoff.EXPONENTIAL, in seconds
+_MIN_DELAY = 1e-6
+_MAX_DELAY = 1e-3
+
+
+class UpdateResult(Generic[T]):
+
+    def __init__(self, old: T, new: T, retries: int):
+        self.old: T = old
+        self.new: T = new
+        self.retries: int = retries
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(old={self.old}, new={self.new}, " \
+               f"retries={self.retries})"
+
+    def __iter__(self):
+        return iter((self.old, self.new))
+
+
+class UpdateStats:
+
+    # totals over every update() call on a single atomic object
+
+    def __init__(self, updates: int = 0, retries: int = 0, max_retries: int = 0):
+        self.updates: int = updates
+        self.retries: int = retries
+        self.max_retries: int = max_retries
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(updates={self.updates}, " \
+               f"retries={self.retries}, max_retries={self.max_retries})"
+
+    @property
+    def mean_retries(self) -> float:
+        return (self.retries / self.updates) if self.updates else 0.0
+
+
+class _CoreUpdateStats(UpdateStats):
+
+    # lives on the core, so is shared by every view of the same core
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def record(self, retries: int) -> None:
+        with self._lock:
+            self.updates += 1
+            self.retries += retries
+            if retries > self.max_retries:
+                self.max_retries = retries
+
+    def snapshot(self) -> UpdateStats:
+        with self._lock:
+            return UpdateStats(self.updates, self.retries, self.max_retries)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.updates = self.retries = self.max_retries = 0
+
+
+class UpdateOperationsMixin(_ImplOperationChecksMixin):
+
+    _core: AtomicCore
+
+    def _core_update_stats(self) -> _CoreUpdateStats:
+        stats = self._core._update_stats
+        if stats is None:
+            # racing threads may each create one, but only one is kept
+            stats = self._core.__dict__.setdefault("_update_stats", _CoreUpdateStats())
+        return stats
+
+    def update(self, fn: Callable[[T], T], *,
+               success: MemoryOrder = MemoryOrder.SEQ_CST,
+               failure: MemoryOrder = MemoryOrder.SEQ_CST,
+               backoff: Backoff = Backoff.EXPONENTIAL,
+               max_spins: int = 8) -> UpdateResult[T]:
+        # check support
+        self._check_supported(OpType.LOAD)
+        self._check_supported(OpType.CMPXCHG_WEAK)
+        # validate inputs
+        if not failure.is_valid_fail_order(success):
+            raise MemoryOrderError(OpType.CMPXCHG_WEAK, failure, is_fail=True)
+        if not isinstance(backoff, Backoff):
+            raise TypeError("Keyword argument 'backoff' must have type 'Backoff'.")
+        if max_spins < 0:
+            raise ValueError("Keyword argument 'max_spins' must not be negative.")
+        # everything is resolved once, so retries only call fn and the op table
+        table, address = self._core._table, self._core._address
+        cmpxchg = table.cmpxchg_weak
+        old = table.load(address, failure)
+        retries = 0
+        delay = _MIN_DELAY
+        while True:
+            new = fn(old)
+            ok, current = cmpxchg(address, old, new, success, failure)
+            if ok:
+                break
+            old = current
+            retries += 1
+            if retries <= max_spins or backoff is Backoff.NONE:
+                continue
+            elif backoff is Backoff.YIELD:
+                time.sleep(0)
+            else:
+                time.sleep(delay)
+                delay = min(delay * 2, _MAX_DELAY)
+        self._core_update_stats().record(retries)
+        return UpdateResult(old, new, retries)
+
+    @property
+    def update_stats(self) -> UpdateStats:
+        self._core._assert_not_released()
+        return self._core_update_stats().snapshot()
+
+    def reset_update_stats(self) -> None:
+        self._core._assert_not_released()
+        self._core_update_stats().reset()
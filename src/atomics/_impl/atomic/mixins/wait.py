@@ -0,0 +1,52 @@
+from ... import waiting
+from ...enums import MemoryOrder, OpType
+from ...exceptions import MemoryOrderError
+
+from ..core import AtomicCore
+
+from .byteops import _ImplOperationChecksMixin
+
+import sys
+from typing import Optional
+
+
+class WaitOperationsMixin(_ImplOperationChecksMixin):
+
+    _core: AtomicCore
+
+    # waiting compares raw bytes, so int values are converted once up front
+
+    def _old_bytes(self, old) -> bytes:
+        if self._core._is_integral:
+            return old.to_bytes(self._core.width, sys.byteorder, signed=self._core._is_signed)
+        self._check_value("old", old)
+        return bytes(old)
+
+    def _from_bytes(self, raw):
+        if self._core._is_integral:
+            return int.from_bytes(raw, sys.byteorder, signed=self._core._is_signed)
+        return bytes(raw)
+
+    def wait(self, old, timeout: Optional[float] = None,
+             order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        # check support
+        self._check_supported(OpType.LOAD)
+        # validate inputs
+        if not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number.")
+        old = self._old_bytes(old)
+        # perform operation
+        table, address = self._core._table, self._core._address
+        return waiting.wait_address(address, self._core.width, old,
+                                    lambda out: table.load_into(address, out, order), timeout,
+                                    shared=not self._core._process_private)
+
+    def notify_one(self) -> None:
+        self._core._assert_not_released()
+        waiting.notify_address(self._core._address, self._core._width, wake_all=False)
+
+    def notify_all(self) -> None:
+        self._core._assert_not_released()
+        waiting.notify_address(self._core._address, self._core._width, wake_all=True)
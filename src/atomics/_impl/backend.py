@@ -0,0 +1,486 @@
+import os
+import sys
+
+from ctypes import PYFUNCTYPE, addressof, c_void_p, cast
+
+from .enums import OpType
+from .patomic import Patomic
+from .pybuffer import PyBuffer
+from .scratch import get_bytes_scratch, get_int_scratch, int_ctype
+
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    # the ctypes structs are only defined once patomic is loaded
+    from .patomic import Ops
+
+
+# single ops on objects up to this width hold the GIL, since patomic implements
+# them with a single lock-free instruction which is cheaper than releasing and
+# reacquiring the GIL; wider ops may be multi-instruction or lock-based, so
+# release it (the same policy as in _native.c)
+GIL_HOLD_MAX_WIDTH = 8
+
+
+def default_release_gil(width: int) -> bool:
+    return width > GIL_HOLD_MAX_WIDTH
+
+
+# ctypes releases the GIL around calls through CFUNCTYPE pointers (which is
+# what patomic's struct fields are), but not PYFUNCTYPE ones
+_gil_holding_protos: Dict[type, type] = {}
+
+
+def _hold_gil(funcs: Dict[OpType, Callable]) -> Dict[OpType, Callable]:
+    held: Dict[OpType, Callable] = {}
+    for ot, fp in funcs.items():
+        proto = type(fp)
+        if proto not in _gil_holding_protos:
+            _gil_holding_protos[proto] = PYFUNCTYPE(proto._restype_, *proto._argtypes_)
+        held[ot] = _gil_holding_protos[proto](cast(fp, c_void_p).value)
+    return held
+
+
+class _CtypesBytesOpTable:
+
+    # same interface as _native.OpTable, implemented with ctypes function pointers
+    # every method takes the address of the atomic object as its first argument
+    # MemoryOrder is an IntEnum, so it can be passed as is rather than via .value
+
+    def __init__(self, funcs: Dict[OpType, Callable], width: int, *,
+                 release_gil: Optional[bool] = None):
+        if release_gil is None:
+            release_gil = default_release_gil(width)
+        self._funcs: Dict[OpType, Callable] = funcs if release_gil else _hold_gil(funcs)
+        self._width: int = width
+        self.release_gil: bool = release_gil
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(width={self._width}, release_gil={self.release_gil})"
+
+    def _check_width(self, name: str, value: bytes) -> None:
+        if len(value) != self._width:
+            raise ValueError(f"'{name}' object length does not match width.")
+
+    # values are copied through per-thread scratch memory, so no temporary
+    # buffer objects are needed; only caller provided buffers (*_into, *_many)
+    # are pinned with PyBuffer
+
+    def _void(self, optype: OpType, address: int, value: Optional[bytes], order: int) -> None:
+        fp = self._funcs[optype]
+        if value is None:
+            fp(address, order)
+        else:
+            self._check_width("value", value)
+            scratch = get_bytes_scratch(self._width)
+            scratch.arg.raw = value
+            fp(address, scratch.arg_address, order)
+
+    def _fetch(self, optype: OpType, address: int, value: Optional[bytes], order: int) -> bytes:
+        fp = self._funcs[optype]
+        scratch = get_bytes_scratch(self._width)
+        if value is None:
+            fp(address, order, scratch.res_address)
+        else:
+            self._check_width("value", value)
+            scratch.arg.raw = value
+            fp(address, scratch.arg_address, order, scratch.res_address)
+        return scratch.res.raw
+
+    def _test(self, optype: OpType, address: int, index: int, order: int) -> bool:
+        return bool(self._funcs[optype](address, index, order))
+
+    def _cmpxchg(self, optype: OpType, address: int, expected: bytes, desired: bytes,
+                 succ: int, fail: int) -> Tuple[bool, bytes]:
+        fp = self._funcs[optype]
+        self._check_width("expected", expected)
+        self._check_width("desired", desired)
+        # res holds expected, and is overwritten with the current value on failure
+        scratch = get_bytes_scratch(self._width)
+        scratch.res.raw = expected
+        scratch.arg.raw = desired
+        ok = fp(address, scratch.res_address, scratch.arg_address, succ, fail)
+        return bool(ok), scratch.res.raw
+
+    def _into_buffer(self, name: str, obj) -> PyBuffer:
+        # writable buffer of exactly width bytes; caller must release it
+        with memoryview(obj) as view:
+            if view.readonly:
+                raise BufferError(f"'{name}' object is not writable.")
+        buf = PyBuffer(obj, writeable=True)
+        if buf.width != self._width:
+            buf.release()
+            raise ValueError(f"'{name}' object length does not match width.")
+        return buf
+
+    def _cmpxchg_into(self, optype: OpType, address: int, expected, desired,
+                      succ: int, fail: int) -> bool:
+        # expected is updated in place on failure, as in C
+        fp = self._funcs[optype]
+        self._check_width("desired", desired)
+        scratch = get_bytes_scratch(self._width)
+        scratch.arg.raw = desired
+        with self._into_buffer("expected", expected) as exp_buf:
+            return bool(fp(address, exp_buf.address, scratch.arg_address, succ, fail))
+
+    def _many(self, optype: OpType, base: int, stride: int, length: int,
+              indices, values, out, order: int) -> None:
+        # the native table does this loop in C without the GIL
+        # indices are int64, values and out are contiguous (len(indices) * width) bytes
+        fp = self._funcs[optype]
+        width = self._width
+        with memoryview(indices) as idx_view:
+            idx = idx_view.cast("B").cast("q").tolist()
+        # check every index before performing any operations
+        for k, i in enumerate(idx):
+            if i < 0:
+                i += length
+            if i < 0 or i >= length:
+                raise IndexError("Atomic array index out of range.")
+            idx[k] = base + (i * stride)
+        val_buf = None if values is None else PyBuffer(values, writeable=False)
+        res_buf = None if out is None else PyBuffer(out, writeable=True)
+        try:
+            for name, buf in (("values", val_buf), ("out", res_buf)):
+                if buf is not None and buf.width != len(idx) * width:
+                    raise ValueError(f"'{name}' object length does not match 'indices' length.")
+            if val_buf is None:
+                res = res_buf.address
+                for k, address in enumerate(idx):
+                    fp(address, order, res + (k * width))
+            elif res_buf is None:
+                val = val_buf.address
+                for k, address in enumerate(idx):
+                    fp(address, val + (k * width), order)
+            else:
+                val, res = val_buf.address, res_buf.address
+                for k, address in enumerate(idx):
+                    fp(address, val + (k * width), order, res + (k * width))
+        finally:
+            for buf in (val_buf, res_buf):
+                if buf is not None:
+                    buf.release()
+
+    def load_many(self, base: int, stride: int, length: int, indices, out, order: int) -> None:
+        self._many(OpType.LOAD, base, stride, length, indices, None, out, order)
+
+    def store_many(self, base: int, stride: int, length: int, indices, values, order: int) -> None:
+        self._many(OpType.STORE, base, stride, length, indices, values, None, order)
+
+    def add_many(self, base: int, stride: int, length: int, indices, values, order: int) -> None:
+        self._many(OpType.ADD, base, stride, length, indices, values, None, order)
+
+    def sub_many(self, base: int, stride: int, length: int, indices, values, order: int) -> None:
+        self._many(OpType.SUB, base, stride, length, indices, values, None, order)
+
+    def fetch_add_many(self, base: int, stride: int, length: int, indices, values, out,
+                       order: int) -> None:
+        self._many(OpType.FETCH_ADD, base, stride, length, indices, values, out, order)
+
+    def fetch_sub_many(self, base: int, stride: int, length: int, indices, values, out,
+                       order: int) -> None:
+        self._many(OpType.FETCH_SUB, base, stride, length, indices, values, out, order)
+
+    def bits_claim(self, base: int, nbits: int, start_word: int, succ: int, fail: int) -> int:
+        raise TypeError("bits_claim() requires an integral OpTable with a width of 1, 2, 4, or 8.")
+
+    def bits_count(self, base: int, nbits: int, order: int) -> int:
+        raise TypeError("bits_count() requires an integral OpTable with a width of 1, 2, 4, or 8.")
+
+    def store(self, address: int, desired: bytes, order: int) -> None:
+        self._check_width("desired", desired)
+        scratch = get_bytes_scratch(self._width)
+        scratch.arg.raw = desired
+        self._funcs[OpType.STORE](address, scratch.arg_address, order)
+
+    def load(self, address: int, order: int) -> bytes:
+        scratch = get_bytes_scratch(self._width)
+        self._funcs[OpType.LOAD](address, order, scratch.res_address)
+        return scratch.res.raw
+
+    def exchange(self, address: int, desired: bytes, order: int) -> bytes:
+        return self._fetch(OpType.EXCHANGE, address, desired, order)
+
+    # the *_into methods take raw bytes in every table, so are not overridden
+    # by the integral tables below
+
+    def load_into(self, address: int, out, order: int) -> None:
+        with self._into_buffer("out", out) as res_buf:
+            self._funcs[OpType.LOAD](address, order, res_buf.address)
+
+    def exchange_into(self, address: int, desired, out, order: int) -> None:
+        self._check_width("desired", desired)
+        # desired is copied first, so may be the same object as out
+        scratch = get_bytes_scratch(self._width)
+        scratch.arg.raw = desired
+        with self._into_buffer("out", out) as res_buf:
+            self._funcs[OpType.EXCHANGE](address, scratch.arg_address, order, res_buf.address)
+
+    def cmpxchg_weak_into(self, address: int, expected, desired, succ: int, fail: int) -> bool:
+        return self._cmpxchg_into(OpType.CMPXCHG_WEAK, address, expected, desired, succ, fail)
+
+    def cmpxchg_strong_into(self, address: int, expected, desired, succ: int, fail: int) -> bool:
+        return self._cmpxchg_into(OpType.CMPXCHG_STRONG, address, expected, desired, succ, fail)
+
+    def cmpxchg_weak(self, address: int, expected, desired, succ: int, fail: int):
+        return self._cmpxchg(OpType.CMPXCHG_WEAK, address, expected, desired, succ, fail)
+
+    def cmpxchg_strong(self, address: int, expected, desired, succ: int, fail: int):
+        return self._cmpxchg(OpType.CMPXCHG_STRONG, address, expected, desired, succ, fail)
+
+    def bit_test(self, address: int, index: int, order: int) -> bool:
+        return self._test(OpType.BIT_TEST, address, index, order)
+
+    def bit_test_compl(self, address: int, index: int, order: int) -> bool:
+        return self._test(OpType.BIT_TEST_COMPL, address, index, order)
+
+    def bit_test_set(self, address: int, index: int, order: int) -> bool:
+        return self._test(OpType.BIT_TEST_SET, address, index, order)
+
+    def bit_test_reset(self, address: int, index: int, order: int) -> bool:
+        return self._test(OpType.BIT_TEST_RESET, address, index, order)
+
+    def bin_or(self, address: int, value, order: int) -> None:
+        return self._void(OpType.OR, address, value, order)
+
+    def bin_xor(self, address: int, value, order: int) -> None:
+        return self._void(OpType.XOR, address, value, order)
+
+    def bin_and(self, address: int, value, order: int) -> None:
+        return self._void(OpType.AND, address, value, order)
+
+    def bin_not(self, address: int, order: int) -> None:
+        return self._void(OpType.NOT, address, None, order)
+
+    def bin_fetch_or(self, address: int, value, order: int):
+        return self._fetch(OpType.FETCH_OR, address, value, order)
+
+    def bin_fetch_xor(self, address: int, value, order: int):
+        return self._fetch(OpType.FETCH_XOR, address, value, order)
+
+    def bin_fetch_and(self, address: int, value, order: int):
+        return self._fetch(OpType.FETCH_AND, address, value, order)
+
+    def bin_fetch_not(self, address: int, order: int):
+        return self._fetch(OpType.FETCH_NOT, address, None, order)
+
+    def add(self, address: int, value, order: int) -> None:
+        return self._void(OpType.ADD, address, value, order)
+
+    def sub(self, address: int, value, order: int) -> None:
+        return self._void(OpType.SUB, address, value, order)
+
+    def inc(self, address: int, order: int) -> None:
+        return self._void(OpType.INC, address, None, order)
+
+    def dec(self, address: int, order: int) -> None:
+        return self._void(OpType.DEC, address, None, order)
+
+    def neg(self, address: int, order: int) -> None:
+        return self._void(OpType.NEG, address, None, order)
+
+    def fetch_add(self, address: int, value, order: int):
+        return self._fetch(OpType.FETCH_ADD, address, value, order)
+
+    def fetch_sub(self, address: int, value, order: int):
+        return self._fetch(OpType.FETCH_SUB, address, value, order)
+
+    def fetch_inc(self, address: int, order: int):
+        return self._fetch(OpType.FETCH_INC, address, None, order)
+
+    def fetch_dec(self, address: int, order: int):
+        return self._fetch(OpType.FETCH_DEC, address, None, order)
+
+    def fetch_neg(self, address: int, order: int):
+        return self._fetch(OpType.FETCH_NEG, address, None, order)
+
+
+class _CtypesIntOpTable(_CtypesBytesOpTable):
+
+    # for integral widths without a native C integer type; converts via bytes
+
+    def __init__(self, funcs: Dict[OpType, Callable], width: int, *, is_signed: bool,
+                 release_gil: Optional[bool] = None):
+        super().__init__(funcs, width, release_gil=release_gil)
+        self._is_signed: bool = is_signed
+
+    def _to_bytes(self, value: int) -> bytes:
+        return value.to_bytes(self._width, sys.byteorder, signed=self._is_signed)
+
+    def _from_bytes(self, value: bytes) -> int:
+        return int.from_bytes(value, sys.byteorder, signed=self._is_signed)
+
+    def _void(self, optype: OpType, address: int, value: Optional[int], order: int) -> None:
+        if value is not None:
+            value = self._to_bytes(value)
+        super()._void(optype, address, value, order)
+
+    def _fetch(self, optype: OpType, address: int, value: Optional[int], order: int) -> int:
+        if value is not None:
+            value = self._to_bytes(value)
+        return self._from_bytes(super()._fetch(optype, address, value, order))
+
+    def _cmpxchg(self, optype: OpType, address: int, expected: int, desired: int,
+                 succ: int, fail: int) -> Tuple[bool, int]:
+        expected, desired = self._to_bytes(expected), self._to_bytes(desired)
+        ok, exp = super()._cmpxchg(optype, address, expected, desired, succ, fail)
+        return ok, self._from_bytes(exp)
+
+    def store(self, address: int, desired: int, order: int) -> None:
+        super().store(address, self._to_bytes(desired), order)
+
+    def load(self, address: int, order: int) -> int:
+        return self._from_bytes(super().load(address, order))
+
+
+class _CtypesNativeIntOpTable(_CtypesBytesOpTable):
+
+    # for integral widths of 1, 2, 4, and 8 bytes
+    # marshals through per-thread ctypes scratch values instead of bytes
+
+    def __init__(self, funcs: Dict[OpType, Callable], width: int, *, is_signed: bool,
+                 release_gil: Optional[bool] = None):
+        super().__init__(funcs, width, release_gil=release_gil)
+        self._ctype = int_ctype(width, is_signed=is_signed)
+        assert self._ctype is not None
+        self._is_signed: bool = is_signed
+
+    def _void(self, optype: OpType, address: int, value: Optional[int], order: int) -> None:
+        fp = self._funcs[optype]
+        if value is None:
+            fp(address, order)
+        else:
+            scratch = get_int_scratch(self._ctype)
+            scratch.set_arg(value)
+            fp(address, scratch.arg_address, order)
+
+    def _fetch(self, optype: OpType, address: int, value: Optional[int], order: int) -> int:
+        fp = self._funcs[optype]
+        scratch = get_int_scratch(self._ctype)
+        if value is None:
+            fp(address, order, scratch.res_address)
+        else:
+            scratch.set_arg(value)
+            fp(address, scratch.arg_address, order, scratch.res_address)
+        return scratch.res.value
+
+    def _cmpxchg(self, optype: OpType, address: int, expected: int, desired: int,
+                 succ: int, fail: int) -> Tuple[bool, int]:
+        scratch = get_int_scratch(self._ctype)
+        scratch.set_res(expected)
+        scratch.set_arg(desired)
+        # res holds expected, and is overwritten with the current value on failure
+        ok = self._funcs[optype](address, scratch.res_address, scratch.arg_address, succ, fail)
+        return bool(ok), scratch.res.value
+
+    def store(self, address: int, desired: int, order: int) -> None:
+        scratch = get_int_scratch(self._ctype)
+        scratch.set_arg(desired)
+        self._funcs[OpType.STORE](address, scratch.arg_address, order)
+
+    def load(self, address: int, order: int) -> int:
+        scratch = get_int_scratch(self._ctype)
+        self._funcs[OpType.LOAD](address, order, scratch.res_address)
+        return scratch.res.value
+
+    # the native table does these loops in C without the GIL
+
+    def _from_bits(self, bits: int) -> int:
+        # unsigned bit pattern to a value of the table's type
+        word_bits = self._width * 8
+        if self._is_signed and (bits >> (word_bits - 1)):
+            return bits - (1 << word_bits)
+        return bits
+
+    def _bits_layout(self, nbits: int) -> Tuple[int, int, int]:
+        if nbits < 0:
+            raise ValueError("'nbits' must not be negative.")
+        word_bits = self._width * 8
+        nwords = -(-nbits // word_bits)
+        tail = nbits - ((nwords - 1) * word_bits)
+        return word_bits, nwords, (1 << tail) - 1
+
+    def bits_claim(self, base: int, nbits: int, start_word: int, succ: int, fail: int) -> int:
+        word_bits, nwords, tail_mask = self._bits_layout(nbits)
+        full = (1 << word_bits) - 1
+        for k in range(nwords):
+            w = (start_word + k) % nwords
+            address = base + (w * self._width)
+            valid = tail_mask if w == nwords - 1 else full
+            current = self.load(address, fail)
+            # retry this word until it is full or a bit in it is claimed
+            while ~current & valid:
+                free = ~current & valid
+                bit = free & -free
+                desired = self._from_bits((current & full) | bit)
+                ok, current = self._cmpxchg(OpType.CMPXCHG_WEAK, address, current, desired, succ, fail)
+                if ok:
+                    return (w * word_bits) + bit.bit_length() - 1
+        return -1
+
+    def bits_count(self, base: int, nbits: int, order: int) -> int:
+        word_bits, nwords, tail_mask = self._bits_layout(nbits)
+        full = (1 << word_bits) - 1
+        count = 0
+        for w in range(nwords):
+            valid = tail_mask if w == nwords - 1 else full
+            count += bin(self.load(base + (w * self._width), order) & valid).count("1")
+        return count
+
+
+def _load_native():
+    # ATOMICS_BACKEND=ctypes forces the fallback, =native makes it mandatory
+    choice = os.environ.get("ATOMICS_BACKEND", "").strip().lower()
+    if choice not in ("", "native", "ctypes"):
+        raise ValueError(f"ATOMICS_BACKEND must be 'native' or 'ctypes', not {choice!r}.")
+    if choice == "ctypes":
+        return None
+    try:
+        from . import _native
+        return _native
+    except ImportError:
+        if choice == "native":
+            raise
+        return None
+
+
+_native = _load_native()
+
+
+def backend_name() -> str:
+    return "ctypes" if _native is None else "native"
+
+
+def always_lock_free(width: int) -> Optional[bool]:
+    # whether the platform has lock-free instructions for objects of this width,
+    # as reported by the compiler that built the native extension
+    # None if that isn't known (e.g. using the ctypes backend)
+    if _native is None:
+        return None
+    return _native.always_lock_free(width)
+
+
+def thread_fence() -> Optional[Callable[[int], None]]:
+    # a function like C11 atomic_thread_fence(order), or None if there isn't one
+    # (patomic has no fence, so this needs a native extension built by gcc/clang)
+    return getattr(_native, "thread_fence", None)
+
+
+def _new_op_table(ops: "Ops", width: int, *, is_integral: bool, is_signed: bool):
+    if _native is not None:
+        return _native.OpTable(addressof(ops), width, is_integral, is_signed)
+    funcs = Patomic.op_funcs(ops, is_signed=is_signed)
+    if not is_integral:
+        return _CtypesBytesOpTable(funcs, width)
+    elif int_ctype(width, is_signed=is_signed) is not None:
+        return _CtypesNativeIntOpTable(funcs, width, is_signed=is_signed)
+    else:
+        return _CtypesIntOpTable(funcs, width, is_signed=is_signed)
+
+
+def get_op_table(ops: "Ops", width: int, *, is_integral: bool, is_signed: bool):
+    # tables are stateless apart from the op functions, so can be shared
+    if not Patomic.is_cached_ops(ops):
+        return _new_op_table(ops, width, is_integral=is_integral, is_signed=is_signed)
+    key = ("table", addressof(ops), width, is_integral, is_signed)
+    return Patomic._cached(key, lambda: _new_op_table(ops, width, is_integral=is_integral, is_signed=is_signed))
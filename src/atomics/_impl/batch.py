@@ -0,0 +1,122 @@
+import array
+import operator
+import sys
+
+from typing import List, Optional, Union
+
+
+# batched operations take contiguous buffers: indices as native int64, and
+# values/results as (len(indices) * width) bytes
+# anything already in that layout (e.g. NumPy arrays) is used without copying
+
+_INT_FORMATS = frozenset("bBhHiIlLqQnN")
+
+# array.array typecode for each (width, signed), if there is one
+_INT_TYPECODES = {}
+for _tc in "bBhHiIlLqQ":
+    _INT_TYPECODES.setdefault((array.array(_tc).itemsize, _tc.islower()), _tc)
+del _tc
+
+BufferLike = Union[bytes, bytearray, memoryview, array.array]
+
+
+def _int_view(obj, itemsize: int, *, signed: Optional[bool] = None) -> Optional[memoryview]:
+    # returns a 1d byte view if obj already holds native integers of itemsize
+    # (and of the given signedness, unless it is None)
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return None
+    fmt = view.format
+    if fmt[:1] in "@=":
+        fmt = fmt[1:]
+    if view.ndim == 1 and view.c_contiguous and view.itemsize == itemsize and fmt in _INT_FORMATS:
+        if signed is None or fmt.islower() == signed:
+            return view.cast("B")
+    return None
+
+
+def _as_list(obj) -> list:
+    # memoryviews of other formats do not iterate nicely into array.array
+    if isinstance(obj, memoryview):
+        return obj.tolist()
+    try:
+        with memoryview(obj) as view:
+            return view.tolist()
+    except TypeError:
+        return list(obj)
+
+
+def index_buffer(indices) -> BufferLike:
+    # unsigned buffers are copied, rather than reinterpreting large indices as negative
+    view = _int_view(indices, 8, signed=True)
+    if view is not None:
+        return view
+    try:
+        return array.array(_INT_TYPECODES[(8, True)], _as_list(indices))
+    except OverflowError:
+        # too large for an int64, so too large for any array
+        raise IndexError("Atomic array index out of range.") from None
+
+
+def index_count(buf: BufferLike) -> int:
+    return len(memoryview(buf).cast("B")) // 8
+
+
+def int_values_buffer(values, count: int, width: int, *, is_signed: bool) -> BufferLike:
+    # values with a different signedness but the same width are reinterpreted
+    buf = _int_view(values, width)
+    if buf is None:
+        tc = _INT_TYPECODES.get((width, is_signed))
+        if tc is not None:
+            buf = array.array(tc, _as_list(values))
+        else:
+            buf = b"".join(operator.index(v).to_bytes(width, sys.byteorder, signed=is_signed)
+                           for v in _as_list(values))
+    _check_count("values", buf, count, width)
+    return buf
+
+
+def bytes_values_buffer(values, count: int, width: int) -> BufferLike:
+    # either one contiguous buffer, or a sequence of bytes-like objects
+    try:
+        buf = memoryview(values).cast("B")
+    except TypeError:
+        parts = [bytes(v) for v in values]
+        if any(len(p) != width for p in parts):
+            raise ValueError("'values' object length does not match width.")
+        buf = b"".join(parts)
+    _check_count("values", buf, count, width)
+    return buf
+
+
+def out_buffer(out, count: int, width: int) -> memoryview:
+    if out is None:
+        return memoryview(bytearray(count * width))
+    try:
+        buf = memoryview(out)
+    except TypeError:
+        raise TypeError("Keyword argument 'out' must support the buffer protocol.") from None
+    if buf.readonly or not buf.c_contiguous:
+        raise ValueError("Keyword argument 'out' must be a writeable contiguous buffer.")
+    buf = buf.cast("B")
+    _check_count("out", buf, count, width)
+    return buf
+
+
+def unpack_ints(buf: memoryview, width: int, *, is_signed: bool) -> List[int]:
+    tc = _INT_TYPECODES.get((width, is_signed))
+    if tc is not None:
+        return buf.cast(tc).tolist()
+    return [int.from_bytes(buf[i:i + width], sys.byteorder, signed=is_signed)
+            for i in range(0, len(buf), width)]
+
+
+def unpack_bytes(buf: memoryview, width: int) -> List[bytes]:
+    return [bytes(buf[i:i + width]) for i in range(0, len(buf), width)]
+
+
+def _check_count(name: str, buf: BufferLike, count: int, width: int) -> None:
+    if memoryview(buf).nbytes != count * width:
+        raise ValueError(f"'{name}' object length does not match 'indices' length.")
+
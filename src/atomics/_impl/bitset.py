@@ -0,0 +1,126 @@
+import operator
+
+from .atomic.array import AtomicUintArray
+from .enums import MemoryOrder, OpType
+from .exceptions import MemoryOrderError, UnsupportedOperationException
+
+from typing import Optional
+
+
+# a bitset spanning an array of uint64 words, where bit i is bit (i % 64) of
+# word (i // 64); bits past nbits in the last word are never touched
+# scans (finding a clear bit, counting set bits) run in the op table, so in C
+# without the GIL when using the native extension, and claim bits with a
+# cmpxchg on the whole word
+
+_WORD_WIDTH = 8
+_WORD_BITS = _WORD_WIDTH * 8
+
+RLX = MemoryOrder.RELAXED
+ACQ = MemoryOrder.ACQUIRE
+REL = MemoryOrder.RELEASE
+
+
+class AtomicBitset:
+
+    def __init__(self, buffer, nbits: Optional[int] = None):
+        # check if object has been initialised
+        if hasattr(self, "_array"):
+            raise ValueError("AtomicBitset object cannot be re-initialised.")
+        with memoryview(buffer) as view:
+            nbytes = view.nbytes
+        if nbits is None:
+            # every bit in the buffer's whole words
+            nbits = (nbytes // _WORD_WIDTH) * _WORD_BITS
+        if not isinstance(nbits, int):
+            raise TypeError("Argument 'nbits' must have type 'int'.")
+        if nbits <= 0:
+            raise ValueError("Argument 'nbits' must be positive.")
+        size = self.buffer_size(nbits)
+        if nbytes < size:
+            raise ValueError(f"Positional argument 'buffer' must be at least {size} bytes long.")
+        array = AtomicUintArray(buffer=memoryview(buffer).cast("B")[:size], width=_WORD_WIDTH)
+        for optype in (OpType.LOAD, OpType.CMPXCHG_WEAK, OpType.BIT_TEST_SET, OpType.BIT_TEST_RESET):
+            if optype not in array.ops_supported:
+                array.release()
+                raise UnsupportedOperationException(optype, _WORD_WIDTH, readonly=array.readonly)
+        self._array: AtomicUintArray = array
+        self._core = array._core
+        self._nbits: int = nbits
+        # word to start the next scan from; only a hint, so races don't matter
+        self._hint: int = 0
+
+    @staticmethod
+    def buffer_size(nbits: int) -> int:
+        return -(-nbits // _WORD_BITS) * _WORD_WIDTH
+
+    def __enter__(self):
+        self._core._assert_not_released()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release_buffer()
+
+    def __del__(self):
+        self.release_buffer()
+
+    def __len__(self) -> int:
+        self._core._assert_not_released()
+        return self._nbits
+
+    def __str__(self):
+        if hasattr(self, "_array") and self._core:
+            return f"{self.__class__.__name__}(nbits={self._nbits}, count={self.count()})"
+        return f"{self.__class__.__name__}(released)"
+
+    def release_buffer(self) -> None:
+        # release() frees a bit, so releasing the object itself has another name
+        if hasattr(self, "_array"):
+            self._array.release()
+
+    def _split(self, index: int):
+        index = operator.index(index)
+        if index < 0 or index >= self._nbits:
+            raise IndexError("Bitset index out of range.")
+        return index // _WORD_BITS, index % _WORD_BITS
+
+    @property
+    def nbits(self) -> int:
+        self._core._assert_not_released()
+        return self._nbits
+
+    def acquire_free(self) -> Optional[int]:
+        # atomically sets a clear bit and returns its index, or None if every bit is set
+        self._core._assert_not_released()
+        index = self._core._table.bits_claim(self._core._address, self._nbits, self._hint, ACQ, RLX)
+        if index < 0:
+            return None
+        self._hint = index // _WORD_BITS
+        return index
+
+    def release(self, index: int) -> None:
+        # clears a bit set by acquire_free() (or set())
+        word, bit = self._split(index)
+        if not self._array.bit_test_reset(word, bit, REL):
+            raise ValueError(f"Bit {index} is not set.")
+
+    def test(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        word, bit = self._split(index)
+        return bool((self._array.load(word, order) >> bit) & 1)
+
+    def set(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        # returns the previous value of the bit
+        word, bit = self._split(index)
+        return self._array.bit_test_set(word, bit, order)
+
+    def clear(self, index: int, order: MemoryOrder = MemoryOrder.SEQ_CST) -> bool:
+        # returns the previous value of the bit
+        word, bit = self._split(index)
+        return self._array.bit_test_reset(word, bit, order)
+
+    def count(self, order: MemoryOrder = MemoryOrder.RELAXED) -> int:
+        # number of set bits; each word is read atomically, but the total is not a snapshot
+        self._core._assert_not_released()
+        if not order.is_valid_load_order():
+            raise MemoryOrderError(OpType.LOAD, order, is_fail=False)
+        return self._core._table.bits_count(self._core._address, self._nbits, order)
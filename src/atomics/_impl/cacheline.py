@@ -0,0 +1,70 @@
+import ctypes
+import os
+import sys
+
+from typing import Optional
+
+
+# used if the line size cannot be detected (Apple silicon uses 128 byte lines)
+_DEFAULT_LINE_SIZE = 128 if sys.platform == "darwin" else 64
+
+_line_size: Optional[int] = None
+
+
+def _from_sysconf() -> Optional[int]:
+    try:
+        return os.sysconf("SC_LEVEL1_DCACHE_LINESIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _from_sysfs() -> Optional[int]:
+    path = "/sys/devices/system/cpu/cpu0/cache/index0/coherency_line_size"
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _from_sysctl() -> Optional[int]:
+    # macOS and BSDs
+    # ctypes.util imports subprocess, which is slow, so only import it if needed
+    import ctypes.util
+    path = ctypes.util.find_library("c")
+    if path is None:
+        return None
+    try:
+        libc = ctypes.CDLL(path)
+        value = ctypes.c_int64(0)
+        size = ctypes.c_size_t(ctypes.sizeof(value))
+        if libc.sysctlbyname(b"hw.cachelinesize", ctypes.byref(value), ctypes.byref(size), None, 0):
+            return None
+        return value.value
+    except (OSError, AttributeError):
+        return None
+
+
+def _detect() -> int:
+    for probe in (_from_sysconf, _from_sysfs, _from_sysctl):
+        size = probe()
+        # only trust sensible powers of 2
+        if size and size > 0 and (size & (size - 1)) == 0 and size <= 4096:
+            return size
+    return _DEFAULT_LINE_SIZE
+
+
+def cache_line_size() -> int:
+    global _line_size
+    if _line_size is None:
+        _line_size = _detect()
+    return _line_size
+
+
+def aligned_buffer(size: int) -> memoryview:
+    # private zeroed memory starting on a cache line
+    line = cache_line_size()
+    raw = bytearray(size + line)
+    address = ctypes.addressof((ctypes.c_char * len(raw)).from_buffer(raw))
+    offset = -address % line
+    return memoryview(raw)[offset:(offset + size)]
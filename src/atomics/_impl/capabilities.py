@@ -0,0 +1,79 @@
+from .alignment import Alignment
+from .backend import always_lock_free
+from .enums import OpType
+from .implementation import KINDS, available_impls
+from .patomic import Patomic
+
+from ctypes import c_void_p, cast
+from typing import Dict, Optional, Tuple
+
+
+# widths of every native integer type, plus double width cmpxchg
+_DEFAULT_MAX_WIDTH = 16
+
+
+class WidthCapabilities:
+
+    def __init__(self, width: int, ops_supported: Tuple[OpType, ...], alignment: Optional[Alignment],
+                 bltn_lock_free: Optional[bool], kinds: Tuple[str, ...]):
+        self.width: int = width
+        # for writable integral objects (BYTES objects lack the arithmetic ops)
+        self.ops_supported: Tuple[OpType, ...] = ops_supported
+        # None if the width is not supported
+        self.alignment: Optional[Alignment] = alignment
+        # whether the ops are lock-free, only known if every op is provided by the
+        # bltn kind (see _bltn_lock_free); None if not known
+        self.bltn_lock_free: Optional[bool] = bltn_lock_free
+        # names of the patomic implementation kinds providing ops for this width
+        self.kinds: Tuple[str, ...] = kinds
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(width={self.width}, " \
+               f"ops_supported={len(self.ops_supported)}, bltn_lock_free={self.bltn_lock_free}, " \
+               f"kinds={self.kinds})"
+
+    @property
+    def supported(self) -> bool:
+        return bool(self.ops_supported)
+
+
+def _op_kinds(width: int) -> Dict[OpType, str]:
+    # name of the kind providing each op patomic combines from every kind, found
+    # by matching function pointers with the ops each kind provides alone
+    by_address = {}
+    for name, kind in reversed(KINDS):
+        for fp in Patomic.op_funcs(Patomic.ops(width, kind), is_signed=False).values():
+            by_address[cast(fp, c_void_p).value] = name
+    return {ot: by_address.get(cast(fp, c_void_p).value)
+            for ot, fp in Patomic.op_funcs(Patomic.ops(width), is_signed=False).items()}
+
+
+def _bltn_lock_free(width: int) -> Optional[bool]:
+    # the bltn kind is made of the compiler's __atomic builtins, so is lock-free
+    # if __atomic_always_lock_free is true, as reported by the compiler that built
+    # the native extension; nothing is known about the other kinds (or without it)
+    if any(name != "bltn" for name in _op_kinds(width).values()):
+        return None
+    return always_lock_free(width)
+
+
+def _width_capabilities(width: int) -> WidthCapabilities:
+    p = Patomic()
+    if p.nonnull_ops_count(width, readonly=False) == 0:
+        return WidthCapabilities(width, (), None, None, ())
+    ops = p.ops(width)
+    ops_supported = tuple(sorted(Patomic.op_funcs(ops, is_signed=False)))
+    # the table's entries are shared anyway, so can hold the shared Alignment
+    return WidthCapabilities(width, ops_supported, Alignment._shared(width),
+                             _bltn_lock_free(width), available_impls(width))
+
+
+def capabilities(max_width: int = _DEFAULT_MAX_WIDTH) -> Dict[int, WidthCapabilities]:
+    # entries for every width from 1 to max_width, built once per process
+    # (entries are shared between calls, so should not be modified)
+    if not isinstance(max_width, int):
+        raise TypeError("Argument 'max_width' must have type 'int'.")
+    if max_width <= 0:
+        raise ValueError("Argument 'max_width' must be positive.")
+    return {width: Patomic._cached(("capabilities", width), lambda: _width_capabilities(width))
+            for width in range(1, max_width + 1)}
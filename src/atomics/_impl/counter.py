@@ -0,0 +1,149 @@
+import itertools
+import os
+import threading
+
+from .atomic.array import AtomicIntArray
+from .cacheline import aligned_buffer, cache_line_size
+from .enums import MemoryOrder, OpType
+from .exceptions import UnsupportedOperationException
+
+from typing import Optional
+
+
+RLX = MemoryOrder.RELAXED
+
+# each thread is given a number the first time it touches any counter, which
+# picks its shard in every counter (modulo the number of shards)
+# numbering starts from the pid so threads in different processes sharing a
+# counter in shared memory are spread over the shards too
+
+
+def _thread_numbers():
+    return itertools.count(os.getpid())
+
+
+_numbers = _thread_numbers()
+# next() on a shared iterator isn't guaranteed to be atomic without the GIL
+_numbers_lock = threading.Lock()
+
+
+class _ThreadShard(threading.local):
+
+    def __init__(self):
+        with _numbers_lock:
+            self.number: int = next(_numbers)
+
+
+_thread = _ThreadShard()
+
+
+def _after_fork_in_child() -> None:
+    # the forking thread would otherwise keep using its parent's shard
+    # (the lock may have been held by another thread at the time of the fork)
+    global _numbers, _numbers_lock, _thread
+    _numbers = _thread_numbers()
+    _numbers_lock = threading.Lock()
+    _thread = _ThreadShard()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class ShardedCounter:
+
+    def __init__(self, shards: Optional[int] = None, *, buffer=None, width: int = 8):
+        # check if object has been initialised
+        if hasattr(self, "_array"):
+            raise ValueError("ShardedCounter object cannot be re-initialised.")
+        if shards is None:
+            if buffer is None:
+                shards = os.cpu_count() or 1
+            else:
+                # as many shards as fit in the buffer
+                with memoryview(buffer) as view:
+                    shards = view.nbytes // self.buffer_size(1, width=width)
+        if not isinstance(shards, int):
+            raise TypeError("Argument 'shards' must have type 'int'.")
+        if shards <= 0:
+            raise ValueError("Argument 'shards' must be positive.")
+        size = self.buffer_size(shards, width=width)
+        if buffer is None:
+            buffer = aligned_buffer(size)
+        else:
+            with memoryview(buffer) as view:
+                if view.nbytes < size:
+                    raise ValueError(f"Keyword argument 'buffer' must be at least {size} bytes long.")
+            buffer = memoryview(buffer).cast("B")[:size]
+        # every shard is on its own cache line(s), so shards never contend
+        array = AtomicIntArray(buffer=buffer, width=width, isolate=True)
+        for optype in (OpType.LOAD, OpType.ADD, OpType.EXCHANGE):
+            if optype not in array.ops_supported:
+                array.release()
+                raise UnsupportedOperationException(optype, width, readonly=array.readonly)
+        core = array._core
+        self._array: AtomicIntArray = array
+        self._core = core
+        self._shards: int = shards
+        self._add = core._table.add
+        self._addresses = tuple(core.address_of(i) for i in range(shards))
+
+    @staticmethod
+    def buffer_size(shards: int, *, width: int = 8) -> int:
+        line = cache_line_size()
+        return shards * (-(-width // line) * line)
+
+    def __enter__(self):
+        self._core._assert_not_released()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+    def __str__(self):
+        if not self._core:
+            return f"{self.__class__.__name__}(<released>)"
+        return f"{self.__class__.__name__}(value={self.value()}, shards={self._shards})"
+
+    def release(self) -> None:
+        if hasattr(self, "_array"):
+            self._array.release()
+
+    @property
+    def shards(self) -> int:
+        self._core._assert_not_released()
+        return self._shards
+
+    @property
+    def width(self) -> int:
+        return self._array.width
+
+    # writes are relaxed: only the total matters, and it is never read atomically
+
+    def add(self, value: int = 1) -> None:
+        self._core._assert_not_released()
+        self._add(self._addresses[_thread.number % self._shards], value, RLX)
+
+    def inc(self) -> None:
+        self._core._assert_not_released()
+        self._add(self._addresses[_thread.number % self._shards], 1, RLX)
+
+    def sub(self, value: int = 1) -> None:
+        self.add(-value)
+
+    def dec(self) -> None:
+        self.add(-1)
+
+    def value(self) -> int:
+        # not a snapshot; concurrent increments may or may not be included
+        return sum(self._array.load_many(range(self._shards), RLX))
+
+    def shard_values(self):
+        return self._array.load_many(range(self._shards), RLX)
+
+    def reset(self) -> int:
+        # exchanges every shard with 0, so no increment is lost or counted twice
+        return sum(self._array.exchange(i, 0, RLX) for i in range(self._shards))
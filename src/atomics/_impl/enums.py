@@ -11,14 +11,16 @@ class MemoryOrder(enum.IntEnum):
     ACQ_REL = 4
     SEQ_CST = 5
 
+    # these use _value_ rather than value, which is much slower to access
+
     def is_valid_store_order(self) -> bool:
-        return self.value not in (1, 2, 4)  # CONSUME, ACQUIRE, ACQ_REL
+        return self._value_ not in (1, 2, 4)  # CONSUME, ACQUIRE, ACQ_REL
 
     def is_valid_load_order(self) -> bool:
-        return self.value not in (3, 4)  # RELEASE, ACQ_REL
+        return self._value_ not in (3, 4)  # RELEASE, ACQ_REL
 
     def is_valid_fail_order(self, succ: "MemoryOrder") -> bool:
-        return (self.value <= succ.value) and self.is_valid_load_order()
+        return (self._value_ <= succ._value_) and self.is_valid_load_order()
 
 
 class OpType(enum.IntEnum):
@@ -79,3 +81,12 @@ class OpType(enum.IntEnum):
     FETCH_INC = enum.auto()
     FETCH_DEC = enum.auto()
     FETCH_NEG = enum.auto()
+
+
+class Backoff(enum.Enum):
+
+    # what update() does after each failed compare exchange, once max_spins is used up
+
+    NONE = enum.auto()         # retry immediately
+    YIELD = enum.auto()        # time.sleep(0), giving up the GIL and processor
+    EXPONENTIAL = enum.auto()  # sleep, doubling from 1us up to 1ms
@@ -0,0 +1,89 @@
+from .backend import get_op_table
+from .cacheline import aligned_buffer
+from .enums import MemoryOrder, OpType
+from .patomic import Patomic
+from .pybuffer import PyBuffer
+
+import time
+from typing import Optional, Tuple
+
+
+# patomic_kind_t: the kinds of implementation patomic can take ops from
+# an impl is selected by name; None lets patomic combine ops from every kind
+KINDS = (("dyn", 0x1), ("os", 0x2), ("lib", 0x4), ("bltn", 0x8), ("asm", 0x10))
+_KIND_BITS = dict(KINDS)
+
+# impl value which picks the result of fastest_impl(width)
+FASTEST = "fastest"
+
+# iterations per op per timing run, and timing runs (the best is used)
+_BENCH_NUMBER = 2000
+_BENCH_REPEAT = 3
+
+
+def available_impls(width: int) -> Tuple[str, ...]:
+    # names of the kinds providing any ops for width
+    return tuple(name for name, kind in KINDS
+                 if Patomic.nonnull_ops_count(width, readonly=False, kinds=kind))
+
+
+def impl_kinds(impl: Optional[str], width: int) -> int:
+    # patomic kinds mask to create ops with
+    if impl is None:
+        return 0
+    if not isinstance(impl, str):
+        raise TypeError("Keyword argument 'impl' must have type 'str' or be None.")
+    if impl == FASTEST:
+        impl = fastest_impl(width)
+        return 0 if impl is None else _KIND_BITS[impl]
+    try:
+        return _KIND_BITS[impl]
+    except KeyError:
+        names = ", ".join(repr(name) for name, _ in KINDS)
+        raise ValueError(f"Keyword argument 'impl' must be one of [{names}, {FASTEST!r}] "
+                         f"or None, not {impl!r}.") from None
+
+
+def _time_impl(width: int, kind: int) -> float:
+    # best time of a load, store, and exchange (the ops every impl is expected to
+    # have), on memory aligned as the impl recommends
+    ops = Patomic.ops(width, kind)
+    table = get_op_table(ops, width, is_integral=False, is_signed=False)
+    funcs = Patomic.op_funcs(ops, is_signed=False)
+    align = Patomic.alignment(width, kind).recommended
+    value = bytes(width)
+    order = MemoryOrder.SEQ_CST
+    with PyBuffer(aligned_buffer(width + align), writeable=True) as buf:
+        address = buf.address + (-buf.address % align)
+        calls = []
+        if OpType.LOAD in funcs:
+            calls.append(lambda: table.load(address, order))
+        if OpType.STORE in funcs:
+            calls.append(lambda: table.store(address, value, order))
+        if OpType.EXCHANGE in funcs:
+            calls.append(lambda: table.exchange(address, value, order))
+        if not calls:
+            return float("inf")
+        best = float("inf")
+        for _ in range(_BENCH_REPEAT):
+            start = time.perf_counter()
+            for call in calls:
+                for _ in range(_BENCH_NUMBER):
+                    call()
+            best = min(best, time.perf_counter() - start)
+        return best / len(calls)
+
+
+def _fastest_impl(width: int) -> Optional[str]:
+    timings = {name: _time_impl(width, _KIND_BITS[name]) for name in available_impls(width)}
+    if not timings:
+        return None
+    return min(timings, key=timings.get)
+
+
+def fastest_impl(width: int) -> Optional[str]:
+    # benchmarks every available impl for width on this machine (once per process),
+    # returning the fastest, or None if the width isn't supported
+    if not isinstance(width, int):
+        raise TypeError("Argument 'width' must have type 'int'.")
+    return Patomic._cached(("fastest_impl", width), lambda: _fastest_impl(width))
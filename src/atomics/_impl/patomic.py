@@ -1,122 +1,193 @@
-import pathlib
+import threading
 
 from ctypes import *
 
+from .enums import OpType
 
-_opsig_explicit_store_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int)
-_opsig_explicit_load_t = CFUNCTYPE(None, c_void_p, c_int, c_void_p)
-_opsig_explicit_exchange_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int, c_void_p)
-_opsig_explicit_cmpxchg_t = CFUNCTYPE(c_int, c_void_p, c_void_p, c_void_p, c_int, c_int)
-_opsig_explicit_test_t = CFUNCTYPE(c_int, c_void_p, c_int, c_int)
-_opsig_explicit_test_modify_t = CFUNCTYPE(c_int, c_void_p, c_int, c_int)
-_opsig_explicit_fetch_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int, c_void_p)
-_opsig_explicit_fetch_noarg_t = CFUNCTYPE(None, c_void_p, c_int, c_void_p)
-_opsig_explicit_void_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int)
-_opsig_explicit_void_noarg_t = CFUNCTYPE(None, c_void_p, c_int)
+from typing import Callable, Dict, Hashable, Set
 
 
-class _OpsExplicitArithmetic(Structure):
-    _fields_ = [("fp_add", _opsig_explicit_void_t),
-                ("fp_sub", _opsig_explicit_void_t),
-                ("fp_inc", _opsig_explicit_void_noarg_t),
-                ("fp_dec", _opsig_explicit_void_noarg_t),
-                ("fp_neg", _opsig_explicit_void_noarg_t),
-                ("fp_fetch_add", _opsig_explicit_fetch_t),
-                ("fp_fetch_sub", _opsig_explicit_fetch_t),
-                ("fp_fetch_inc", _opsig_explicit_fetch_noarg_t),
-                ("fp_fetch_dec", _opsig_explicit_fetch_noarg_t),
-                ("fp_fetch_neg", _opsig_explicit_fetch_noarg_t)]
+# ctypes types mirroring patomic's structs
+# they are only defined on first use (e.g. when the library is loaded), since
+# defining them all costs more than the rest of this module's import
+# Ops and Alignment are still importable from this module (see __getattr__)
 
+_types_lock = threading.Lock()
+_types_defined = False
 
-class _OpsExplicitBinary(Structure):
-    _fields_ = [("fp_or", _opsig_explicit_void_t),
-                ("fp_xor", _opsig_explicit_void_t),
-                ("fp_and", _opsig_explicit_void_t),
-                ("fp_not", _opsig_explicit_void_noarg_t),
-                ("fp_fetch_or", _opsig_explicit_fetch_t),
-                ("fp_fetch_xor", _opsig_explicit_fetch_t),
-                ("fp_fetch_and", _opsig_explicit_fetch_t),
-                ("fp_fetch_not", _opsig_explicit_fetch_noarg_t)]
 
+def _define_types() -> None:
+    global _types_defined
+    with _types_lock:
+        if _types_defined:
+            return
+        _define_types_locked()
+        _types_defined = True
 
-class _OpsExplicitBitwise(Structure):
-    _fields_ = [("fp_test", _opsig_explicit_test_t),
-                ("fp_test_compl", _opsig_explicit_test_modify_t),
-                ("fp_test_set", _opsig_explicit_test_modify_t),
-                ("fp_test_reset", _opsig_explicit_test_modify_t)]
 
+def _define_types_locked() -> None:
+    global Ops, Alignment, _PatomicExplicit
 
-class _OpsExplicitXchg(Structure):
-    _fields_ = [("fp_exchange", _opsig_explicit_exchange_t),
-                ("fp_cmpxchg_weak", _opsig_explicit_cmpxchg_t),
-                ("fp_cmpxchg_strong", _opsig_explicit_cmpxchg_t)]
+    _opsig_explicit_store_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int)
+    _opsig_explicit_load_t = CFUNCTYPE(None, c_void_p, c_int, c_void_p)
+    _opsig_explicit_exchange_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int, c_void_p)
+    _opsig_explicit_cmpxchg_t = CFUNCTYPE(c_int, c_void_p, c_void_p, c_void_p, c_int, c_int)
+    _opsig_explicit_test_t = CFUNCTYPE(c_int, c_void_p, c_int, c_int)
+    _opsig_explicit_test_modify_t = CFUNCTYPE(c_int, c_void_p, c_int, c_int)
+    _opsig_explicit_fetch_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int, c_void_p)
+    _opsig_explicit_fetch_noarg_t = CFUNCTYPE(None, c_void_p, c_int, c_void_p)
+    _opsig_explicit_void_t = CFUNCTYPE(None, c_void_p, c_void_p, c_int)
+    _opsig_explicit_void_noarg_t = CFUNCTYPE(None, c_void_p, c_int)
 
 
-class Ops(Structure):
-    _fields_ = [("fp_store", _opsig_explicit_store_t),
-                ("fp_load", _opsig_explicit_load_t),
-                ("xchg_ops", _OpsExplicitXchg),
-                ("bitwise_ops", _OpsExplicitBitwise),
-                ("binary_ops", _OpsExplicitBinary),
-                ("signed_ops", _OpsExplicitArithmetic),
-                ("unsigned_ops", _OpsExplicitArithmetic)]
+    class _OpsExplicitArithmetic(Structure):
+        _fields_ = [("fp_add", _opsig_explicit_void_t),
+                    ("fp_sub", _opsig_explicit_void_t),
+                    ("fp_inc", _opsig_explicit_void_noarg_t),
+                    ("fp_dec", _opsig_explicit_void_noarg_t),
+                    ("fp_neg", _opsig_explicit_void_noarg_t),
+                    ("fp_fetch_add", _opsig_explicit_fetch_t),
+                    ("fp_fetch_sub", _opsig_explicit_fetch_t),
+                    ("fp_fetch_inc", _opsig_explicit_fetch_noarg_t),
+                    ("fp_fetch_dec", _opsig_explicit_fetch_noarg_t),
+                    ("fp_fetch_neg", _opsig_explicit_fetch_noarg_t)]
 
 
-class Alignment(Structure):
-    _fields_ = [("recommended", c_size_t),
-                ("minimum", c_size_t),
-                ("size_within", c_size_t)]
+    class _OpsExplicitBinary(Structure):
+        _fields_ = [("fp_or", _opsig_explicit_void_t),
+                    ("fp_xor", _opsig_explicit_void_t),
+                    ("fp_and", _opsig_explicit_void_t),
+                    ("fp_not", _opsig_explicit_void_noarg_t),
+                    ("fp_fetch_or", _opsig_explicit_fetch_t),
+                    ("fp_fetch_xor", _opsig_explicit_fetch_t),
+                    ("fp_fetch_and", _opsig_explicit_fetch_t),
+                    ("fp_fetch_not", _opsig_explicit_fetch_noarg_t)]
 
 
-class Patomic:
+    class _OpsExplicitBitwise(Structure):
+        _fields_ = [("fp_test", _opsig_explicit_test_t),
+                    ("fp_test_compl", _opsig_explicit_test_modify_t),
+                    ("fp_test_set", _opsig_explicit_test_modify_t),
+                    ("fp_test_reset", _opsig_explicit_test_modify_t)]
+
+
+    class _OpsExplicitXchg(Structure):
+        _fields_ = [("fp_exchange", _opsig_explicit_exchange_t),
+                    ("fp_cmpxchg_weak", _opsig_explicit_cmpxchg_t),
+                    ("fp_cmpxchg_strong", _opsig_explicit_cmpxchg_t)]
+
+
+    class Ops(Structure):
+        _fields_ = [("fp_store", _opsig_explicit_store_t),
+                    ("fp_load", _opsig_explicit_load_t),
+                    ("xchg_ops", _OpsExplicitXchg),
+                    ("bitwise_ops", _OpsExplicitBitwise),
+                    ("binary_ops", _OpsExplicitBinary),
+                    ("signed_ops", _OpsExplicitArithmetic),
+                    ("unsigned_ops", _OpsExplicitArithmetic)]
+
+
+    class Alignment(Structure):
+        _fields_ = [("recommended", c_size_t),
+                    ("minimum", c_size_t),
+                    ("size_within", c_size_t)]
 
     class _PatomicExplicit(Structure):
         _fields_ = [("ops", Ops),
                     ("align", Alignment)]
 
+
+def __getattr__(name: str):
+    if name in ("Ops", "Alignment"):
+        _define_types()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class Patomic:
+
     _lib = None
+    _lib_lock = threading.Lock()
+
+    # process-wide memo of everything derived from patomic_create_explicit
+    # keys are tuples whose first element names the kind of entry
+    _cache: Dict[Hashable, object] = {}
+    _cache_lock = threading.RLock()
+    _cached_ops_addresses: Set[int] = set()
 
     @staticmethod
     def _get_lib():
         if Patomic._lib is None:
-            # get lib path
-            path = pathlib.Path(__file__).parent.parent.resolve()
-            path = path.joinpath("_clib")
-            possible_paths = sorted(path.glob("*patomic*"))
-            if not possible_paths:
-                raise FileNotFoundError("Could not find patomic lib in atomics._clib")
-            path = possible_paths[-1]
-            # setup lib
-            lib = cdll.LoadLibrary(str(path))
-            lib.patomic_create_explicit.restype = Patomic._PatomicExplicit
-            lib.patomic_create_explicit.argtypes = [c_size_t, c_int, c_int]
-            lib.patomic_nonnull_ops_count_explicit.restype = c_int
-            lib.patomic_nonnull_ops_count_explicit.argtypes = [POINTER(Ops)]
-            # assign to static member
-            Patomic._lib = lib
+            with Patomic._lib_lock:
+                if Patomic._lib is None:
+                    Patomic._lib = Patomic._load_lib()
         return Patomic._lib
 
     @staticmethod
-    def _create_explicit(width: int) -> _PatomicExplicit:
+    def _load_lib():
+        import pathlib
+        _define_types()
+        # get lib path
+        path = pathlib.Path(__file__).parent.parent.resolve()
+        path = path.joinpath("_clib")
+        possible_paths = sorted(path.glob("*patomic*"))
+        if not possible_paths:
+            raise FileNotFoundError("Could not find patomic lib in atomics._clib")
+        path = possible_paths[-1]
+        # setup lib
+        lib = cdll.LoadLibrary(str(path))
+        lib.patomic_create_explicit.restype = _PatomicExplicit
+        lib.patomic_create_explicit.argtypes = [c_size_t, c_int, c_int]
+        lib.patomic_nonnull_ops_count_explicit.restype = c_int
+        lib.patomic_nonnull_ops_count_explicit.argtypes = [POINTER(Ops)]
+        # only assigned to the static member once fully set up, since other
+        # threads read it without the lock
+        return lib
+
+    @staticmethod
+    def _cached(key: Hashable, factory: Callable[[], object]):
+        # fast path: no lock needed to read an existing entry
+        try:
+            return Patomic._cache[key]
+        except KeyError:
+            pass
+        # slow path: factory may itself call _cached (hence RLock)
+        with Patomic._cache_lock:
+            if key not in Patomic._cache:
+                Patomic._cache[key] = factory()
+            return Patomic._cache[key]
+
+    @staticmethod
+    def _create_explicit(width: int, options: int = 0, kinds: int = 0) -> "_PatomicExplicit":
         char_bit = 8
         if width < 0:
             raise ValueError("Negative width")
         elif width.bit_length() > (sizeof(c_size_t) * char_bit):
             raise OverflowError(width, "Value would overflow size_t")
-        return Patomic._get_lib().patomic_create_explicit(width, 0, 0)
+        # result is never modified or freed, so it is safe to share between callers
+        key = ("explicit", width, options, kinds)
+        return Patomic._cached(key, lambda: Patomic._new_explicit(width, options, kinds))
 
     @staticmethod
-    def ops(width: int) -> Ops:
-        pae = Patomic._create_explicit(width)
+    def _new_explicit(width: int, options: int, kinds: int) -> "_PatomicExplicit":
+        pae = Patomic._get_lib().patomic_create_explicit(width, options, kinds)
+        Patomic._cached_ops_addresses.add(addressof(pae.ops))
+        return pae
+
+    # kinds is a mask of patomic_kind_t values to take ops from (0 for any)
+
+    @staticmethod
+    def ops(width: int, kinds: int = 0) -> "Ops":
+        pae = Patomic._create_explicit(width, 0, kinds)
         return pae.ops
 
     @staticmethod
-    def alignment(width: int) -> Alignment:
-        pae = Patomic._create_explicit(width)
+    def alignment(width: int, kinds: int = 0) -> "Alignment":
+        pae = Patomic._create_explicit(width, 0, kinds)
         return pae.align
 
     @staticmethod
-    def count_nonnull_ops(ops: Ops, *, readonly: bool) -> int:
+    def count_nonnull_ops(ops: "Ops", *, readonly: bool) -> int:
         res = 0
         if readonly:
             # only current non-modifying ops
@@ -125,3 +196,37 @@ class Patomic:
         else:
             res = Patomic._get_lib().patomic_nonnull_ops_count_explicit(byref(ops))
         return res
+
+    @staticmethod
+    def nonnull_ops_count(width: int, *, readonly: bool, kinds: int = 0) -> int:
+        key = ("count", width, readonly, kinds)
+        return Patomic._cached(key, lambda: Patomic.count_nonnull_ops(Patomic.ops(width, kinds),
+                                                                      readonly=readonly))
+
+    @staticmethod
+    def _resolve_op_funcs(ops: "Ops", *, is_signed: bool) -> Dict[OpType, Callable]:
+        ots: Dict[OpType, Callable] = {}
+        s_type = "signed" if is_signed else "unsigned"
+        for ot in OpType:
+            # get op category (e.g. ops for load, ops.xchg_ops for exchange, etc...)
+            cat = ops
+            if ot.cname is not None:
+                cat = getattr(cat, ot.cname.replace("arithmetic", s_type))
+            # get op function pointer and keep it if supported (i.e. not NULL)
+            fp = getattr(cat, ot.fname)
+            if fp:
+                ots[ot] = fp
+        return ots
+
+    @staticmethod
+    def is_cached_ops(ops: "Ops") -> bool:
+        # only ops obtained from the cache have a stable address to key on
+        return addressof(ops) in Patomic._cached_ops_addresses
+
+    @staticmethod
+    def op_funcs(ops: "Ops", *, is_signed: bool) -> Dict[OpType, Callable]:
+        if not Patomic.is_cached_ops(ops):
+            return Patomic._resolve_op_funcs(ops, is_signed=is_signed)
+        # returned dict is shared; callers must not modify it
+        key = ("funcs", addressof(ops), is_signed)
+        return Patomic._cached(key, lambda: Patomic._resolve_op_funcs(ops, is_signed=is_signed))
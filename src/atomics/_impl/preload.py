@@ -0,0 +1,31 @@
+from .alignment import Alignment
+from .backend import get_op_table
+from .patomic import Patomic
+from .pybuffer import load_buffer_api
+
+from typing import Iterable
+
+
+# widths of every native integer type, plus double width cmpxchg
+_DEFAULT_WIDTHS = (1, 2, 4, 8, 16)
+
+
+def preload(widths: Iterable[int] = _DEFAULT_WIDTHS) -> None:
+    # does everything that is otherwise done lazily on first use, so the cost
+    # (and any error, e.g. a missing or broken patomic library) happens now
+    # calling this before forking workers means none of them pay for it
+    load_buffer_api()
+    p = Patomic()
+    p._get_lib()
+    for width in widths:
+        if not isinstance(width, int):
+            raise TypeError("Argument 'widths' must only contain values of type 'int'.")
+        # unsupported widths are not an error, there is just nothing to cache
+        if p.nonnull_ops_count(width, readonly=False) == 0:
+            continue
+        Alignment._shared(width)
+        ops = p.ops(width)
+        for is_signed in (False, True):
+            Patomic.op_funcs(ops, is_signed=is_signed)
+            get_op_table(ops, width, is_integral=True, is_signed=is_signed)
+        get_op_table(ops, width, is_integral=False, is_signed=False)
@@ -1,7 +1,69 @@
-import cffi
+import ctypes
+import threading
 
 
-ffi = cffi.FFI()
+# a buffer is pinned by calling PyObject_GetBuffer (through ctypes.pythonapi),
+# which is how C extensions do it, and gives the address with no extra objects
+# implementations without the C API (i.e. PyPy) fall back to cffi, which is only
+# imported in that case
+
+_PyBUF_SIMPLE = 0
+_PyBUF_WRITABLE = 0x0001
+
+
+class _Py_buffer(ctypes.Structure):
+    # layout is unchanged since Python 3.3
+    _fields_ = [("buf", ctypes.c_void_p),
+                ("obj", ctypes.c_void_p),
+                ("len", ctypes.c_ssize_t),
+                ("itemsize", ctypes.c_ssize_t),
+                ("readonly", ctypes.c_int),
+                ("ndim", ctypes.c_int),
+                ("format", ctypes.c_char_p),
+                ("shape", ctypes.c_void_p),
+                ("strides", ctypes.c_void_p),
+                ("suboffsets", ctypes.c_void_p),
+                ("internal", ctypes.c_void_p)]
+
+
+def _load_capi():
+    try:
+        get_buffer = ctypes.pythonapi.PyObject_GetBuffer
+        release_buffer = ctypes.pythonapi.PyBuffer_Release
+    except AttributeError:
+        return None
+    get_buffer.argtypes = [ctypes.py_object, ctypes.POINTER(_Py_buffer), ctypes.c_int]
+    get_buffer.restype = ctypes.c_int
+    release_buffer.argtypes = [ctypes.POINTER(_Py_buffer)]
+    release_buffer.restype = None
+    return get_buffer, release_buffer
+
+
+_capi = _load_capi()
+
+# cffi (and the pycparser it imports) is slow to import, so is only loaded on
+# first use; preload() loads it up front
+_ffi = None
+
+
+def get_ffi():
+    global _ffi
+    if _ffi is None:
+        import cffi
+        _ffi = cffi.FFI()
+    return _ffi
+
+
+def load_buffer_api() -> None:
+    # cffi is only needed without the C API
+    if _capi is None:
+        get_ffi()
+
+
+# releasing a buffer twice is undefined behaviour, so the check and clear of _buf
+# must be atomic (without a GIL, two threads could otherwise both see it set)
+# reentrant since release() can be called from __del__ during a garbage collection
+_release_lock = threading.RLock()
 
 
 class PyBuffer:
@@ -10,12 +72,29 @@ class PyBuffer:
         # check if __init__ has been called
         if hasattr(self, "_buf"):
             raise ValueError("PyBuffer object cannot be re-initialised.")
-        # check if writeable can be satisfied
+        if _capi is None:
+            self._init_cffi(exporter, writeable=writeable, force=force)
+            return
+        # get and save buffer (raises TypeError if exporter isn't a buffer, and
+        # BufferError if it isn't contiguous)
+        view = _Py_buffer()
+        _capi[0](exporter, view, _PyBUF_SIMPLE)
+        if writeable and view.readonly and not force:
+            _capi[1](view)
+            raise RuntimeError("Cannot create writeable PyBuffer from readonly exporter.")
+        self._buf = view
+        self._address: int = view.buf or 0
+        self._obj = exporter
+        self._len = view.len
+        self._readonly = not writeable
+
+    def _init_cffi(self, exporter, *, writeable: bool, force: bool) -> None:
         with memoryview(exporter) as view:
             if writeable and view.readonly and not force:
                 raise RuntimeError("Cannot create writeable PyBuffer from readonly exporter.")
-            # get and save buffer
+            ffi = get_ffi()
             self._buf = ffi.from_buffer("char[]", exporter, not view.readonly)
+            self._address = int(ffi.cast("uintptr_t", self._buf))
             self._obj = exporter
             self._len = view.nbytes
             self._readonly = not writeable
@@ -43,10 +122,17 @@ class PyBuffer:
     def release(self) -> None:
         # this may be called in __del__ if exception is raised in __init__
         # we cannot rely on any attributes existing
-        if hasattr(self, "_buf") and self._buf is not None:
+        if not hasattr(self, "_buf"):
+            return
+        with _release_lock:
+            buf, self._buf = self._buf, None
+        if buf is not None:
             # if _buf exists, we can be confident the rest of the attributes do too
-            ffi.release(self._buf)
-            self._buf = None
+            if _capi is None:
+                _ffi.release(buf)
+            else:
+                _capi[1](buf)
+            self._address = None
             self._obj = None
             self._len = None
             self._readonly = None
@@ -63,7 +149,7 @@ class PyBuffer:
     @property
     def address(self) -> int:
         self._assert_not_released()
-        return int(ffi.cast("uintptr_t", self._buf))
+        return self._address
 
     @property
     def width(self) -> int:
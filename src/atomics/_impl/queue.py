@@ -0,0 +1,484 @@
+import struct
+from abc import ABC, abstractmethod
+
+from .alignment import Alignment
+from .backend import get_op_table
+from .cacheline import cache_line_size
+from .enums import MemoryOrder, OpType
+from .exceptions import AlignmentError, UnsupportedOperationException, UnsupportedWidthException
+from .patomic import Patomic
+from .pybuffer import PyBuffer
+
+from typing import List, Optional, Tuple
+
+
+# bounded ring buffers of fixed size records, living entirely inside a buffer, so
+# they can be shared between processes (e.g. through shared memory)
+#
+# layout (line is the cache line size of the creating process):
+# [0, line): header (magic, capacity, record size, line)
+# [line, 2 * line): atomic uint64 head/dequeue position (consumer side)
+# [2 * line, 3 * line): atomic uint64 tail/enqueue position (producer side)
+# [3 * line, ...): capacity slots
+#
+# SPSC slots are just records; MPMC slots are an atomic uint64 sequence number
+# followed by the record (Vyukov's bounded MPMC queue)
+# positions only ever increase, so never wrap in practice
+
+_HEADER = struct.Struct("=8sQQQ")
+_INDEX_WIDTH = 8
+
+RLX = MemoryOrder.RELAXED
+ACQ = MemoryOrder.ACQUIRE
+REL = MemoryOrder.RELEASE
+
+
+def _align_up(value: int, alignment: int) -> int:
+    return -(-value // alignment) * alignment
+
+
+def _index_table():
+    # op table for the uint64 positions and sequence numbers
+    p = Patomic()
+    if p.nonnull_ops_count(_INDEX_WIDTH, readonly=False) == 0:
+        raise UnsupportedWidthException(_INDEX_WIDTH, readonly=False)
+    ops = p.ops(_INDEX_WIDTH)
+    funcs = Patomic.op_funcs(ops, is_signed=False)
+    for optype in (OpType.LOAD, OpType.STORE, OpType.CMPXCHG_WEAK):
+        if optype not in funcs:
+            raise UnsupportedOperationException(optype, _INDEX_WIDTH, readonly=False)
+    return get_op_table(ops, _INDEX_WIDTH, is_integral=True, is_signed=False)
+
+
+def _records_view(records, record_size: int) -> memoryview:
+    # contiguous buffer of whole records, or a sequence of records
+    try:
+        view = memoryview(records)
+    except TypeError:
+        view = memoryview(b"".join(records))
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    if len(view) % record_size != 0:
+        raise ValueError("'records' length must be a multiple of 'record_size'.")
+    return view
+
+
+class _RingBuffer(ABC):
+
+    # shared by SPSCQueue and MPMCQueue, which implement the abstract methods
+
+    _MAGIC: bytes
+
+    def __init__(self, buffer, capacity: Optional[int] = None, record_size: Optional[int] = None,
+                 *, create: bool = False):
+        # check if object has been initialised
+        if hasattr(self, "_pybuf"):
+            raise ValueError(f"{self.__class__.__name__} object cannot be re-initialised.")
+        self._table = _index_table()
+        pybuf = PyBuffer(buffer, writeable=True)
+        view = None
+        try:
+            if create:
+                capacity, record_size, line = self._check_create_args(capacity, record_size)
+            else:
+                capacity, record_size, line = self._read_header(buffer)
+            slot_offset, slot_stride, size = self._layout(capacity, record_size, line)
+            if pybuf.width < size:
+                raise ValueError(f"Positional argument 'buffer' must be at least {size} bytes long.")
+            if not Alignment._shared(_INDEX_WIDTH)._is_valid_address(pybuf.address, using_recommended=True):
+                raise AlignmentError(_INDEX_WIDTH, pybuf.address, using_recommended=True)
+            view = memoryview(buffer).cast("B")
+        except BaseException:
+            # pybuf MUST be released before function exit
+            if view is not None:
+                view.release()
+            pybuf.release()
+            raise
+        self._pybuf: PyBuffer = pybuf
+        self._view: memoryview = view
+        self._capacity: int = capacity
+        self._mask: int = capacity - 1
+        self._record_size: int = record_size
+        self._slot_offset: int = slot_offset
+        self._slot_stride: int = slot_stride
+        self._head: int = pybuf.address + line
+        self._tail: int = pybuf.address + (2 * line)
+        self._base: int = pybuf.address
+        if create:
+            self._initialise(line)
+
+    @classmethod
+    def _check_create_args(cls, capacity, record_size) -> Tuple[int, int, int]:
+        if not isinstance(capacity, int) or not isinstance(record_size, int):
+            raise TypeError("Arguments 'capacity' and 'record_size' must have type 'int' when creating.")
+        if capacity <= 0 or (capacity & (capacity - 1)) != 0:
+            raise ValueError("Argument 'capacity' must be a power of 2.")
+        if record_size <= 0:
+            raise ValueError("Argument 'record_size' must be positive.")
+        return capacity, record_size, max(cache_line_size(), _HEADER.size)
+
+    @classmethod
+    def _read_header(cls, buffer) -> Tuple[int, int, int]:
+        # the header may have been written by anything, so every field is checked
+        # before it is used to compute addresses
+        with memoryview(buffer) as view:
+            nbytes = view.nbytes
+            if nbytes < _HEADER.size:
+                raise ValueError(f"Positional argument 'buffer' does not hold a {cls.__name__}.")
+            magic, capacity, record_size, line = _HEADER.unpack_from(view.cast("B"))
+        if magic != cls._MAGIC:
+            raise ValueError(f"Positional argument 'buffer' does not hold a {cls.__name__}.")
+        if capacity <= 0 or (capacity & (capacity - 1)) != 0:
+            raise ValueError(f"{cls.__name__} header has a 'capacity' which is not a power of 2.")
+        if record_size <= 0:
+            raise ValueError(f"{cls.__name__} header has a 'record_size' which is not positive.")
+        # the header fits in the first line, and the indices are aligned on the next two
+        if line < _HEADER.size or (line & (line - 1)) != 0:
+            raise ValueError(f"{cls.__name__} header has a 'line' which is not a power of 2 "
+                             f"of at least {_HEADER.size}.")
+        size = cls._layout(capacity, record_size, line)[2]
+        if nbytes < size:
+            raise ValueError(f"Positional argument 'buffer' must be at least {size} bytes long "
+                             f"for its {cls.__name__} header.")
+        return capacity, record_size, line
+
+    @classmethod
+    @abstractmethod
+    def _slot_layout(cls, record_size: int) -> Tuple[int, int]:
+        # (offset of the record within a slot, slot stride)
+        ...
+
+    @classmethod
+    def _layout(cls, capacity: int, record_size: int, line: int) -> Tuple[int, int, int]:
+        # (offset of the first slot, slot stride, total size)
+        _, stride = cls._slot_layout(record_size)
+        return 3 * line, stride, (3 * line) + (capacity * stride)
+
+    @classmethod
+    def buffer_size(cls, capacity: int, record_size: int) -> int:
+        capacity, record_size, line = cls._check_create_args(capacity, record_size)
+        return cls._layout(capacity, record_size, line)[2]
+
+    def _initialise(self, line: int) -> None:
+        self._table.store(self._head, 0, RLX)
+        self._table.store(self._tail, 0, RLX)
+        # magic is written last, so a half initialised buffer is never recognised
+        _HEADER.pack_into(self._view, 0, b"\0" * 8, self._capacity, self._record_size, line)
+        self._view[:8] = self._MAGIC
+
+    def __enter__(self):
+        self._assert_not_released()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+    def __len__(self) -> int:
+        # only a snapshot if other threads or processes are using the queue
+        self._assert_not_released()
+        tail = self._table.load(self._tail, ACQ)
+        head = self._table.load(self._head, ACQ)
+        return max(0, min(tail - head, self._capacity))
+
+    def __str__(self):
+        if hasattr(self, "_pybuf") and self._pybuf:
+            return f"{self.__class__.__name__}(capacity={self._capacity}, " \
+                   f"record_size={self._record_size}, len={len(self)})"
+        return f"{self.__class__.__name__}(released)"
+
+    def release(self) -> None:
+        # this may be called in __del__ if exception is raised in __init__
+        if hasattr(self, "_pybuf"):
+            self._view.release()
+            self._pybuf.release()
+
+    def _assert_not_released(self) -> None:
+        if not self._pybuf:
+            msg = f"Operation forbidden on released {self.__class__.__name__} object."
+            raise ValueError(msg)
+
+    @property
+    def capacity(self) -> int:
+        self._assert_not_released()
+        return self._capacity
+
+    @property
+    def record_size(self) -> int:
+        self._assert_not_released()
+        return self._record_size
+
+    @abstractmethod
+    def push_many(self, records) -> int:
+        # pushes as many records as fit, in order, returning how many were pushed
+        ...
+
+    @abstractmethod
+    def pop_many_into(self, out) -> int:
+        # pops as many records as fit in out, returning how many were popped
+        ...
+
+    def _check_record(self, name: str, record) -> None:
+        if len(record) != self._record_size:
+            raise ValueError(f"'{name}' object length does not match 'record_size'.")
+
+    @abstractmethod
+    def _push_position(self) -> Optional[int]:
+        # claims one slot to write to, or returns None if the queue is full
+        ...
+
+    @abstractmethod
+    def _pushed(self, position: int) -> None:
+        ...
+
+    @abstractmethod
+    def _pop_position(self) -> Optional[int]:
+        # claims one slot to read from, or returns None if the queue is empty
+        ...
+
+    @abstractmethod
+    def _popped(self, position: int) -> None:
+        ...
+
+    @abstractmethod
+    def _record_offset(self, position: int) -> int:
+        ...
+
+    # single records skip the batch machinery, since most of their cost is overhead
+
+    def push(self, record) -> bool:
+        # returns False if the queue is full
+        self._assert_not_released()
+        self._check_record("record", record)
+        position = self._push_position()
+        if position is None:
+            return False
+        start = self._record_offset(position)
+        self._view[start:start + self._record_size] = record
+        self._pushed(position)
+        return True
+
+    def pop(self) -> Optional[bytes]:
+        # returns None if the queue is empty
+        self._assert_not_released()
+        position = self._pop_position()
+        if position is None:
+            return None
+        start = self._record_offset(position)
+        record = self._view[start:start + self._record_size].tobytes()
+        self._popped(position)
+        return record
+
+    def pop_into(self, out) -> bool:
+        # returns False if the queue is empty
+        self._assert_not_released()
+        self._check_record("out", out)
+        position = self._pop_position()
+        if position is None:
+            return False
+        start = self._record_offset(position)
+        out[:] = self._view[start:start + self._record_size]
+        self._popped(position)
+        return True
+
+    def pop_many(self, max_count: int) -> List[bytes]:
+        out = bytearray(max_count * self._record_size)
+        count = self.pop_many_into(out)
+        rs = self._record_size
+        return [bytes(out[i * rs:(i + 1) * rs]) for i in range(count)]
+
+    def _out_view(self, out) -> Tuple[memoryview, int]:
+        view = memoryview(out)
+        if view.readonly:
+            view.release()
+            raise BufferError("'out' object is not writable.")
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        return view, len(view) // self._record_size
+
+
+class SPSCQueue(_RingBuffer):
+
+    # only one thread (in one process) may push, and one may pop, at a time
+
+    _MAGIC = b"atomqsps"
+
+    def __init__(self, buffer, capacity: Optional[int] = None, record_size: Optional[int] = None,
+                 *, create: bool = False):
+        super().__init__(buffer, capacity, record_size, create=create)
+        # each side caches the other side's position, and only re-reads it when
+        # the queue looks full (or empty), to avoid sharing cache lines
+        self._head_cache: int = 0
+        self._tail_cache: int = 0
+
+    @classmethod
+    def _slot_layout(cls, record_size: int) -> Tuple[int, int]:
+        return 0, record_size
+
+    def _record_offset(self, position: int) -> int:
+        return self._slot_offset + ((position & self._mask) * self._record_size)
+
+    def _push_position(self) -> Optional[int]:
+        tail = self._table.load(self._tail, RLX)
+        if tail - self._head_cache >= self._capacity:
+            self._head_cache = self._table.load(self._head, ACQ)
+            if tail - self._head_cache >= self._capacity:
+                return None
+        return tail
+
+    def _pushed(self, position: int) -> None:
+        self._table.store(self._tail, position + 1, REL)
+
+    def _pop_position(self) -> Optional[int]:
+        head = self._table.load(self._head, RLX)
+        if self._tail_cache <= head:
+            self._tail_cache = self._table.load(self._tail, ACQ)
+            if self._tail_cache <= head:
+                return None
+        return head
+
+    def _popped(self, position: int) -> None:
+        self._table.store(self._head, position + 1, REL)
+
+    def _copy_in(self, position: int, src: memoryview, count: int) -> None:
+        rs = self._record_size
+        i = position & self._mask
+        first = min(count, self._capacity - i)
+        start = self._slot_offset + (i * rs)
+        self._view[start:start + (first * rs)] = src[:first * rs]
+        if count > first:
+            start = self._slot_offset
+            self._view[start:start + ((count - first) * rs)] = src[first * rs:count * rs]
+
+    def _copy_out(self, position: int, dst: memoryview, count: int) -> None:
+        rs = self._record_size
+        i = position & self._mask
+        first = min(count, self._capacity - i)
+        start = self._slot_offset + (i * rs)
+        dst[:first * rs] = self._view[start:start + (first * rs)]
+        if count > first:
+            start = self._slot_offset
+            dst[first * rs:count * rs] = self._view[start:start + ((count - first) * rs)]
+
+    def push_many(self, records) -> int:
+        # pushes as many records as fit, returning the number pushed
+        self._assert_not_released()
+        src = _records_view(records, self._record_size)
+        count = len(src) // self._record_size
+        table = self._table
+        tail = table.load(self._tail, RLX)
+        if (tail - self._head_cache) + count > self._capacity:
+            self._head_cache = table.load(self._head, ACQ)
+        count = min(count, self._capacity - (tail - self._head_cache))
+        if count <= 0:
+            return 0
+        self._copy_in(tail, src, count)
+        table.store(self._tail, tail + count, REL)
+        return count
+
+    def pop_many_into(self, out) -> int:
+        # pops up to len(out) // record_size records into out, returning the number popped
+        self._assert_not_released()
+        dst, count = self._out_view(out)
+        with dst:
+            table = self._table
+            head = table.load(self._head, RLX)
+            if self._tail_cache - head < count:
+                self._tail_cache = table.load(self._tail, ACQ)
+            count = min(count, self._tail_cache - head)
+            if count <= 0:
+                return 0
+            self._copy_out(head, dst, count)
+        table.store(self._head, head + count, REL)
+        return count
+
+
+class MPMCQueue(_RingBuffer):
+
+    # any number of threads and processes may push and pop concurrently
+    # batches claim consecutive slots with a single compare exchange
+
+    _MAGIC = b"atomqmpm"
+
+    @classmethod
+    def _slot_layout(cls, record_size: int) -> Tuple[int, int]:
+        return _INDEX_WIDTH, _align_up(_INDEX_WIDTH + record_size, _INDEX_WIDTH)
+
+    def _initialise(self, line: int) -> None:
+        for i in range(self._capacity):
+            self._table.store(self._seq_address(i), i, RLX)
+        super()._initialise(line)
+
+    def _seq_address(self, position: int) -> int:
+        return self._base + self._slot_offset + ((position & self._mask) * self._slot_stride)
+
+    def _record_offset(self, position: int) -> int:
+        return self._slot_offset + ((position & self._mask) * self._slot_stride) + _INDEX_WIDTH
+
+    def _claim(self, address: int, count: int, lag: int) -> Tuple[int, int]:
+        # claims up to count consecutive slots whose sequence number is position + lag
+        # returns (first position, number claimed), claiming nothing if none are ready
+        table = self._table
+        position = table.load(address, RLX)
+        if count <= 0:
+            return position, 0
+        while True:
+            claimed = 0
+            seq = position + lag
+            while claimed < count:
+                seq = table.load(self._seq_address(position + claimed), ACQ)
+                if seq != position + claimed + lag:
+                    break
+                claimed += 1
+            if claimed == 0:
+                if seq < position + lag:
+                    # full (or empty)
+                    return position, 0
+                # another thread claimed this slot first
+                position = table.load(address, RLX)
+                continue
+            ok, current = table.cmpxchg_weak(address, position, position + claimed, RLX, RLX)
+            if ok:
+                return position, claimed
+            position = current
+
+    def _push_position(self) -> Optional[int]:
+        position, count = self._claim(self._tail, 1, 0)
+        return position if count else None
+
+    def _pushed(self, position: int) -> None:
+        self._table.store(self._seq_address(position), position + 1, REL)
+
+    def _pop_position(self) -> Optional[int]:
+        position, count = self._claim(self._head, 1, 1)
+        return position if count else None
+
+    def _popped(self, position: int) -> None:
+        self._table.store(self._seq_address(position), position + self._capacity, REL)
+
+    def push_many(self, records) -> int:
+        # pushes as many records as fit, returning the number pushed
+        self._assert_not_released()
+        rs = self._record_size
+        src = _records_view(records, rs)
+        position, count = self._claim(self._tail, len(src) // rs, 0)
+        for k in range(count):
+            start = self._record_offset(position + k)
+            self._view[start:start + rs] = src[k * rs:(k + 1) * rs]
+            self._table.store(self._seq_address(position + k), position + k + 1, REL)
+        return count
+
+    def pop_many_into(self, out) -> int:
+        # pops up to len(out) // record_size records into out, returning the number popped
+        self._assert_not_released()
+        rs = self._record_size
+        dst, count = self._out_view(out)
+        with dst:
+            position, count = self._claim(self._head, count, 1)
+            for k in range(count):
+                start = self._record_offset(position + k)
+                dst[k * rs:(k + 1) * rs] = self._view[start:start + rs]
+                self._table.store(self._seq_address(position + k), position + k + self._capacity, REL)
+        return count
@@ -0,0 +1,95 @@
+import threading
+
+from ctypes import *
+
+from typing import Dict, Optional, Tuple, Type
+
+
+# widths with a native C integer type, which can be marshalled without bytes
+_INT_CTYPES: Dict[Tuple[int, bool], Type[c_int]] = {
+    (1, True): c_int8, (1, False): c_uint8,
+    (2, True): c_int16, (2, False): c_uint16,
+    (4, True): c_int32, (4, False): c_uint32,
+    (8, True): c_int64, (8, False): c_uint64,
+}
+
+
+def int_ctype(width: int, *, is_signed: bool) -> Optional[Type[c_int]]:
+    return _INT_CTYPES.get((width, is_signed))
+
+
+class IntScratch:
+
+    def __init__(self, ctype: Type[c_int]):
+        # two slots cover every op: (value, result) or (desired, expected)
+        self.arg = ctype()
+        self.res = ctype()
+        self.arg_address: int = addressof(self.arg)
+        self.res_address: int = addressof(self.res)
+        # range of values representable by ctype
+        bits = sizeof(ctype) * 8  # CHAR_BIT == 8
+        signed = ctype(-1).value < 0
+        self.min: int = -(1 << (bits - 1)) if signed else 0
+        self.max: int = (1 << (bits - 1)) - 1 if signed else (1 << bits) - 1
+
+    # ctypes silently truncates, int.to_bytes does not, so values are range checked
+    # (inline, since these are on every op)
+
+    def set_arg(self, value: int) -> None:
+        if not (self.min <= value <= self.max):
+            raise OverflowError("int too big to convert")
+        self.arg.value = value
+
+    def set_res(self, value: int) -> None:
+        if not (self.min <= value <= self.max):
+            raise OverflowError("int too big to convert")
+        self.res.value = value
+
+
+class BytesScratch:
+
+    # arguments and results for non-native widths, so ops need no temporary
+    # buffer objects; values are copied in and out with .raw
+
+    # patomic may use wide instructions which need the natural alignment
+    _ALIGNMENT = 16
+
+    def __init__(self, width: int):
+        # both slots start on an aligned address
+        stride = -(-width // self._ALIGNMENT) * self._ALIGNMENT
+        self._storage = create_string_buffer((2 * stride) + self._ALIGNMENT)
+        base = addressof(self._storage)
+        base += -base % self._ALIGNMENT
+        self.arg = (c_char * width).from_address(base)
+        self.res = (c_char * width).from_address(base + stride)
+        self.arg_address: int = base
+        self.res_address: int = base + stride
+
+
+class _ThreadScratch(threading.local):
+
+    def __init__(self):
+        self.slots: Dict[Type[c_int], IntScratch] = {}
+        self.bytes_slots: Dict[int, BytesScratch] = {}
+
+
+_thread_scratch = _ThreadScratch()
+
+
+def get_int_scratch(ctype: Type[c_int]) -> IntScratch:
+    # each thread gets its own slots, so concurrent ops never share memory
+    slots = _thread_scratch.slots
+    try:
+        return slots[ctype]
+    except KeyError:
+        scratch = slots[ctype] = IntScratch(ctype)
+        return scratch
+
+
+def get_bytes_scratch(width: int) -> BytesScratch:
+    slots = _thread_scratch.bytes_slots
+    try:
+        return slots[width]
+    except KeyError:
+        scratch = slots[width] = BytesScratch(width)
+        return scratch
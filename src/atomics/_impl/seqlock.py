@@ -0,0 +1,191 @@
+import time
+
+from .atomic.int import AtomicUintViewContext
+from .backend import thread_fence
+from .cacheline import aligned_buffer
+from .enums import MemoryOrder, OpType
+from .exceptions import UnsupportedOperationException
+
+from typing import Optional
+
+
+# a sequence lock: a uint64 sequence number followed by a plain data region
+#
+# layout: [0, 8): atomic uint64 sequence number, [8, 8 + size): data
+#
+# the sequence number is odd while a write is in progress; readers copy the data
+# and retry if the sequence number was odd or changed during the copy, so readers
+# never block writers (or each other), and writers only exclude other writers
+# everything lives in the buffer, so it works across processes in shared memory
+#
+# ordering: the data is copied with plain (non-atomic) reads and writes, so the
+# sequence number accesses alone don't order them; a writer makes the sequence
+# number odd, then fences (release) before writing the data, and a reader copies
+# the data, then fences (acquire) before reading the sequence number again, so a
+# reader seeing the same even number both times cannot have copied a torn write
+# (readers never write to the sequence number, so don't contend for its line)
+#
+# without a fence (e.g. using the ctypes backend) readers recheck with a release
+# RMW (fetch_add of 0) instead: it is ordered after the copy, and both it and the
+# writer's acquire RMW making the number odd are in the number's modification order;
+# if the reader's came first, the writer's would synchronise with it, so the copy
+# could not have seen the write, otherwise the reader sees the number has changed
+# this needs a writable sequence number, so readonly locks require a fence
+
+_SEQ_WIDTH = 8
+
+RLX = MemoryOrder.RELAXED
+ACQ = MemoryOrder.ACQUIRE
+REL = MemoryOrder.RELEASE
+ACQ_REL = MemoryOrder.ACQ_REL
+SEQ_CST = MemoryOrder.SEQ_CST
+
+# spins before yielding the thread, when a write is in progress
+_MAX_SPINS = 8
+
+
+class SeqLock:
+
+    def __init__(self, size: Optional[int] = None, *, buffer=None):
+        # check if object has been initialised
+        if hasattr(self, "_ctx"):
+            raise ValueError("SeqLock object cannot be re-initialised.")
+        if size is not None and not isinstance(size, int):
+            raise TypeError("Argument 'size' must have type 'int'.")
+        if buffer is None:
+            if size is None:
+                raise TypeError("Argument 'size' is required when no 'buffer' is given.")
+            if size <= 0:
+                raise ValueError("Argument 'size' must be positive.")
+            buffer = aligned_buffer(self.buffer_size(size))
+        view = memoryview(buffer).cast("B")
+        if size is None:
+            # data fills the rest of the buffer
+            size = len(view) - _SEQ_WIDTH
+        if size <= 0 or len(view) < self.buffer_size(size):
+            view.release()
+            raise ValueError(f"Keyword argument 'buffer' must be more than {_SEQ_WIDTH} bytes long.")
+        # the sequence number validates its own width, alignment, and ops
+        try:
+            ctx = AtomicUintViewContext(buffer=view[:_SEQ_WIDTH])
+        except BaseException:
+            view.release()
+            raise
+        seq = ctx.__enter__()
+        readonly = seq.readonly
+        optypes = [OpType.LOAD] if readonly else [OpType.LOAD, OpType.STORE, OpType.CMPXCHG_WEAK]
+        for optype in optypes:
+            if optype not in seq.ops_supported:
+                ctx.__exit__(None, None, None)
+                view.release()
+                raise UnsupportedOperationException(optype, _SEQ_WIDTH, readonly=readonly)
+        # see the ordering comment at the top
+        fence = thread_fence()
+        if fence is None and (readonly or OpType.FETCH_ADD not in seq.ops_supported):
+            ctx.__exit__(None, None, None)
+            view.release()
+            raise UnsupportedOperationException(OpType.FETCH_ADD, _SEQ_WIDTH, readonly=readonly)
+        self._ctx: AtomicUintViewContext = ctx
+        self._seq = seq
+        self._view: memoryview = view
+        self._data: memoryview = view[_SEQ_WIDTH:(_SEQ_WIDTH + size)]
+        self._size: int = size
+        self._table = seq._core._table
+        self._address: int = seq._core._address
+        self._fence = fence
+
+    @staticmethod
+    def buffer_size(size: int) -> int:
+        return _SEQ_WIDTH + size
+
+    def __enter__(self):
+        self._assert_not_released()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+    def __str__(self):
+        if hasattr(self, "_ctx") and self._seq._core:
+            return f"{self.__class__.__name__}(size={self._size}, sequence={self.sequence})"
+        return f"{self.__class__.__name__}(released)"
+
+    def release(self) -> None:
+        # this may be called in __del__ if exception is raised in __init__
+        if hasattr(self, "_ctx"):
+            self._data.release()
+            self._ctx.__exit__(None, None, None)
+            self._view.release()
+
+    def _assert_not_released(self) -> None:
+        self._seq._core._assert_not_released()
+
+    @property
+    def size(self) -> int:
+        self._assert_not_released()
+        return self._size
+
+    @property
+    def sequence(self) -> int:
+        # even when no write is in progress; increases by 2 with every write
+        self._assert_not_released()
+        return self._table.load(self._address, ACQ)
+
+    def write(self, data) -> int:
+        # returns the sequence number of the new data
+        self._assert_not_released()
+        self._seq._check_supported(OpType.CMPXCHG_WEAK)
+        if len(data) != self._size:
+            raise ValueError("'data' object length does not match 'size'.")
+        table, address = self._table, self._address
+        # acquire the write side by making the sequence number odd
+        spins = 0
+        while True:
+            seq = table.load(address, ACQ)
+            if not (seq & 1):
+                ok, seq = table.cmpxchg_weak(address, seq, seq + 1, SEQ_CST, ACQ)
+                if ok:
+                    break
+            spins += 1
+            if spins > _MAX_SPINS:
+                time.sleep(0)
+        if self._fence is not None:
+            self._fence(REL)
+        try:
+            self._data[:] = data
+        finally:
+            # always leave the sequence number even, so readers cannot spin forever
+            table.store(address, seq + 2, REL)
+        return seq + 2
+
+    def read_into(self, out) -> int:
+        # returns the sequence number of the data copied into out
+        self._assert_not_released()
+        # checked up front, since slice assignment would resize a bytearray
+        with memoryview(out) as view:
+            if view.nbytes != self._size:
+                raise ValueError("'out' object length does not match 'size'.")
+        table, address, data, fence = self._table, self._address, self._data, self._fence
+        spins = 0
+        while True:
+            before = table.load(address, ACQ)
+            if not (before & 1):
+                out[:] = data
+                if fence is not None:
+                    fence(ACQ)
+                    after = table.load(address, RLX)
+                else:
+                    after = table.fetch_add(address, 0, ACQ_REL)
+                if before == after:
+                    return before
+            spins += 1
+            if spins > _MAX_SPINS:
+                time.sleep(0)
+
+    def read(self) -> bytes:
+        out = bytearray(self._size)
+        self.read_into(out)
+        return bytes(out)
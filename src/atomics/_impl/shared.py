@@ -0,0 +1,225 @@
+import contextlib
+import os
+import sys
+
+from .alignment import Alignment
+from .cacheline import cache_line_size
+from .atomic.funcs import ATUnion, AVCUnion, atomicview
+from .atomic.mixins.types import UINT
+
+from typing import Optional, Type
+
+
+# layout of a region:
+# [0, 8): number of bytes allocated after the header (atomic uint64)
+# [_HEADER_SIZE, size): slots, each at an offset meeting its recommended alignment
+# new shared memory is zero filled, so a fresh region needs no initialisation
+# the base address of shared memory is page aligned, so aligned offsets give aligned addresses
+_HEADER_SIZE = 64
+_USED_WIDTH = 8
+
+
+def _align_up(offset: int, alignment: int) -> int:
+    return -(-offset // alignment) * alignment
+
+
+def _untrack(shm) -> None:
+    # before Python 3.13 attaching registers the segment with this process's
+    # resource tracker, which unlinks it (with a leak warning) once this process
+    # exits, breaking every other process still using it
+    # children started by multiprocessing share their parent's tracker, so this
+    # also drops the creator's registration; SharedRegion.unlink() makes up for it
+    name = getattr(shm, "_name", None)
+    if name is not None and os.name == "posix":
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(name, "shared_memory")
+
+
+def _retrack(shm) -> None:
+    # SharedMemory.unlink() unregisters the segment from the resource tracker,
+    # which reports an error if it isn't registered, so it is registered again
+    # first (a no-op if it still is); not for segments opened with track=False
+    name = getattr(shm, "_name", None)
+    if name is not None and os.name == "posix" and getattr(shm, "_track", True):
+        from multiprocessing import resource_tracker
+        resource_tracker.register(name, "shared_memory")
+
+
+def _open_shared_memory(name: Optional[str], size: int, create: bool):
+    # imported here since it pulls in most of multiprocessing, which is slow
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        # Python < 3.8
+        raise RuntimeError("Shared regions require multiprocessing.shared_memory (Python 3.8+).") from None
+    if create:
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+    elif sys.version_info >= (3, 13):
+        # only the creating process should be responsible for cleaning up
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+        _untrack(shm)
+    return shm
+
+
+class SharedRegion:
+
+    def __init__(self, name: Optional[str] = None, size: int = 0, *, create: bool = False):
+        # check types
+        if name is not None and not isinstance(name, str):
+            raise TypeError("Positional argument 'name' must have type 'str' or be None.")
+        if not isinstance(size, int):
+            raise TypeError("Positional argument 'size' must have type 'int'.")
+        if create and size <= 0:
+            raise ValueError("Positional argument 'size' must be positive when creating a region.")
+        if not create and name is None:
+            raise ValueError("Positional argument 'name' is required when attaching to a region.")
+        # header is allocated in addition to the requested size
+        self._shm = _open_shared_memory(name, (_HEADER_SIZE + size) if create else 0, create)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce__(self):
+        # child processes attach to the same segment by name (needed for 'spawn')
+        return _attach_region, (self.name,)
+
+    def __str__(self):
+        msg = f"{self.__class__.__name__}(name={self.name}, size={self.size}, " \
+              f"used={self.used})"
+        return msg
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        # usable size, excluding the header
+        return max(0, self._shm.size - _HEADER_SIZE)
+
+    @property
+    def buf(self) -> memoryview:
+        return self._shm.buf
+
+    @property
+    def used(self) -> int:
+        with self._used_view() as used:
+            return used.load()
+
+    @contextlib.contextmanager
+    def _used_view(self):
+        # release the slice eagerly, otherwise close() may raise BufferError
+        buf = self._shm.buf[:_USED_WIDTH]
+        try:
+            with atomicview(buf, UINT) as used:
+                yield used
+        finally:
+            buf.release()
+
+    def allocate(self, width: int, *, isolate: bool = False) -> int:
+        # returns the offset of a new slot, safe to call concurrently from any process
+        # isolated slots start on, and are padded to, their own cache line(s)
+        if not isinstance(width, int):
+            raise TypeError("Positional argument 'width' must have type 'int'.")
+        alignment, size = Alignment._shared(width).recommended, width
+        if isolate:
+            alignment = max(alignment, cache_line_size())
+            size = _align_up(width, alignment)
+        with self._used_view() as used:
+            cur = used.load()
+            while True:
+                offset = _align_up(_HEADER_SIZE + cur, alignment)
+                end = offset + size
+                if end > self._shm.size:
+                    msg = f"Not enough space left in {self.__class__.__name__} " \
+                          f"for an object with a width of {width}."
+                    raise MemoryError(msg)
+                res = used.cmpxchg_weak(cur, end - _HEADER_SIZE)
+                if res.success:
+                    return offset
+                cur = res.expected
+
+    def atomic(self, width: int, atype: Type[ATUnion], *, isolate: bool = False,
+               **kwargs) -> "SharedAtomic":
+        return SharedAtomic(self, self.allocate(width, isolate=isolate), width, atype, **kwargs)
+
+    def close(self) -> None:
+        # raises BufferError if any views into the region are still open
+        self._shm.close()
+
+    def unlink(self) -> None:
+        _retrack(self._shm)
+        self._shm.unlink()
+
+
+class SharedAtomic:
+
+    def __init__(self, region: SharedRegion, offset: int, width: int, atype: Type[ATUnion],
+                 **kwargs):
+        # check types
+        if not isinstance(region, SharedRegion):
+            raise TypeError("Positional argument 'region' must have type 'SharedRegion'.")
+        if not isinstance(offset, int) or not isinstance(width, int):
+            raise TypeError("Positional arguments 'offset' and 'width' must have type 'int'.")
+        if offset < _HEADER_SIZE or (offset + width) > region.buf.nbytes:
+            raise ValueError("Slot does not lie within the region.")
+        self._region = region
+        self._offset = offset
+        self._width = width
+        self._atype = atype
+        self._kwargs = kwargs
+
+    def __reduce__(self):
+        # the region is pickled by name, so this survives both 'fork' and 'spawn'
+        return _make_shared_atomic, (self._region, self._offset, self._width, self._atype,
+                                     self._kwargs)
+
+    def __str__(self):
+        msg = f"{self.__class__.__name__}(region={self._region.name}, offset={self._offset}, " \
+              f"width={self._width}, atype={self._atype.__name__})"
+        return msg
+
+    @property
+    def region(self) -> SharedRegion:
+        return self._region
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    def view(self) -> AVCUnion:
+        # same as atomicview on the slot, so must be used in a 'with' statement
+        buf = self._region.buf[self._offset:(self._offset + self._width)]
+        return atomicview(buf, self._atype, **self._kwargs)
+
+
+def _attach_region(name: str) -> SharedRegion:
+    return SharedRegion(name, create=False)
+
+
+def _make_shared_atomic(region: SharedRegion, offset: int, width: int, atype: Type[ATUnion],
+                        kwargs: dict) -> SharedAtomic:
+    return SharedAtomic(region, offset, width, atype, **kwargs)
+
+
+def shared(name: Optional[str], width: int, atype: Type[ATUnion], *, create: bool = False,
+           **kwargs) -> SharedAtomic:
+    # a region holding a single atomic object, at a fixed offset so it can be found by name
+    if not isinstance(width, int):
+        raise TypeError("Positional argument 'width' must have type 'int'.")
+    offset = _align_up(_HEADER_SIZE, Alignment._shared(width).recommended)
+    if create:
+        region = SharedRegion(name, (offset - _HEADER_SIZE) + width, create=True)
+        region.allocate(width)
+    else:
+        region = SharedRegion(name, create=False)
+    return SharedAtomic(region, offset, width, atype, **kwargs)
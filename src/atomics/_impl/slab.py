@@ -0,0 +1,147 @@
+import threading
+
+from ctypes import memset
+
+from .alignment import Alignment
+from .cacheline import cache_line_size
+from .pybuffer import PyBuffer
+
+from typing import Dict, List, Tuple
+
+
+# pages are aligned to, and sized in multiples of, a cache line
+# slots within a page are packed at the recommended alignment for their width,
+# or each given their own cache line(s) if isolated
+_PAGE_SIZE = 4096
+
+
+def _align_up(value: int, alignment: int) -> int:
+    return -(-value // alignment) * alignment
+
+
+class SlabSlot:
+
+    # stands in for a PyBuffer in AtomicCore (address, width, readonly, release)
+    # slot memory is zeroed when allocated, like a fresh bytearray
+    #
+    # release() only forbids further use; the memory is recycled once the slot is
+    # garbage, since every op (including bound ops, and aio watches) holds a
+    # reference to its core, which holds the slot, so an op which passed its
+    # released check just before release() can never write to a recycled slot
+
+    __slots__ = ("_slab", "_address", "_width", "_live")
+
+    def __init__(self, slab: "_Slab", address: int, width: int):
+        self._slab = slab
+        self._address = address
+        self._width = width
+        self._live = True
+
+    def __enter__(self):
+        self._assert_not_released()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        # this may be called during interpreter shutdown
+        slab = getattr(self, "_slab", None)
+        if slab is not None:
+            slab.free(self)
+
+    def __bool__(self):
+        return not self._released
+
+    def __str__(self):
+        if self:
+            return f"{self.__class__.__name__}(address={self.address}, width={self.width})"
+        else:
+            return f"{self.__class__.__name__}(released)"
+
+    def release(self) -> None:
+        # a plain store, so can be called by threads at the same time
+        self._live = False
+
+    @property
+    def _released(self) -> bool:
+        return not self._live
+
+    def _assert_not_released(self) -> None:
+        if self._released:
+            msg = f"Operation forbidden on released {self.__class__.__name__} object."
+            raise ValueError(msg)
+
+    @property
+    def address(self) -> int:
+        self._assert_not_released()
+        return self._address
+
+    @property
+    def width(self) -> int:
+        self._assert_not_released()
+        return self._width
+
+    @property
+    def readonly(self) -> bool:
+        self._assert_not_released()
+        return False
+
+
+class _Slab:
+
+    def __init__(self, width: int, *, isolate: bool):
+        align = Alignment._shared(width)
+        line = cache_line_size()
+        self.width: int = width
+        self.alignment: int = max(align.recommended, line)
+        # every slot starts on a recommended aligned offset from an aligned page
+        self.stride: int = _align_up(width, align.recommended)
+        if isolate:
+            self.stride = _align_up(self.stride, self.alignment)
+        self.page_size: int = _align_up(max(_PAGE_SIZE, self.stride), line)
+        self._pages: List[PyBuffer] = []
+        self._free: List[int] = []
+        # reentrant since free() can be called from __del__ during a garbage collection
+        self._lock = threading.RLock()
+
+    def _new_page(self) -> None:
+        # over-allocate so the page can be aligned; PyBuffer pins the bytearray in place
+        pybuf = PyBuffer(bytearray(self.page_size + self.alignment), writeable=True)
+        base = _align_up(pybuf.address, self.alignment)
+        count = self.page_size // self.stride
+        self._pages.append(pybuf)
+        # reversed so slots are handed out in address order
+        self._free.extend(base + (i * self.stride) for i in reversed(range(count)))
+
+    def allocate(self) -> SlabSlot:
+        with self._lock:
+            if not self._free:
+                self._new_page()
+            address = self._free.pop()
+        memset(address, 0, self.width)
+        return SlabSlot(self, address, self.width)
+
+    def free(self, slot: SlabSlot) -> None:
+        # only called once nothing references the slot (see SlabSlot)
+        with self._lock:
+            if slot._slab is self:
+                slot._slab = None
+                self._free.append(slot._address)
+
+
+_slabs: Dict[Tuple[int, bool], _Slab] = {}
+_slabs_lock = threading.Lock()
+
+
+def allocate_slot(width: int, *, isolate: bool = False) -> SlabSlot:
+    # raises UnsupportedWidthException (from Alignment) if width is not supported
+    key = (width, bool(isolate))
+    try:
+        slab = _slabs[key]
+    except KeyError:
+        with _slabs_lock:
+            slab = _slabs.get(key)
+            if slab is None:
+                slab = _slabs[key] = _Slab(width, isolate=key[1])
+    return slab.allocate()
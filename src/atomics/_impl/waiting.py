@@ -0,0 +1,258 @@
+import ctypes
+import errno
+import sys
+import threading
+import time
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+# wait/notify on the address of an atomic object, like C++20 atomic::wait
+#
+# on Linux, objects use futex on the aligned 4 byte words covering them, without
+# FUTEX_PRIVATE_FLAG, so they work across processes for objects in shared memory
+# waiters read the words before loading the object, and the kernel only sleeps if
+# every word still holds the value read, so no change (or wake up) is ever missed
+# objects inside one word use FUTEX_WAIT, and wider ones use futex_waitv (Linux
+# 5.16+) to wait on all their words at once; notifiers FUTEX_WAKE the first word
+#
+# every other object (wider ones without futex_waitv, and all of them elsewhere)
+# uses a parking lot of condition variables, shared by all objects in the process;
+# waiters hold their bucket's lock from loading the object until they sleep, and
+# notifiers take it to wake them, so notifies from the same process are never missed
+# notifies from other processes cannot reach the parking lot, so objects which may
+# be in shared memory (shared=True) are also re-checked every _POLL_INTERVAL
+#
+# every notify also notifies the listener conditions (see add_listener), so threads
+# watching many objects at once (e.g. aio's bridge) don't need a parking lot bucket
+
+_FUTEX_WAIT = 0
+_FUTEX_WAKE = 1
+_FUTEX_32 = 2
+_INT_MAX = 2 ** 31 - 1
+
+# same number on every architecture
+_SYS_FUTEX_WAITV = 449
+_FUTEX_WAITV_MAX = 128
+_CLOCK_MONOTONIC = 1
+
+# syscall numbers by platform.machine()
+_SYS_FUTEX = {
+    "x86_64": 202, "amd64": 202,
+    "aarch64": 98, "arm64": 98, "riscv64": 98, "loongarch64": 98,
+    "i386": 240, "i686": 240, "armv7l": 240, "armv6l": 240,
+    "ppc64": 221, "ppc64le": 221,
+    "s390x": 238,
+}
+
+# longest single sleep in the parking lot for objects which may be changed (and
+# notified) by other processes (seconds)
+_POLL_INTERVAL = 0.005
+
+_PARKING_LOT_SIZE = 64
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class _KernelTimespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_int64), ("tv_nsec", ctypes.c_int64)]
+
+
+class _FutexWaitv(ctypes.Structure):
+    _fields_ = [("val", ctypes.c_uint64), ("uaddr", ctypes.c_uint64),
+                ("flags", ctypes.c_uint32), ("reserved", ctypes.c_uint32)]
+
+
+class _Futex:
+
+    def __init__(self, syscall, number: int, waitv=None):
+        self._syscall = syscall
+        self._number: int = number
+        # syscall with futex_waitv's signature, or None if the kernel lacks it
+        self._waitv = waitv
+
+    @property
+    def has_waitv(self) -> bool:
+        return self._waitv is not None
+
+    def wait(self, address: int, value: int, timeout: Optional[float]) -> None:
+        # returns on wake, timeout, signal, or if the word no longer holds value
+        # errors are not checked, since the caller always re-checks the object
+        ts = None
+        if timeout is not None:
+            sec = int(timeout)
+            ts = ctypes.byref(_Timespec(sec, int((timeout - sec) * 1e9)))
+        self._syscall(self._number, address, _FUTEX_WAIT, value, ts, None, 0)
+
+    def wait_many(self, words: Sequence[Tuple[int, int]], timeout: Optional[float]) -> None:
+        # like wait, but for (address, value) pairs, returning when any one is woken
+        # or no longer holds its value (there must be at most _FUTEX_WAITV_MAX)
+        waiters = (_FutexWaitv * len(words))()
+        for waiter, (address, value) in zip(waiters, words):
+            waiter.val, waiter.uaddr, waiter.flags = value, address, _FUTEX_32
+        ts = None
+        if timeout is not None:
+            # futex_waitv only takes an absolute timeout
+            deadline = time.clock_gettime(time.CLOCK_MONOTONIC) + max(timeout, 0.0)
+            sec = int(deadline)
+            ts = ctypes.byref(_KernelTimespec(sec, int((deadline - sec) * 1e9)))
+        self._waitv(_SYS_FUTEX_WAITV, waiters, len(words), 0, ts, _CLOCK_MONOTONIC)
+
+    def wake(self, address: int, count: int) -> None:
+        self._syscall(self._number, address, _FUTEX_WAKE, count, None, None, 0)
+
+
+def _load_waitv(libc):
+    # a separate function object, since argtypes differ from futex's
+    waitv = libc["syscall"]
+    waitv.restype = ctypes.c_long
+    waitv.argtypes = [ctypes.c_long, ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint,
+                      ctypes.c_void_p, ctypes.c_int]
+    # no waiters is rejected with EINVAL, unless the syscall doesn't exist
+    if waitv(_SYS_FUTEX_WAITV, None, 0, 0, None, _CLOCK_MONOTONIC) == -1 and \
+            ctypes.get_errno() == errno.EINVAL:
+        return waitv
+    return None
+
+
+def _load_futex() -> Optional[_Futex]:
+    if not sys.platform.startswith("linux"):
+        return None
+    import platform
+    number = _SYS_FUTEX.get(platform.machine().lower())
+    if number is None:
+        return None
+    try:
+        # CDLL functions release the GIL for the duration of the call
+        libc = ctypes.CDLL(None, use_errno=True)
+        syscall = libc.syscall
+    except (OSError, AttributeError):
+        return None
+    syscall.restype = ctypes.c_long
+    syscall.argtypes = [ctypes.c_long, ctypes.c_void_p, ctypes.c_int, ctypes.c_uint32,
+                        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32]
+    return _Futex(syscall, number, _load_waitv(libc))
+
+
+_futex: Optional[_Futex] = None
+_futex_loaded = False
+_parking_lot: List[threading.Condition] = [threading.Condition() for _ in range(_PARKING_LOT_SIZE)]
+_listeners: List[threading.Condition] = []
+_lock = threading.Lock()
+
+
+def _get_futex() -> Optional[_Futex]:
+    global _futex, _futex_loaded
+    if not _futex_loaded:
+        with _lock:
+            if not _futex_loaded:
+                _futex = _load_futex()
+                _futex_loaded = True
+    return _futex
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _bucket(address: int) -> threading.Condition:
+    return _parking_lot[(address >> 3) % _PARKING_LOT_SIZE]
+
+
+def uses_futex() -> bool:
+    return _get_futex() is not None
+
+
+def waitv_words(address: int, width: int) -> Optional[List[int]]:
+    # addresses of the aligned 4 byte words to wait on for the object with
+    # wait_words(), or None if futex_waitv is not available
+    futex = _get_futex()
+    if futex is None or not futex.has_waitv:
+        return None
+    return list(range(address & ~3, address + width, 4))
+
+
+def wait_words(words: Sequence[Tuple[int, int]], timeout: Optional[float]) -> None:
+    # sleeps until any (address, value) word is woken or doesn't hold its value,
+    # or until timeout expires; at most _FUTEX_WAITV_MAX words from waitv_words()
+    _get_futex().wait_many(words, timeout)
+
+
+def add_listener(cond: threading.Condition) -> None:
+    # cond is notified (with its lock held) after every notify in this process
+    global _listeners
+    with _lock:
+        _listeners = _listeners + [cond]
+
+
+def _futex_words(futex: Optional[_Futex], address: int, width: int) -> Optional[List[int]]:
+    # addresses of the aligned 4 byte words covering the object, or None if it
+    # can't be waited on with futex (so uses the parking lot)
+    if futex is None:
+        return None
+    words = list(range(address & ~3, address + width, 4))
+    if len(words) > 1 and (not futex.has_waitv or len(words) > _FUTEX_WAITV_MAX):
+        return None
+    return words
+
+
+def wait_address(address: int, width: int, old: bytes, load_into: Callable[[bytearray], None],
+                 timeout: Optional[float], stop: Optional[Callable[[], bool]] = None, *,
+                 shared: bool = True) -> bool:
+    # blocks until the object's raw bytes (read with load_into) differ from old
+    # returns False if timeout (in seconds) expires first, or if stop() returns True
+    # after a wake up (so a notify is needed to stop promptly)
+    # shared is False if no other process can change the object (e.g. it is not a
+    # view), so parking lot waits only wake on notify or timeout
+    deadline = None if timeout is None else time.monotonic() + timeout
+    current = bytearray(width)
+    futex = _get_futex()
+    words = _futex_words(futex, address, width)
+    if words is None:
+        bucket = _bucket(address)
+        with bucket:
+            while True:
+                load_into(current)
+                if current != old:
+                    return True
+                remaining = _remaining(deadline)
+                if (remaining is not None and remaining <= 0) or (stop is not None and stop()):
+                    return False
+                if shared:
+                    remaining = _POLL_INTERVAL if remaining is None else min(remaining, _POLL_INTERVAL)
+                bucket.wait(remaining)
+    cwords = [ctypes.c_uint32.from_address(word) for word in words]
+    while True:
+        # the words are read before the object, so any change after the object is
+        # read makes the futex wait return immediately
+        values = [cword.value for cword in cwords]
+        load_into(current)
+        if current != old:
+            return True
+        remaining = _remaining(deadline)
+        if (remaining is not None and remaining <= 0) or (stop is not None and stop()):
+            return False
+        if len(words) == 1:
+            futex.wait(words[0], values[0], remaining)
+        else:
+            futex.wait_many(list(zip(words, values)), remaining)
+
+
+def notify_address(address: int, width: int, *, wake_all: bool) -> None:
+    for cond in _listeners:
+        with cond:
+            cond.notify_all()
+    futex = _get_futex()
+    if _futex_words(futex, address, width) is None:
+        # waiters on other objects may share the bucket, so wake them all
+        bucket = _bucket(address)
+        with bucket:
+            bucket.notify_all()
+        return
+    # waiters on wider objects wait on their first word too
+    base = address & ~3
+    # the word may be shared with other objects if this one does not start it
+    shared = (address != base) or (width < 4)
+    futex.wake(base, _INT_MAX if (wake_all or shared) else 1)
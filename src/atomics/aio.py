@@ -0,0 +1 @@
+from ._impl.aio import wait_change, wait_for
@@ -0,0 +1,4 @@
+from ._impl.atomic.array import AtomicArray
+from ._impl.atomic.array import AtomicIntegralArray
+from ._impl.atomic.array import AtomicBytesArray
+from ._impl.atomic.array import AtomicIntArray, AtomicUintArray
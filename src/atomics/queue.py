@@ -0,0 +1 @@
+from ._impl.queue import MPMCQueue, SPSCQueue
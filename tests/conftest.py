@@ -0,0 +1,44 @@
+from atomics._impl import backend, waiting
+from atomics._impl.patomic import Patomic
+
+import pytest
+
+
+# every test runs once per backend; op tables (and the dispatch objects holding
+# them) and capabilities are cached per process, so those built by the other
+# backend are dropped
+
+_NATIVE = backend._native
+_PER_BACKEND = ("table", "dispatch", "capabilities")
+
+
+def _drop_tables() -> None:
+    with Patomic._cache_lock:
+        for key in [k for k in Patomic._cache if isinstance(k, tuple) and k[0] in _PER_BACKEND]:
+            del Patomic._cache[key]
+
+
+@pytest.fixture(autouse=True, params=["native", "ctypes"])
+def atomics_backend(request, monkeypatch):
+    if request.param == "native" and _NATIVE is None:
+        pytest.skip("native extension is not available")
+    monkeypatch.setattr(backend, "_native", _NATIVE if request.param == "native" else None)
+    _drop_tables()
+    yield request.param
+    _drop_tables()
+
+
+# for tests of waiting, which run once per way it can wait for an object
+
+@pytest.fixture(params=["futex", "futex_no_waitv", "parking_lot"])
+def wait_mechanism(request, monkeypatch):
+    if request.param.startswith("futex") and not waiting.uses_futex():
+        pytest.skip("futex is not available")
+    if request.param == "futex" and not waiting._get_futex().has_waitv:
+        pytest.skip("futex_waitv is not available")
+    if request.param == "futex_no_waitv":
+        monkeypatch.setattr(waiting._get_futex(), "_waitv", None)
+    if request.param == "parking_lot":
+        monkeypatch.setattr(waiting, "_futex", None)
+        monkeypatch.setattr(waiting, "_futex_loaded", True)
+    return request.param
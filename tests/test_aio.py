@@ -0,0 +1,81 @@
+import atomics
+import atomics.aio as aio
+from atomics._impl import aio as _aio
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+def _store_later(a, value, delay: float = 0.02) -> None:
+    def work() -> None:
+        time.sleep(delay)
+        a.store(value)
+        a.notify_all()
+    threading.Thread(target=work).start()
+
+
+@pytest.mark.parametrize("width", (4, 8))
+def test_wait_change(wait_mechanism, width):
+    async def main():
+        a = atomics.atomic(width, atomics.INT)
+        _store_later(a, 1)
+        assert await aio.wait_change(a, 0, timeout=5) == 1
+        _store_later(a, 5)
+        assert await aio.wait_for(a, lambda x: x == 5, timeout=5) == 5
+    asyncio.run(main())
+
+
+def test_timeout():
+    async def main():
+        a = atomics.atomic(4, atomics.INT)
+        with pytest.raises(asyncio.TimeoutError):
+            await aio.wait_change(a, 0, timeout=0.05)
+    asyncio.run(main())
+
+
+def test_many_waiters(wait_mechanism):
+    async def main():
+        b = atomics.atomic(16, atomics.BYTES)
+        tasks = [asyncio.ensure_future(aio.wait_change(b, bytes(16))) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        _store_later(b, b"\x01" * 16)
+        assert await asyncio.wait_for(asyncio.gather(*tasks), 5) == [b"\x01" * 16] * 10
+    asyncio.run(main())
+    # the bridge thread exits once idle
+    deadline = time.monotonic() + 5
+    while _aio._bridge is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _aio._watches and _aio._bridge is None
+
+
+def test_one_bridge_thread(wait_mechanism):
+    # every awaited object shares one thread, whichever loop awaits it
+    objs = [atomics.atomic(w, atomics.UINT) for w in (1, 2, 4, 8) for _ in range(10)]
+
+    async def main():
+        tasks = [asyncio.ensure_future(aio.wait_change(a, 0)) for a in objs]
+        await asyncio.sleep(0.05)
+        names = [t.name for t in threading.enumerate()]
+        assert names.count("atomics-aio") == 1
+        for a in objs:
+            _store_later(a, 1, 0)
+        assert await asyncio.wait_for(asyncio.gather(*tasks), 5) == [1] * len(objs)
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("width", (4, 8))
+def test_release_while_waiting(width):
+    async def main():
+        buf = bytearray(width)
+        with atomics.atomicview(buffer=buf, atype=atomics.INT) as a:
+            task = asyncio.ensure_future(aio.wait_change(a, 0))
+            await asyncio.sleep(0.05)
+        # the waiter sees the release instead of reading the freed address
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(task, 5)
+    asyncio.run(main())
+    # and no watch is left registered for memory that may be reused
+    assert all(watch._core for watch in _aio._watches.values())
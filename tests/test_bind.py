@@ -0,0 +1,89 @@
+import atomics
+from atomics import MemoryOrder, OpType
+from atomics.exc import MemoryOrderError, UnsupportedOperationException
+
+import pytest
+
+
+def test_bound_ops():
+    a = atomics.atomic(8, atomics.INT)
+    store = a.bind(OpType.STORE, MemoryOrder.RELEASE)
+    load = a.bind(OpType.LOAD, MemoryOrder.ACQUIRE)
+    fetch_add = a.bind(OpType.FETCH_ADD, MemoryOrder.RELAXED)
+    inc = a.bind(OpType.INC)
+    bit_test_set = a.bind(OpType.BIT_TEST_SET)
+    cmpxchg = a.bind(OpType.CMPXCHG_STRONG, MemoryOrder.ACQ_REL)
+    store(5)
+    assert fetch_add(2) == 5
+    inc()
+    assert load() == 8
+    assert bit_test_set(0) is False and load() == 9
+    res = cmpxchg(9, -1)
+    assert res.success and res.expected == 9 and load() == -1
+    res = cmpxchg(9, 0)
+    assert not res.success and res.expected == -1
+    assert fetch_add.__name__ == "fetch_add"
+    # values are still checked by the op table, and bit indices by the bound op
+    with pytest.raises(OverflowError):
+        store(1 << 64)
+    with pytest.raises(ValueError):
+        bit_test_set(64)
+
+
+def test_bound_bytes_ops():
+    b = atomics.atomic(4, atomics.BYTES)
+    b.bind(OpType.STORE)(b"abcd")
+    assert b.bind(OpType.EXCHANGE)(b"wxyz") == b"abcd"
+    assert b.bind(OpType.CMPXCHG_WEAK, MemoryOrder.SEQ_CST, MemoryOrder.RELAXED)(b"abcd", bytes(4)).expected == b"wxyz"
+
+
+@pytest.mark.parametrize("optype, args", [
+    (OpType.LOAD, ()),
+    (OpType.STORE, (1,)),
+    (OpType.FETCH_ADD, (1,)),
+    (OpType.INC, ()),
+    (OpType.BIT_TEST_SET, (0,)),
+    (OpType.CMPXCHG_WEAK, (0, 1)),
+])
+def test_bound_op_after_release(optype, args):
+    with atomics.atomicview(bytearray(8), atomics.INT) as a:
+        op = a.bind(optype)
+        op(*args)
+    with pytest.raises(ValueError):
+        op(*args)
+
+
+def test_bind_after_release():
+    with atomics.atomicview(bytearray(8), atomics.INT) as a:
+        pass
+    with pytest.raises(ValueError):
+        a.bind(OpType.LOAD)
+
+
+@pytest.mark.parametrize("optype, order, fail", [
+    (OpType.STORE, MemoryOrder.ACQUIRE, None),
+    (OpType.STORE, MemoryOrder.ACQ_REL, None),
+    (OpType.LOAD, MemoryOrder.RELEASE, None),
+    (OpType.LOAD, MemoryOrder.ACQ_REL, None),
+    (OpType.CMPXCHG_WEAK, MemoryOrder.RELAXED, MemoryOrder.ACQUIRE),
+    (OpType.CMPXCHG_STRONG, MemoryOrder.SEQ_CST, MemoryOrder.RELEASE),
+    (OpType.CMPXCHG_STRONG, MemoryOrder.ACQ_REL, MemoryOrder.ACQ_REL),
+])
+def test_invalid_orders_rejected_at_bind(optype, order, fail):
+    a = atomics.atomic(8, atomics.INT)
+    with pytest.raises(MemoryOrderError):
+        a.bind(optype, order, fail)
+
+
+def test_invalid_bind_arguments():
+    a = atomics.atomic(8, atomics.INT)
+    # the default fail order is the strongest valid one
+    a.bind(OpType.CMPXCHG_WEAK, MemoryOrder.RELEASE)
+    a.bind(OpType.CMPXCHG_WEAK, MemoryOrder.ACQ_REL)
+    with pytest.raises(ValueError):
+        a.bind(OpType.FETCH_ADD, MemoryOrder.SEQ_CST, MemoryOrder.RELAXED)
+    with pytest.raises(ValueError):
+        a.bind(OpType.LOAD, 42)
+    b = atomics.atomic(4, atomics.BYTES)
+    with pytest.raises(UnsupportedOperationException):
+        b.bind(OpType.FETCH_ADD)
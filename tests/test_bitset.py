@@ -0,0 +1,84 @@
+import atomics
+from atomics import MemoryOrder
+from atomics.exc import MemoryOrderError
+from atomics._impl.cacheline import aligned_buffer
+
+import threading
+
+import pytest
+
+
+@pytest.mark.parametrize("nbits", (1, 64, 100, 200))
+def test_acquire_free_until_exhausted(nbits):
+    buf = aligned_buffer(atomics.AtomicBitset.buffer_size(nbits))
+    with atomics.AtomicBitset(buf, nbits) as bs:
+        assert len(bs) == nbits
+        claimed = [bs.acquire_free() for _ in range(nbits)]
+        assert sorted(claimed) == list(range(nbits))
+        assert bs.acquire_free() is None
+        assert bs.count() == nbits
+    # bits past nbits in the last word are never touched
+    assert int.from_bytes(bytes(buf), "little") == (1 << nbits) - 1
+
+
+def test_release():
+    bs = atomics.AtomicBitset(aligned_buffer(16), 100)
+    for _ in range(100):
+        bs.acquire_free()
+    bs.release(70)
+    assert not bs.test(70)
+    assert bs.count() == 99
+    # the only free bit is found again, whatever the scan hint
+    assert bs.acquire_free() == 70
+    assert bs.acquire_free() is None
+    bs.release(3)
+    with pytest.raises(ValueError):
+        bs.release(3)
+    with pytest.raises(IndexError):
+        bs.release(100)
+
+
+def test_set_clear_count():
+    bs = atomics.AtomicBitset(aligned_buffer(24))
+    assert bs.nbits == 192
+    assert bs.set(5) is False and bs.set(5) is True
+    bs.set(64)
+    bs.set(191)
+    assert bs.count() == 3
+    assert bs.count(MemoryOrder.ACQUIRE) == 3
+    with pytest.raises(MemoryOrderError):
+        bs.count(MemoryOrder.RELEASE)
+    assert bs.clear(64) is True and bs.clear(64) is False
+    assert bs.count() == 2
+    assert bs.acquire_free() == 0
+
+
+def test_concurrent_claims_are_unique():
+    nbits = 1000
+    bs = atomics.AtomicBitset(aligned_buffer(atomics.AtomicBitset.buffer_size(nbits)), nbits)
+    results = [[] for _ in range(4)]
+
+    def work(out):
+        while True:
+            index = bs.acquire_free()
+            if index is None:
+                return
+            out.append(index)
+
+    ts = [threading.Thread(target=work, args=(out,)) for out in results]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    claimed = [i for out in results for i in out]
+    assert sorted(claimed) == list(range(nbits))
+    assert bs.count() == nbits
+
+
+def test_bytes_table_has_no_bit_scans():
+    b = atomics.atomic(8, atomics.BYTES)
+    table, address = b._core._table, b._core._address
+    with pytest.raises(TypeError):
+        table.bits_claim(address, 64, 0, MemoryOrder.ACQUIRE, MemoryOrder.RELAXED)
+    with pytest.raises(TypeError):
+        table.bits_count(address, 64, MemoryOrder.RELAXED)
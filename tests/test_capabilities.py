@@ -0,0 +1,37 @@
+import atomics
+
+import pytest
+
+
+def test_capabilities(atomics_backend):
+    caps = atomics.capabilities(16)
+    assert sorted(caps) == list(range(1, 17))
+    for width, cap in caps.items():
+        assert cap.width == width
+        assert cap.supported == bool(cap.ops_supported)
+        if cap.supported:
+            assert cap.alignment.recommended >= 1 and cap.kinds
+        else:
+            assert cap.alignment is None and cap.bltn_lock_free is None
+    # the compiler's answer is only known through the native extension
+    assert caps[8].supported
+    if caps[8].kinds == ("bltn",):
+        assert caps[8].bltn_lock_free is (True if atomics_backend == "native" else None)
+    assert atomics.capabilities(16)[8] is caps[8]
+
+
+def test_alignment_is_read_only():
+    # the same instance is shared by capabilities() and internal checks
+    align = atomics.capabilities(8)[8].alignment
+    recommended = align.recommended
+    for name in ("recommended", "minimum", "size_within", "width", "other"):
+        with pytest.raises(AttributeError):
+            setattr(align, name, 4096)
+    assert atomics.capabilities(8)[8].alignment.recommended == recommended
+    assert atomics.Alignment(8).recommended == recommended
+
+
+@pytest.mark.parametrize("max_width, error", (("8", TypeError), (0, ValueError)))
+def test_bad_max_width(max_width, error):
+    with pytest.raises(error):
+        atomics.capabilities(max_width)
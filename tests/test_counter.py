@@ -0,0 +1,81 @@
+import atomics
+from atomics._impl import counter as counter_module
+from atomics._impl.cacheline import aligned_buffer
+
+import mmap
+import os
+import threading
+
+import pytest
+
+
+def test_threads():
+    c = atomics.ShardedCounter(4)
+    ts = [threading.Thread(target=lambda: [c.inc() for _ in range(10000)]) for _ in range(4)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    c.add(5)
+    c.dec()
+    assert c.value() == 40004
+    assert sum(c.shard_values()) == 40004
+    assert c.reset() == 40004
+    assert c.value() == 0
+
+
+def test_threads_use_their_own_shard():
+    c = atomics.ShardedCounter(4)
+    barrier = threading.Barrier(4)
+
+    def work():
+        # all threads get their number before any of them exits
+        c.inc()
+        barrier.wait()
+
+    ts = [threading.Thread(target=work) for _ in range(4)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    assert c.shard_values() == [1, 1, 1, 1]
+
+
+def test_buffer():
+    size = atomics.ShardedCounter.buffer_size(3)
+    buf = aligned_buffer(size + 1)
+    with atomics.ShardedCounter(buffer=buf) as c:
+        assert c.shards == 3
+        c.add(-2)
+        assert c.value() == -2
+    with pytest.raises(ValueError):
+        atomics.ShardedCounter(4, buffer=buf)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_fork_resets_thread_numbers():
+    size = atomics.ShardedCounter.buffer_size(64)
+    with mmap.mmap(-1, size) as m:
+        c = atomics.ShardedCounter(buffer=m)
+        c.inc()
+        parent_number = counter_module._thread.number
+        # another thread holding the lock at the time of the fork must not
+        # leave the child unable to number its threads
+        with counter_module._numbers_lock:
+            pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                number = counter_module._thread.number
+                t = threading.Thread(target=c.inc)
+                t.start()
+                t.join(timeout=30)
+                if number != parent_number and number == os.getpid() and not t.is_alive():
+                    c.inc()
+                    code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        assert c.value() == 3
+        c.release()
@@ -0,0 +1,67 @@
+import atomics
+from atomics._impl import implementation
+from atomics._impl.implementation import KINDS, available_impls
+from atomics._impl.patomic import Patomic
+from atomics.exc import UnsupportedWidthException
+
+import pytest
+
+
+def test_unknown_impl():
+    with pytest.raises(ValueError):
+        atomics.atomic(8, atomics.INT, impl="gcc")
+    with pytest.raises(ValueError):
+        atomics.atomicview(bytearray(8), atomics.INT, impl="BLTN")
+    with pytest.raises(TypeError):
+        atomics.atomic(8, atomics.INT, impl=8)
+
+
+@pytest.mark.parametrize("width", (1, 8))
+def test_available_impl(width):
+    for name in available_impls(width):
+        a = atomics.atomic(width, atomics.UINT, impl=name)
+        a.store(3)
+        assert a.fetch_add(1) == 3 and a.load() == 4
+        with atomics.atomicview(bytearray(width), atomics.UINT, impl=name) as v:
+            v.store(1)
+            assert v.load() == 1
+
+
+@pytest.mark.parametrize("width", (1, 8))
+def test_impl_unsupported_for_width(width):
+    missing = [name for name, _ in KINDS if name not in available_impls(width)]
+    if not missing:
+        pytest.skip(f"every kind supports width {width}")
+    for name in missing:
+        with pytest.raises(UnsupportedWidthException):
+            atomics.atomic(width, atomics.INT, impl=name)
+
+
+def test_fastest_unsupported_width():
+    assert atomics.fastest_impl(3) is None
+    with pytest.raises(UnsupportedWidthException):
+        atomics.atomic(3, atomics.BYTES, impl=implementation.FASTEST)
+    with pytest.raises(TypeError):
+        atomics.fastest_impl("8")
+
+
+def test_fastest_is_cached(monkeypatch):
+    # drop any result from an earlier test; restored after this one
+    monkeypatch.delitem(Patomic._cache, ("fastest_impl", 8), raising=False)
+    timed = []
+    time_impl = implementation._time_impl
+
+    def counting_time_impl(width, kind):
+        timed.append((width, kind))
+        return time_impl(width, kind)
+
+    monkeypatch.setattr(implementation, "_time_impl", counting_time_impl)
+    fastest = atomics.fastest_impl(8)
+    assert fastest in available_impls(8)
+    assert len(timed) == len(available_impls(8))
+    # later calls, and impl="fastest", reuse the result
+    assert atomics.fastest_impl(8) == fastest
+    a = atomics.atomic(8, atomics.INT, impl=implementation.FASTEST)
+    a.store(-1)
+    assert a.load() == -1
+    assert len(timed) == len(available_impls(8))
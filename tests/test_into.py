@@ -0,0 +1,50 @@
+import atomics
+
+import sys
+
+import pytest
+
+
+def test_bytes_into():
+    a = atomics.atomic(16, atomics.BYTES)
+    a.store(b"\x01" * 16)
+    out = bytearray(16)
+    assert a.load_into(out) is out and out == b"\x01" * 16
+    a.exchange_into(b"\x02" * 16, out)
+    assert out == b"\x01" * 16 and a.load() == b"\x02" * 16
+    # desired and out may alias
+    buf = bytearray(b"\x03" * 16)
+    a.exchange_into(buf, buf)
+    assert buf == b"\x02" * 16 and a.load() == b"\x03" * 16
+    exp = bytearray(16)
+    assert a.cmpxchg_strong_into(exp, b"\x04" * 16) is False and exp == b"\x03" * 16
+    assert a.cmpxchg_strong_into(exp, b"\x04" * 16) is True
+    assert a.load() == b"\x04" * 16
+
+
+@pytest.mark.parametrize("bad, error", ((bytes(16), BufferError), (bytearray(15), ValueError)))
+def test_bad_out(bad, error):
+    a = atomics.atomic(16, atomics.BYTES)
+    with pytest.raises(error):
+        a.load_into(bad)
+    with pytest.raises(error):
+        a.cmpxchg_weak_into(bad, bytes(16))
+
+
+def test_int_into():
+    i = atomics.atomic(8, atomics.INT)
+    i.store(-2)
+    out = bytearray(8)
+    i.load_into(out)
+    assert int.from_bytes(out, sys.byteorder, signed=True) == -2
+    exp = bytearray((-2).to_bytes(8, sys.byteorder, signed=True))
+    assert i.cmpxchg_strong_into(exp, (7).to_bytes(8, sys.byteorder)) and i.load() == 7
+
+
+def test_array_into():
+    arr = atomics.atomicarray(bytearray(32), atomics.BYTES, 16)
+    arr.store(1, b"\x09" * 16)
+    out = bytearray(16)
+    assert arr.load_into(1, out) == b"\x09" * 16
+    exp = bytearray(16)
+    assert not arr.cmpxchg_strong_into(1, exp, bytes(16)) and exp == b"\x09" * 16
@@ -0,0 +1,60 @@
+import atomics
+
+import array
+import threading
+
+import pytest
+
+
+@pytest.mark.parametrize("width", (1, 2, 4, 8, 16))
+@pytest.mark.parametrize("atype", (atomics.INT, atomics.UINT))
+def test_load_store_many(width, atype):
+    arr = atomics.atomicarray(bytearray(width * 8), atype, width)
+    arr.store_many([0, 1, 2, -1], [1, 2, 3, 4])
+    assert arr.load_many(range(8)) == [1, 2, 3, 0, 0, 0, 0, 4]
+    with pytest.raises(IndexError):
+        arr.load_many([8])
+    with pytest.raises(ValueError):
+        arr.store_many([0], [1, 2])
+    with pytest.raises(OverflowError):
+        arr.store_many([0], [1 << (width * 8)])
+
+
+@pytest.mark.parametrize("width", (1, 2, 4, 8))
+def test_arithmetic_many(width):
+    arr = atomics.atomicarray(bytearray(width * 4), atomics.UINT, width)
+    assert arr.fetch_add_many(array.array("q", [0, 0, 3]), [5, 5, 1]) == [0, 5, 0]
+    arr.add_many(memoryview(array.array("q", [1])), [9])
+    arr.sub_many([0], [2])
+    out = bytearray(2 * width)
+    assert arr.fetch_sub_many([0, 1], [1, 1], out=out) is out
+    assert arr.load_many(range(4)) == [7, 8, 0, 1]
+
+
+def test_bytes_many():
+    b = atomics.atomicarray(bytearray(12), atomics.BYTES, 4)
+    b.store_many([2, 0], [b"abcd", b"wxyz"])
+    assert b.load_many([0, 1, 2]) == [b"wxyz", bytes(4), b"abcd"]
+
+
+def test_add_many_threads():
+    h = atomics.atomicarray(bytearray(8 * 16), atomics.UINT, 8)
+    idx = array.array("q", [i % 16 for i in range(1600)])
+    ones = array.array("Q", [1]) * len(idx)
+    ts = [threading.Thread(target=lambda: [h.add_many(idx, ones) for _ in range(10)]) for _ in range(4)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    assert h.load_many(range(16)) == [4000] * 16
+
+
+def test_unsigned_indices():
+    arr = atomics.atomicarray(bytearray(8 * 4), atomics.UINT, 8)
+    arr.store_many(array.array("Q", [1, 3]), [5, 6])
+    assert arr.load_many(array.array("L" if array.array("L").itemsize == 8 else "Q", [3])) == [6]
+    # not reinterpreted as -1 (the last element)
+    with pytest.raises(IndexError):
+        arr.load_many(array.array("Q", [2 ** 64 - 1]))
+    with pytest.raises(IndexError):
+        arr.load_many([2 ** 64])
@@ -0,0 +1,91 @@
+import atomics
+import atomics.exc
+from atomics import MemoryOrder, OpType
+from atomics._impl import backend
+
+import sys
+
+import pytest
+
+
+WIDTHS = (1, 2, 4, 8, 16)
+
+
+def test_backend(atomics_backend):
+    assert backend.backend_name() == atomics_backend
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("atype", (atomics.INT, atomics.UINT))
+def test_integral(width, atype):
+    a = atomics.atomic(width=width, atype=atype)
+    top = (1 << (width * 8 - 1)) - 1 if a.signed else (1 << (width * 8)) - 1
+    assert a.load() == 0
+    a.store(top)
+    assert a.load() == top
+    assert a.exchange(5) == top
+    assert a.cmpxchg_strong(5, 9).success and a.load(MemoryOrder.RELAXED) == 9
+    res = a.cmpxchg_strong(2, 10)
+    assert not res.success and res.expected == 9
+    # int ops have no length check, so the op table must reject these
+    ops = [lambda: a.store(top + 1), lambda: a.exchange(top + 1), lambda: a.cmpxchg_weak(9, top + 1),
+           lambda: a.cmpxchg_strong(top + 1, 0)]
+    if OpType.FETCH_OR in a.ops_supported:
+        ops.append(lambda: a.bin_fetch_or(top + 1))
+    for op in ops:
+        with pytest.raises(OverflowError):
+            op()
+    assert a.load() == 9
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("atype", (atomics.INT, atomics.UINT))
+def test_arithmetic(width, atype):
+    a = atomics.atomic(width=width, atype=atype)
+    if OpType.FETCH_ADD not in a.ops_supported:
+        pytest.skip(f"no arithmetic ops for width {width}")
+    top = (1 << (width * 8 - 1)) - 1 if a.signed else (1 << (width * 8)) - 1
+    a.store(5)
+    assert a.fetch_add(3) == 5 and a.load() == 8
+    assert a.fetch_sub(2) == 8 and a.load() == 6
+    assert a.bin_fetch_or(1) == 6 and a.bin_fetch_and(3) == 7 and a.bin_fetch_xor(1) == 3
+    assert a.load() == 2
+    assert a.bit_test_set(0) is False and a.bit_test(0) is True
+    # wraps around
+    a.store(top)
+    a.inc()
+    assert a.load() == (-top - 1 if a.signed else 0)
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+def test_bytes(width):
+    a = atomics.atomic(width=width, atype=atomics.BYTES)
+    ones = b"\x01" * width
+    a.store(ones)
+    assert a.load() == ones
+    assert a.exchange(bytes(width)) == ones
+    assert a.cmpxchg_strong(bytes(width), ones).success
+    assert OpType.ADD not in a.ops_supported
+    with pytest.raises(ValueError):
+        a.store(bytes(width + 1))
+
+
+@pytest.mark.parametrize("width", (1, 2, 4, 8))
+def test_view(width):
+    buf = bytearray(width)
+    with atomics.atomicview(buffer=buf, atype=atomics.UINT) as a:
+        a.store(1)
+        assert a.fetch_add(1) == 1
+    assert int.from_bytes(buf, sys.byteorder) == 2
+    with atomics.atomicview(buffer=bytes(buf), atype=atomics.UINT) as a:
+        assert a.readonly and a.load() == 2
+        with pytest.raises(atomics.exc.UnsupportedOperationException):
+            a.store(3)
+
+
+def test_released_view():
+    ctx = atomics.atomicview(buffer=bytearray(8), atype=atomics.INT)
+    with ctx as a:
+        pass
+    with pytest.raises(ValueError):
+        a.load()
@@ -0,0 +1,101 @@
+from atomics.queue import MPMCQueue, SPSCQueue
+
+import ctypes
+import struct
+import threading
+import time
+
+import pytest
+
+
+def _aligned(size: int) -> memoryview:
+    raw = bytearray(size + 64)
+    address = ctypes.addressof((ctypes.c_char * len(raw)).from_buffer(raw))
+    offset = -address % 64
+    return memoryview(raw)[offset:offset + size]
+
+
+def _record(i: int) -> bytes:
+    return i.to_bytes(12, "little")
+
+
+@pytest.mark.parametrize("cls", (SPSCQueue, MPMCQueue))
+def test_push_pop(cls):
+    buf = _aligned(cls.buffer_size(8, 12))
+    q = cls(buf, 8, 12, create=True)
+    assert q.capacity == 8 and len(q) == 0 and q.pop() is None
+    for i in range(8):
+        assert q.push(_record(i))
+    assert not q.push(bytes(12)) and len(q) == 8
+    assert q.pop() == _record(0)
+    assert q.push_many([bytes(12)] * 3) == 1
+    out = bytearray(12 * 4)
+    assert q.pop_many_into(out) == 4 and out[12:24] == _record(2)
+    # attach to the same buffer
+    q2 = cls(buf)
+    assert q2.capacity == 8 and q2.record_size == 12 and len(q2) == 4
+    assert [int.from_bytes(r, "little") for r in q2.pop_many(10)] == [5, 6, 7, 0]
+    other = MPMCQueue if cls is SPSCQueue else SPSCQueue
+    with pytest.raises(ValueError):
+        other(buf)
+    # batches wrapping around the ring
+    for rnd in range(20):
+        n = q.push_many(b"".join(_record(rnd * 10 + k) for k in range(5)))
+        assert [int.from_bytes(r, "little") for r in q.pop_many(n)] == [rnd * 10 + k for k in range(n)]
+    q.release()
+    q2.release()
+
+
+def test_mpmc_threads():
+    q = MPMCQueue(_aligned(MPMCQueue.buffer_size(64, 8)), 64, 8, create=True)
+    n, producers = 1000, 3
+    got = []
+    lock = threading.Lock()
+
+    def produce(p: int) -> None:
+        i = 0
+        while i < n:
+            batch = b"".join((p * n + j).to_bytes(8, "little") for j in range(i, min(n, i + 7)))
+            pushed = q.push_many(batch)
+            i += pushed
+            if not pushed:
+                time.sleep(0)
+
+    def consume() -> None:
+        while True:
+            with lock:
+                if len(got) >= n * producers:
+                    return
+                records = q.pop_many(5)
+                got.extend(records)
+            if not records:
+                time.sleep(0)
+
+    ts = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+    ts += [threading.Thread(target=consume) for _ in range(producers)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    assert sorted(int.from_bytes(r, "little") for r in got) == list(range(n * producers))
+    q.release()
+
+
+def test_ring_buffer_is_abstract():
+    from atomics._impl.queue import _RingBuffer
+    with pytest.raises(TypeError):
+        _RingBuffer(_aligned(4096), 8, 8, create=True)
+
+
+@pytest.mark.parametrize("cls", (SPSCQueue, MPMCQueue))
+@pytest.mark.parametrize("offset, value", ((8, 0), (8, 6), (16, 0), (24, 0), (24, 48), (24, 16),
+                                           (8, 1 << 40)))
+def test_corrupt_header(cls, offset, value):
+    # capacity (at 8), record_size (at 16), and line (at 24) are checked when attaching,
+    # including that the buffer is big enough for them
+    buf = _aligned(cls.buffer_size(8, 12))
+    cls(buf, 8, 12, create=True).release()
+    cls(buf).release()
+    struct.pack_into("=Q", buf, offset, value)
+    with pytest.raises(ValueError):
+        cls(buf)
@@ -0,0 +1,95 @@
+import atomics
+import atomics.exc
+
+import struct
+import threading
+
+import pytest
+
+
+REC = struct.Struct("=QQQQ")
+
+
+def _write(sl: atomics.SeqLock, n: int) -> None:
+    for i in range(1, n + 1):
+        sl.write(REC.pack(i, i * 2, i * 3, i * 4))
+
+
+def test_read_write():
+    with atomics.SeqLock(REC.size) as sl:
+        assert sl.read() == bytes(REC.size) and sl.sequence == 0
+        assert sl.write(REC.pack(1, 2, 3, 4)) == 2
+        assert REC.unpack(sl.read()) == (1, 2, 3, 4)
+        with pytest.raises(ValueError):
+            sl.write(b"x")
+
+
+def test_consistent_snapshots():
+    sl = atomics.SeqLock(REC.size)
+    writers = [threading.Thread(target=_write, args=(sl, 1000)) for _ in range(2)]
+    for w in writers:
+        w.start()
+    out = bytearray(REC.size)
+    while any(w.is_alive() for w in writers):
+        seq = sl.read_into(out)
+        a, b, c, d = REC.unpack(out)
+        assert (b, c, d) == (a * 2, a * 3, a * 4)
+        assert seq % 2 == 0
+    for w in writers:
+        w.join()
+    assert sl.sequence == 2 * 2000
+    sl.release()
+
+
+def test_stress(atomics_backend):
+    # many readers and writers on a record wider than a cache line; with the
+    # ctypes backend there is no fence, so readers recheck with an RMW
+    rec = struct.Struct("=16Q")
+    sl = atomics.SeqLock(rec.size)
+    assert (sl._fence is None) == (atomics_backend == "ctypes")
+    errors = []
+
+    def write(n: int) -> None:
+        for i in range(1, n + 1):
+            sl.write(rec.pack(*(i * k for k in range(1, 17))))
+
+    def read() -> None:
+        out = bytearray(rec.size)
+        while any(w.is_alive() for w in writers):
+            sl.read_into(out)
+            values = rec.unpack(out)
+            if values != tuple(values[0] * k for k in range(1, 17)):
+                errors.append(values)
+
+    writers = [threading.Thread(target=write, args=(2000,)) for _ in range(3)]
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for t in writers + readers:
+        t.start()
+    for t in writers + readers:
+        t.join()
+    assert not errors
+    assert sl.sequence == 2 * 6000
+    sl.release()
+
+
+def test_readonly(atomics_backend):
+    buffer = bytes(atomics.SeqLock.buffer_size(REC.size))
+    if atomics_backend == "ctypes":
+        # readers can't recheck with an RMW without a writable sequence number
+        with pytest.raises(atomics.exc.UnsupportedOperationException):
+            atomics.SeqLock(REC.size, buffer=buffer)
+        return
+    sl = atomics.SeqLock(REC.size, buffer=buffer)
+    assert sl.read() == bytes(REC.size)
+    with pytest.raises(atomics.exc.UnsupportedOperationException):
+        sl.write(bytes(REC.size))
+    sl.release()
+
+
+@pytest.mark.parametrize("out", (bytearray(4), bytearray(REC.size + 1), memoryview(bytearray(4))))
+def test_read_into_size(out):
+    with atomics.SeqLock(REC.size) as sl:
+        size = len(out)
+        with pytest.raises(ValueError):
+            sl.read_into(out)
+        assert len(out) == size
@@ -0,0 +1,75 @@
+import atomics
+
+import os
+import subprocess
+import sys
+
+
+def _env() -> dict:
+    src = os.path.dirname(os.path.dirname(atomics.__file__))
+    return dict(os.environ, PYTHONPATH=os.pathsep.join([src, os.environ.get("PYTHONPATH", "")]))
+
+
+def _run_attached(name: str) -> subprocess.CompletedProcess:
+    # an unrelated process (not started by multiprocessing), with its own resource tracker
+    code = (
+        "import atomics, sys\n"
+        "with atomics.SharedRegion(sys.argv[1]) as r:\n"
+        "    with atomics.atomicview(r.buf[64:72], atomics.UINT) as a:\n"
+        "        a.fetch_add(1)\n"
+    )
+    return subprocess.run([sys.executable, "-c", code, name], env=_env(), capture_output=True, text=True,
+                          timeout=60)
+
+
+def test_attach_does_not_unlink():
+    with atomics.SharedRegion(size=4096, create=True) as region:
+        try:
+            for _ in range(2):
+                res = _run_attached(region.name)
+                assert res.returncode == 0, res.stderr
+                assert "leaked" not in res.stderr
+            # the segment outlives the processes which attached to it
+            with atomics.SharedRegion(region.name) as again:
+                with atomics.atomicview(again.buf[64:72], atomics.UINT) as a:
+                    assert a.load() == 2
+        finally:
+            region.unlink()
+
+
+_SPAWN_SCRIPT = """
+import atomics
+import multiprocessing
+
+
+def child(name):
+    # attaches, and exits without unlinking
+    region = atomics.SharedRegion(name)
+    with atomics.atomicview(region.buf[64:72], atomics.UINT) as a:
+        a.fetch_add(1)
+    region.close()
+
+
+if __name__ == "__main__":
+    with atomics.SharedRegion(size=4096, create=True) as region:
+        for _ in range(2):
+            p = multiprocessing.get_context("spawn").Process(target=child, args=(region.name,))
+            p.start()
+            p.join()
+            assert p.exitcode == 0
+        with atomics.SharedRegion(region.name) as again:
+            with atomics.atomicview(again.buf[64:72], atomics.UINT) as a:
+                assert a.load() == 2
+        region.unlink()
+"""
+
+
+def test_spawned_child_does_not_unlink(tmp_path):
+    # spawned children share their parent's resource tracker
+    script = tmp_path / "spawn_attach.py"
+    script.write_text(_SPAWN_SCRIPT)
+    res = subprocess.run([sys.executable, str(script)], env=_env(), capture_output=True, text=True,
+                         timeout=120)
+    assert res.returncode == 0, res.stderr
+    # the tracker reports leaks, and unregistering unknown segments, on stderr
+    assert "leaked" not in res.stderr and "Traceback" not in res.stderr, res.stderr
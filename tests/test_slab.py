@@ -0,0 +1,81 @@
+import atomics
+from atomics import OpType
+from atomics._impl.alignment import Alignment
+from atomics._impl.cacheline import aligned_buffer, cache_line_size
+
+import gc
+
+import pytest
+
+
+def test_released_slot_is_not_reused_while_referenced():
+    a = atomics.atomic(8, atomics.INT)
+    a.store(7)
+    core = a._core
+    address = core._address
+    fetch_add = a.bind(OpType.FETCH_ADD)
+    # the bound op holds the core, as an op in progress on another thread would
+    del a
+    assert not core
+    with pytest.raises(ValueError):
+        fetch_add(1)
+    others = [atomics.atomic(8, atomics.INT) for _ in range(64)]
+    assert address not in {o._core._address for o in others}
+    # recycled (and zeroed) once nothing can still be using it
+    del core, fetch_add
+    gc.collect()
+    b = atomics.atomic(8, atomics.INT)
+    assert b._core._address == address and b.load() == 0
+
+
+@pytest.mark.parametrize("width", (1, 2, 4, 8))
+@pytest.mark.parametrize("isolate", (False, True))
+def test_slots_are_aligned_and_zeroed(width, isolate):
+    align = Alignment._shared(width).recommended
+    objs = [atomics.atomic(width, atomics.UINT, isolate=isolate) for _ in range(32)]
+    for o in objs:
+        assert o._core._address % align == 0
+        assert o.load() == 0
+        o.store((1 << (width * 8)) - 1)
+    # dirty slots are zeroed when they're handed out again
+    del objs
+    gc.collect()
+    objs = [atomics.atomic(width, atomics.UINT, isolate=isolate) for _ in range(32)]
+    assert [o.load() for o in objs] == [0] * 32
+
+
+def test_slot_is_reused_after_release():
+    gc.collect()
+    a = atomics.atomic(8, atomics.INT)
+    a.store(-1)
+    address = a._core._address
+    a._core.release()
+    with pytest.raises(ValueError):
+        a.load()
+    del a
+    b = atomics.atomic(8, atomics.INT)
+    assert b._core._address == address and b.load() == 0
+
+
+@pytest.mark.parametrize("width", (1, 4, 8))
+def test_isolated_slots_do_not_share_a_cache_line(width):
+    line = cache_line_size()
+    objs = [atomics.atomic(width, atomics.INT, isolate=True) for _ in range(16)]
+    lines = {o._core._address // line for o in objs}
+    assert len(lines) == len(objs)
+    for o in objs:
+        assert o._core._address % line == 0
+
+
+@pytest.mark.parametrize("width", (1, 4, 8))
+def test_isolated_array_elements_do_not_share_a_cache_line(width):
+    line = cache_line_size()
+    arr = atomics.atomicarray(aligned_buffer(line * 4), atomics.UINT, width, isolate=True)
+    assert arr._core.stride == line and arr._core.length == 4
+    lines = {arr._core.address_of(i) // line for i in range(4)}
+    assert len(lines) == 4
+    arr.store_many(range(4), [1, 2, 3, 4])
+    assert arr.load_many(range(4)) == [1, 2, 3, 4]
+    # the buffer must hold a whole number of lines
+    with pytest.raises(ValueError):
+        atomics.atomicarray(aligned_buffer(line * 4 + width), atomics.UINT, width, isolate=True)
@@ -0,0 +1,127 @@
+import atomics
+from atomics import Backoff, MemoryOrder
+from atomics.exc import MemoryOrderError
+from atomics._impl.atomic.mixins import update as update_module
+
+import threading
+
+import pytest
+
+
+def _interfering(a, times: int):
+    # changes the value behind update()'s back the first few times it's called,
+    # so that many exchanges fail
+    calls = []
+
+    def fn(x):
+        calls.append(x)
+        if len(calls) <= times:
+            a.store(x + 10)
+        return x + 1
+
+    return fn, calls
+
+
+def test_update_result():
+    a = atomics.atomic(8, atomics.INT)
+    a.store(5)
+    res = a.update(lambda x: x * 2)
+    assert (res.old, res.new, res.retries) == (5, 10, 0)
+    assert tuple(res) == (5, 10)
+    assert a.load() == 10
+    fn, calls = _interfering(a, 3)
+    old, new = res = a.update(fn)
+    assert res.retries == 3
+    assert calls == [10, 20, 30, 40]
+    assert (old, new) == (40, 41) and a.load() == 41
+
+
+def test_update_bytes():
+    b = atomics.atomic(4, atomics.BYTES)
+    res = b.update(lambda x: x[1:] + b"z")
+    assert (res.old, res.new) == (bytes(4), b"\0\0\0z")
+    assert b.load() == b"\0\0\0z"
+
+
+@pytest.mark.parametrize("backoff, sleeps", [
+    (Backoff.EXPONENTIAL, [1e-6, 2e-6, 4e-6]),
+    (Backoff.YIELD, [0, 0, 0]),
+    (Backoff.NONE, []),
+])
+def test_max_spins_and_backoff(monkeypatch, backoff, sleeps):
+    slept = []
+    monkeypatch.setattr(update_module.time, "sleep", slept.append)
+    a = atomics.atomic(8, atomics.UINT)
+    # the first 2 failures spin, the next 3 back off
+    fn, _ = _interfering(a, 5)
+    assert a.update(fn, backoff=backoff, max_spins=2).retries == 5
+    assert slept == pytest.approx(sleeps)
+
+
+def test_backoff_is_capped(monkeypatch):
+    slept = []
+    monkeypatch.setattr(update_module.time, "sleep", slept.append)
+    a = atomics.atomic(8, atomics.UINT)
+    fn, _ = _interfering(a, 20)
+    assert a.update(fn, max_spins=0).retries == 20
+    assert max(slept) == update_module._MAX_DELAY
+    assert slept == sorted(slept)
+
+
+def test_update_under_contention():
+    a = atomics.atomic(8, atomics.UINT)
+    results = [[] for _ in range(4)]
+
+    def work(out):
+        for _ in range(2000):
+            out.append(a.update(lambda x: x + 1, backoff=Backoff.YIELD, max_spins=1))
+
+    ts = [threading.Thread(target=work, args=(out,)) for out in results]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    assert a.load() == 8000
+    # every update saw a distinct old value
+    flat = [r for out in results for r in out]
+    assert sorted(r.old for r in flat) == list(range(8000))
+    assert all(r.new == r.old + 1 for r in flat)
+    stats = a.update_stats
+    assert stats.updates == 8000
+    assert stats.retries == sum(r.retries for r in flat)
+    assert stats.max_retries == max(r.retries for r in flat)
+
+
+def test_update_stats():
+    a = atomics.atomic(8, atomics.INT)
+    assert a.update_stats.updates == 0 and a.update_stats.mean_retries == 0.0
+    a.update(lambda x: x + 1)
+    fn, _ = _interfering(a, 4)
+    a.update(fn)
+    stats = a.update_stats
+    assert (stats.updates, stats.retries, stats.max_retries) == (2, 4, 4)
+    assert stats.mean_retries == 2.0
+    # a snapshot, not a live view
+    a.update(lambda x: x)
+    assert stats.updates == 2
+    a.reset_update_stats()
+    assert a.update_stats.updates == 0 and a.update_stats.max_retries == 0
+
+
+def test_invalid_update_arguments():
+    a = atomics.atomic(8, atomics.INT)
+    with pytest.raises(MemoryOrderError):
+        a.update(lambda x: x, success=MemoryOrder.RELAXED, failure=MemoryOrder.ACQUIRE)
+    with pytest.raises(MemoryOrderError):
+        a.update(lambda x: x, failure=MemoryOrder.RELEASE)
+    with pytest.raises(ValueError):
+        a.update(lambda x: x, max_spins=-1)
+    with pytest.raises(TypeError):
+        a.update(lambda x: x, backoff="none")
+    assert a.update_stats.updates == 0
+    with atomics.atomicview(bytearray(8), atomics.INT) as v:
+        pass
+    with pytest.raises(ValueError):
+        v.update(lambda x: x)
+    with pytest.raises(ValueError):
+        v.update_stats
@@ -0,0 +1,106 @@
+import atomics
+from atomics._impl import waiting
+from atomics._impl.cacheline import aligned_buffer
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+
+def _values(width: int, atype):
+    if atype is atomics.BYTES:
+        return bytes(width), b"\x01" * width
+    return 0, 1
+
+
+@pytest.mark.parametrize("width, atype", ((1, atomics.UINT), (4, atomics.INT), (8, atomics.INT),
+                                          (16, atomics.BYTES)))
+def test_wait_notify(wait_mechanism, width, atype):
+    a = atomics.atomic(width, atype)
+    zero, one = _values(width, atype)
+    assert a.wait(zero, timeout=0.01) is False
+    assert a.wait(one, timeout=1) is True
+
+    def store() -> None:
+        time.sleep(0.05)
+        a.store(one)
+        a.notify_all()
+
+    t = threading.Thread(target=store)
+    t.start()
+    assert a.wait(zero, timeout=5) is True
+    t.join()
+
+
+@pytest.mark.parametrize("width", (8, 16))
+def test_wide_private_wait_is_not_polled(wait_mechanism, width):
+    # without a notify, a change to a non-shared object is only seen on timeout
+    a = atomics.atomic(width, atomics.BYTES)
+    t = threading.Timer(0.02, lambda: a.store(b"\x01" * width))
+    t.start()
+    start = time.monotonic()
+    assert a.wait(bytes(width), timeout=0.3) is True
+    assert time.monotonic() - start >= 0.25
+    t.join()
+
+
+def test_wide_shared_futex_wait_is_not_polled(wait_mechanism):
+    # views may be in shared memory, but futex_waitv sees notifies from anywhere
+    if wait_mechanism != "futex":
+        pytest.skip("only futex_waitv covers every word")
+    with atomics.atomicview(aligned_buffer(8), atomics.UINT) as a:
+        t = threading.Timer(0.02, lambda: a.store(1 << 40))
+        t.start()
+        start = time.monotonic()
+        assert a.wait(0, timeout=0.3) is True
+        assert time.monotonic() - start >= 0.25
+        t.join()
+
+
+def test_notify_all_waiters(wait_mechanism):
+    a = atomics.atomic(8, atomics.UINT)
+    woke = []
+    ts = [threading.Thread(target=lambda: woke.append(a.wait(0, timeout=5))) for _ in range(4)]
+    for t in ts:
+        t.start()
+    time.sleep(0.05)
+    a.store(1)
+    a.notify_all()
+    for t in ts:
+        t.join()
+    assert woke == [True] * 4
+
+
+def test_wait_across_processes():
+    # a width 8 object in shared memory, changed and notified by another process
+    # only in its upper word, which a futex wait on just the first word would miss
+    code = (
+        "import atomics, sys, time\n"
+        "with atomics.SharedRegion(sys.argv[1]) as r:\n"
+        "    with atomics.atomicview(r.buf[0:8], atomics.UINT) as ready, \\\n"
+        "            atomics.atomicview(r.buf[64:72], atomics.UINT) as a:\n"
+        "        while ready.load() == 0:\n"
+        "            time.sleep(0.001)\n"
+        "        time.sleep(0.1)\n"
+        "        a.store(a.load() | (1 << 40))\n"
+        "        a.notify_all()\n"
+    )
+    src = os.path.dirname(os.path.dirname(atomics.__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([src, os.environ.get("PYTHONPATH", "")]))
+    with atomics.SharedRegion(size=4096, create=True) as region:
+        try:
+            child = subprocess.Popen([sys.executable, "-c", code, region.name], env=env)
+            with atomics.atomicview(region.buf[0:8], atomics.UINT) as ready, \
+                    atomics.atomicview(region.buf[64:72], atomics.UINT) as a:
+                ready.store(1)
+                start = time.monotonic()
+                assert a.wait(0, timeout=30) is True
+                assert time.monotonic() - start < 10
+                assert a.load() == 1 << 40
+            assert child.wait(timeout=60) == 0
+        finally:
+            region.unlink()